@@ -25,6 +25,9 @@ from time import sleep, time
 from tzlocal import get_localzone
 from uvloop import install
 
+from bot.helper.ext_utils.fair_queue import FairQueue
+from bot.helper.ext_utils.task_registry import TaskRegistry
+
 
 # from faulthandler import enable as faulthandler_enable
 # faulthandler_enable()
@@ -54,7 +57,7 @@ aria2 = ariaAPI(ariaClient(host="http://localhost", port=6800, secret=""))
 
 load_dotenv("config.env", override=True)
 
-Intervals = {"status": {}, "qb": "", "jd": ""}
+Intervals = {"status": "", "qb": "", "jd": ""}
 QbTorrents = {}
 jd_downloads = {}
 DRIVES_NAMES = []
@@ -66,8 +69,8 @@ GLOBAL_EXTENSION_FILTER = ["aria2", "!qB"]
 user_data = {}
 aria2_options = {}
 qbit_options = {}
-queued_dl = {}
-queued_up = {}
+queued_dl = FairQueue()
+queued_up = FairQueue()
 non_queued_dl = set()
 non_queued_up = set()
 multi_tags = set()
@@ -76,11 +79,9 @@ task_dict_lock = Lock()
 queue_dict_lock = Lock()
 qb_listener_lock = Lock()
 jd_lock = Lock()
-cpu_eater_lock = Lock()
-subprocess_lock = Lock()
 bot_lock = Lock()
 status_dict = {}
-task_dict = {}
+task_dict = TaskRegistry()
 rss_dict = {}
 bot_dict = {}
 
@@ -239,7 +240,20 @@ PING_URL = environ.get("PING_URL", "")
 ENABLE_STREAM_LINK = environ.get("ENABLE_STREAM_LINK", "False").lower() == "true"
 STREAM_BASE_URL = environ.get("STREAM_BASE_URL", "").rstrip("/")
 STREAM_PORT = environ.get("STREAM_PORT", "")
+METRICS_TOKEN = environ.get("METRICS_TOKEN", "")
 QUEUE_COMPLETE = environ.get("QUEUE_COMPLETE", "True").lower() == "true"
+QUEUE_ADAPTIVE = environ.get("QUEUE_ADAPTIVE", "False").lower() == "true"
+EXTRACT_WORKERS = environ.get("EXTRACT_WORKERS", "")
+EXTRACT_WORKERS = int(EXTRACT_WORKERS) if EXTRACT_WORKERS else 2
+EXTRACT_ARCHIVE_WORKERS = environ.get("EXTRACT_ARCHIVE_WORKERS", "")
+EXTRACT_ARCHIVE_WORKERS = int(EXTRACT_ARCHIVE_WORKERS) if EXTRACT_ARCHIVE_WORKERS else 1
+COMPRESS_WORKERS = environ.get("COMPRESS_WORKERS", "")
+COMPRESS_WORKERS = int(COMPRESS_WORKERS) if COMPRESS_WORKERS else 2
+STREAM_ARCHIVE = environ.get("STREAM_ARCHIVE", "False").lower() == "true"
+FFMPEG_WORKERS = environ.get("FFMPEG_WORKERS", "")
+FFMPEG_WORKERS = int(FFMPEG_WORKERS) if FFMPEG_WORKERS else 1
+SPLIT_WORKERS = environ.get("SPLIT_WORKERS", "")
+SPLIT_WORKERS = int(SPLIT_WORKERS) if SPLIT_WORKERS else 2
 DISABLE_MIRROR_LEECH = environ.get("DISABLE_MIRROR_LEECH", "")
 INDEX_URL = environ.get("INDEX_URL", "").rstrip("/")
 INCOMPLETE_TASK_NOTIFIER = (
@@ -264,6 +278,9 @@ LEECH_INFO_PIN = environ.get("LEECH_INFO_PIN", "False").lower() == "true"
 USER_SESSION_STRING = environ.get("USER_SESSION_STRING", "")
 SAVE_SESSION_STRING = environ.get("SAVE_SESSION_STRING", "")
 USERBOT_LEECH = environ.get("USERBOT_LEECH", "False").lower() == "true"
+HELPER_BOT_TOKENS = environ.get("HELPER_BOT_TOKENS", "")
+LEECH_UPLOAD_WORKERS = environ.get("LEECH_UPLOAD_WORKERS", "")
+LEECH_UPLOAD_WORKERS = int(LEECH_UPLOAD_WORKERS) if LEECH_UPLOAD_WORKERS else 1
 AUTO_DELETE_MESSAGE_DURATION = int(environ.get("AUTO_DELETE_MESSAGE_DURATION", 30))
 AUTO_DELETE_UPLOAD_MESSAGE_DURATION = int(
     environ.get("AUTO_DELETE_UPLOAD_MESSAGE_DURATION", 30)
@@ -321,6 +338,7 @@ LINK_LOG = int(LINK_LOG) if LINK_LOG.isdigit() or LINK_LOG.startswith("-") else
 
 # ============================= LIMITS =================================
 EQUAL_SPLITS = environ.get("EQUAL_SPLITS", "False").lower() == "true"
+VIRTUAL_SPLIT = environ.get("VIRTUAL_SPLIT", "False").lower() == "true"
 
 CLONE_LIMIT = ""
 
@@ -339,6 +357,8 @@ NONPREMIUM_LIMIT = float(NONPREMIUM_LIMIT) if NONPREMIUM_LIMIT else ""
 STATUS_LIMIT = environ.get("STATUS_LIMIT", "")
 STATUS_LIMIT = int(STATUS_LIMIT) if STATUS_LIMIT else 5
 
+STATUS_SPARKLINE = environ.get("STATUS_SPARKLINE", "False").lower() == "true"
+
 TORRENT_DIRECT_LIMIT = environ.get("TORRENT_DIRECT_LIMIT", "")
 TORRENT_DIRECT_LIMIT = float(TORRENT_DIRECT_LIMIT) if TORRENT_DIRECT_LIMIT else ""
 FSUB_CHANNEL_ID = "-1002243629924"
@@ -590,6 +610,7 @@ config_dict = {
     "ENABLE_STREAM_LINK": ENABLE_STREAM_LINK,
     "STREAM_BASE_URL": STREAM_BASE_URL,
     "STREAM_PORT": STREAM_PORT,
+    "METRICS_TOKEN": METRICS_TOKEN,
     "DISABLE_MIRROR_LEECH": DISABLE_MIRROR_LEECH,
     "AUTHORIZED_CHATS": AUTHORIZED_CHATS,
     "SUDO_USERS": SUDO_USERS,
@@ -612,6 +633,8 @@ config_dict = {
     "USER_SESSION_STRING": USER_SESSION_STRING,
     "SAVE_SESSION_STRING": SAVE_SESSION_STRING,
     "USERBOT_LEECH": USERBOT_LEECH,
+    "HELPER_BOT_TOKENS": HELPER_BOT_TOKENS,
+    "LEECH_UPLOAD_WORKERS": LEECH_UPLOAD_WORKERS,
     "AUTO_DELETE_MESSAGE_DURATION": AUTO_DELETE_MESSAGE_DURATION,
     "AUTO_DELETE_UPLOAD_MESSAGE_DURATION": AUTO_DELETE_UPLOAD_MESSAGE_DURATION,
     "STATUS_UPDATE_INTERVAL": STATUS_UPDATE_INTERVAL,
@@ -625,6 +648,13 @@ config_dict = {
     "QUEUE_DOWNLOAD": QUEUE_DOWNLOAD,
     "QUEUE_UPLOAD": QUEUE_UPLOAD,
     "QUEUE_COMPLETE": QUEUE_COMPLETE,
+    "QUEUE_ADAPTIVE": QUEUE_ADAPTIVE,
+    "EXTRACT_WORKERS": EXTRACT_WORKERS,
+    "EXTRACT_ARCHIVE_WORKERS": EXTRACT_ARCHIVE_WORKERS,
+    "COMPRESS_WORKERS": COMPRESS_WORKERS,
+    "STREAM_ARCHIVE": STREAM_ARCHIVE,
+    "FFMPEG_WORKERS": FFMPEG_WORKERS,
+    "SPLIT_WORKERS": SPLIT_WORKERS,
     # RCLONE
     "ENABLE_FASTDL": ENABLE_FASTDL,
     "RCLONE_FLAGS": RCLONE_FLAGS,
@@ -642,6 +672,7 @@ config_dict = {
     "LINK_LOG": LINK_LOG,
     # LIMITS
     "EQUAL_SPLITS": EQUAL_SPLITS,
+    "VIRTUAL_SPLIT": VIRTUAL_SPLIT,
     "DAILY_LIMIT_SIZE": DAILY_LIMIT_SIZE,
     "CLONE_LIMIT": CLONE_LIMIT,
     "LEECH_LIMIT": LEECH_LIMIT,
@@ -649,6 +680,7 @@ config_dict = {
     "MEGA_LIMIT": MEGA_LIMIT,
     "NONPREMIUM_LIMIT": NONPREMIUM_LIMIT,
     "STATUS_LIMIT": STATUS_LIMIT,
+    "STATUS_SPARKLINE": STATUS_SPARKLINE,
     "TORRENT_DIRECT_LIMIT": TORRENT_DIRECT_LIMIT,
     "TOTAL_TASKS_LIMIT": TOTAL_TASKS_LIMIT,
     "USER_TASKS_LIMIT": USER_TASKS_LIMIT,
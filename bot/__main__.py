@@ -4,15 +4,6 @@ from asyncio import create_subprocess_exec, gather
 from heroku3 import from_key
 from os import execl as osexecl
 from platform import system, architecture, release
-from psutil import (
-    disk_usage,
-    cpu_percent,
-    swap_memory,
-    cpu_count,
-    virtual_memory,
-    net_io_counters,
-    boot_time,
-)
 from pyrogram import Client
 from pyrogram.filters import command, regex, new_chat_members, left_chat_member
 from pyrogram.handlers import MessageHandler, CallbackQueryHandler
@@ -23,16 +14,7 @@ from sys import executable
 from time import time
 from uuid import uuid4
 
-from psutil import (
-    boot_time,
-    cpu_count,
-    cpu_freq,
-    cpu_percent,
-    disk_usage,
-    swap_memory,
-    virtual_memory,
-    net_io_counters,
-)
+from psutil import boot_time, cpu_count
 from bot import (
     bot,
     bot_loop,
@@ -54,13 +36,19 @@ from bot import (
 from bot.helper.ext_utils.argo_tunnel import ping_base_route, kill_route
 from bot.helper.ext_utils.bot_utils import (
     cmd_exec,
+    setInterval,
     sync_to_async,
     new_task,
     update_user_ldata,
 )
-from bot.helper.ext_utils.conf_loads import intialize_userbot, intialize_savebot
+from bot.helper.ext_utils.conf_loads import (
+    intialize_userbot,
+    intialize_helperbots,
+    intialize_savebot,
+)
 from bot.helper.ext_utils.db_handler import DbManager
 from bot.helper.ext_utils.files_utils import clean_all, exit_clean_up, clean_target
+from bot.helper.ext_utils.flood_limiter import flood_limiter
 from bot.helper.ext_utils.help_messages import HelpString, get_help_button
 from bot.helper.ext_utils.jdownloader_booter import jdownloader
 from bot.helper.ext_utils.links_utils import is_media
@@ -70,6 +58,9 @@ from bot.helper.ext_utils.status_utils import (
     get_readable_time,
     get_progress_bar_string,
 )
+from bot.helper.ext_utils.sys_stats import sys_stats, SAMPLE_INTERVAL
+from bot.helper.ext_utils.task_journal import task_journal
+from bot.helper.ext_utils.task_manager import adjust_admission
 from bot.helper.ext_utils.telegraph_helper import telegraph
 from bot.helper.listeners.aria2_listener import start_aria2_listener
 from bot.helper.mirror_utils.rclone_utils.serve import rclone_serve_booter
@@ -138,11 +129,12 @@ async def stats(_, message: Message):
         last_commit = last_commit[0]
     else:
         last_commit = "No UPSTREAM_REPO"
+    memory, disk_st, net = sys_stats.memory, sys_stats.disk, sys_stats.net
     cpu, mem, disk, swap = (
-        f"{cpu_percent(interval=1)}%",
-        f"{virtual_memory().percent}%",
-        f"{disk_usage('/')[3]}%",
-        f"{swap_memory().percent}%",
+        f"{sys_stats.cpu}%",
+        f"{memory.percent}%",
+        f"{disk_st.percent}%",
+        f"{sys_stats.swap.percent}%",
     )
     msg = f"""
 <b>UPSTREAM REPO AND BOT STATUS</b>
@@ -152,15 +144,15 @@ async def stats(_, message: Message):
 <b>SYSTEM STATUS</b>
 <b>🌚 Total Cores:</b> {cpu_count(logical=True)}
 <b>🌚 Physical Cores:</b> {cpu_count(logical=False)}
-<b>🌚 Upload:</b> {get_readable_file_size(net_io_counters().bytes_sent)}
-<b>🌚 Download:</b> {get_readable_file_size(net_io_counters().bytes_recv)}
-<b>🌚 Disk Free:</b> {get_readable_file_size(disk_usage("/")[2])}
-<b>🌚 Disk Used:</b> {get_readable_file_size(disk_usage("/")[1])}
-<b>🌚 Disk Space:</b> {get_readable_file_size(disk_usage("/")[0])}
-<b>🌚 Memory Free:</b> {get_readable_file_size(virtual_memory().available)}
-<b>🌚 Memory Used:</b> {get_readable_file_size(virtual_memory().used)}
-<b>🌚 Memory Swap:</b> {get_readable_file_size(swap_memory().total)}
-<b>🌚 Memory Total:</b> {get_readable_file_size(virtual_memory().total)}
+<b>🌚 Upload:</b> {get_readable_file_size(net.bytes_sent)} | {get_readable_file_size(sys_stats.sent_rate)}/s
+<b>🌚 Download:</b> {get_readable_file_size(net.bytes_recv)} | {get_readable_file_size(sys_stats.recv_rate)}/s
+<b>🌚 Disk Free:</b> {get_readable_file_size(disk_st.free)}
+<b>🌚 Disk Used:</b> {get_readable_file_size(disk_st.used)}
+<b>🌚 Disk Space:</b> {get_readable_file_size(disk_st.total)}
+<b>🌚 Memory Free:</b> {get_readable_file_size(memory.available)}
+<b>🌚 Memory Used:</b> {get_readable_file_size(memory.used)}
+<b>🌚 Memory Swap:</b> {get_readable_file_size(sys_stats.swap.total)}
+<b>🌚 Memory Total:</b> {get_readable_file_size(memory.total)}
 <b>🌚 CPU:</b> {get_progress_bar_string(cpu)} {cpu}
 <b>🌚 RAM:</b> {get_progress_bar_string(mem)} {mem}
 <b>🌚 DISK:</b> {get_progress_bar_string(disk)} {disk}
@@ -316,8 +308,7 @@ async def restart(_, message: Message):
         if jd := Intervals["jd"]:
             jd.cancel()
         if st := Intervals["status"]:
-            for intvl in list(st.values()):
-                intvl.cancel()
+            st.cancel()
         await gather(sync_to_async(clean_all), server.cleanup())
         proc1 = await create_subprocess_exec(
             "pkill",
@@ -446,11 +437,18 @@ async def restart_notification():
     notifier_dict = False
     async with bot_lock:
         premium_message = "\nPremium leech enable 🥳!" if bot_dict["IS_PREMIUM"] else ""
-    if (
-        INCOMPLETE_TASK_NOTIFIER
-        and DATABASE_URL
-        and (notifier_dict := await DbManager().get_incomplete_tasks())
-    ):
+    if INCOMPLETE_TASK_NOTIFIER and DATABASE_URL:
+        notifier_dict = await DbManager().get_incomplete_tasks()
+    incomplete_links = {
+        link
+        for data in (notifier_dict or {}).values()
+        for links in data.values()
+        for link in links
+    }
+    for link in await sync_to_async(task_journal.entries):
+        if link not in incomplete_links:
+            await resume_task.discard_checkpoint(link)
+    if notifier_dict:
         buttons = ButtonMaker()
         auto_resume = config_dict["INCOMPLETE_AUTO_RESUME"]
         if not auto_resume:
@@ -495,6 +493,9 @@ async def restart_notification():
 
 
 async def main():
+    flood_limiter.attach(bot)
+    sys_stats.start()
+    setInterval(SAMPLE_INTERVAL, adjust_admission)
     jdownloader.initiate()
     bot.add_handler(MessageHandler(start, filters=command(BotCommands.StartCommand)))
     bot.add_handler(
@@ -526,10 +527,12 @@ async def main():
     bot.add_handler(CallbackQueryHandler(help_query, filters=regex("help")))
     bot.add_handler(MessageHandler(new_member, filters=new_chat_members))
     bot.add_handler(MessageHandler(leave_member, filters=left_chat_member))
+    await task_journal.restore()
     await gather(
         set_command(),
         start_server(),
         intialize_userbot(False),
+        intialize_helperbots(False),
         sync_to_async(clean_all),
         torrent_search.initiate_search_tools(),
         telegraph.create_account(),
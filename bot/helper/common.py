@@ -1,6 +1,6 @@
 from aiofiles.os import path as aiopath, makedirs, rename as aiorename
 from aioshutil import move
-from asyncio import sleep, gather, create_subprocess_exec
+from asyncio import Lock, Semaphore, sleep, gather, create_subprocess_exec
 from asyncio.subprocess import PIPE
 from glob import glob
 from natsort import natsorted
@@ -19,8 +19,6 @@ from bot import (
     multi_tags,
     task_dict,
     task_dict_lock,
-    cpu_eater_lock,
-    subprocess_lock,
     GLOBAL_EXTENSION_FILTER,
     LOGGER,
     DEFAULT_SPLIT_SIZE,
@@ -42,7 +40,10 @@ from bot.helper.ext_utils.files_utils import (
     is_first_archive_split,
     get_base_name,
     clean_target,
+    archive_excludes,
     get_path_size,
+    get_volumes_size,
+    run_7z,
 )
 from bot.helper.ext_utils.links_utils import (
     is_gdrive_id,
@@ -57,6 +58,7 @@ from bot.helper.ext_utils.media_utils import (
     createArchive,
     split_file,
 )
+from bot.helper.ext_utils.stage_pools import stage_pools
 from bot.helper.mirror_utils.gdrive_utlis.list import gdriveList
 from bot.helper.mirror_utils.rclone_utils.list import RcloneList
 from bot.helper.mirror_utils.status_utils.extract_status import ExtractStatus
@@ -87,7 +89,12 @@ class TaskConfig:
         self.isRename: str = ""
         self.splitSize: int = 0
         self.maxSplitSize: int = 0
+        self.archiveProcessed: int = 0
+        self.archiveProcs: set = set()
+        self.virtualSplits: dict = {}
+        self.streamArchive: str = ""
         self.multi: int = 0
+        self.priority: int = 0
         self.isLeech = False
         self.isQbit = False
         self.isJd = False
@@ -109,10 +116,15 @@ class TaskConfig:
         self.as_doc: bool = False
         self.isGofile: bool = False
         self.suproc: create_subprocess_exec | str = None
+        self.suprocLock = Lock()
         self.thumb: str = None
         self.vidMode: list = None
         self.session: Client = None
         self.editable: Message = None
+        self.downloadStart: float = 0
+        self.uploadStart: float = 0
+        self.resumeFrom: str = ""
+        self.checkpoint: dict = None
         self.isSuperChat: bool = self.message.chat.type.name in (
             "SUPERGROUP",
             "CHANNEL",
@@ -634,45 +646,61 @@ class TaskConfig:
             task_dict[self.mid] = FFMpegStatus(self, None, gid, "meta")
 
         clean_metadata = self.user_dict.get("clean_metadata")
-        if await aiopath.isfile(path) and (await get_document_type(path))[0]:
-            base_dir, file_name = ospath.split(path)
-            outfile = ospath.join(self.newDir, file_name)
-            await _run(base_dir, path, outfile, clean_metadata)
-        elif await aiopath.isdir(path):
-            for dirpath, _, files in await sync_to_async(walk, path):
-                for file in files:
-                    if (
-                        self.suproc == "cancelled"
-                        or self.suproc is not None
-                        and self.suproc.returncode == -9
-                    ):
-                        return
-                    video_file = ospath.join(dirpath, file)
-                    if (await get_document_type(video_file))[0]:
-                        outfile = ospath.join(self.newDir, file)
-                        await _run(dirpath, video_file, outfile, clean_metadata)
+        async with stage_pools["ffmpeg"]:
+            if await aiopath.isfile(path) and (await get_document_type(path))[0]:
+                base_dir, file_name = ospath.split(path)
+                outfile = ospath.join(self.newDir, file_name)
+                await _run(base_dir, path, outfile, clean_metadata)
+            elif await aiopath.isdir(path):
+                for dirpath, _, files in await sync_to_async(walk, path):
+                    for file in files:
+                        if (
+                            self.suproc == "cancelled"
+                            or self.suproc is not None
+                            and self.suproc.returncode == -9
+                        ):
+                            return
+                        video_file = ospath.join(dirpath, file)
+                        if (await get_document_type(video_file))[0]:
+                            outfile = ospath.join(self.newDir, file)
+                            await _run(dirpath, video_file, outfile, clean_metadata)
 
     async def proceedExtract(self, dl_path: str, size: int, gid: str):
         pswd = self.extract if isinstance(self.extract, str) else ""
-        try:
-            LOGGER.info("Extracting: %s", self.name)
-            async with task_dict_lock:
-                task_dict[self.mid] = ExtractStatus(self, size, gid)
-            if await aiopath.isdir(dl_path):
-                if self.seed:
-                    self.newDir = f"{self.dir}10000"
-                    up_path = ospath.join(self.newDir, self.name)
-                else:
-                    up_path = dl_path
-                for dirpath, _, files in await sync_to_async(
-                    walk, dl_path, topdown=False
-                ):
-                    for file_ in natsorted(files):
-                        if (
-                            is_first_archive_split(file_)
-                            or is_archive(file_)
-                            and not file_.endswith(".rar")
-                        ):
+        async with stage_pools["extract"]:
+            try:
+                LOGGER.info("Extracting: %s", self.name)
+                async with task_dict_lock:
+                    task_dict[self.mid] = ExtractStatus(self, size, gid)
+                if await aiopath.isdir(dl_path):
+                    if self.seed:
+                        self.newDir = f"{self.dir}10000"
+                        up_path = ospath.join(self.newDir, self.name)
+                    else:
+                        up_path = dl_path
+                    # every archive set is extracted by its own 7z, up to
+                    # EXTRACT_ARCHIVE_WORKERS of them at once
+                    archives = {}
+                    for dirpath, _, files in await sync_to_async(
+                        walk, dl_path, topdown=False
+                    ):
+                        for file_ in natsorted(files):
+                            if (
+                                is_first_archive_split(file_)
+                                or is_archive(file_)
+                                and not file_.endswith(".rar")
+                            ):
+                                archives.setdefault(dirpath, (files, []))[1].append(
+                                    file_
+                                )
+                    slots = Semaphore(max(config_dict["EXTRACT_ARCHIVE_WORKERS"], 1))
+                    failed, stopped = set(), False
+
+                    async def _extract(dirpath, file_, files):
+                        nonlocal stopped
+                        async with slots:
+                            if stopped:
+                                return
                             f_path = ospath.join(dirpath, file_)
                             t_path = (
                                 dirpath.replace(self.dir, self.newDir)
@@ -690,74 +718,80 @@ class TaskConfig:
                             ]
                             if not pswd:
                                 del cmd[2]
-                            async with subprocess_lock:
-                                if self.suproc == "cancelled":
-                                    return
-                                self.suproc = await create_subprocess_exec(
-                                    *cmd, stderr=PIPE
+                            async with archive_excludes(self, f_path, pswd) as excludes:
+                                code, stderr = await run_7z(
+                                    self,
+                                    cmd + excludes,
+                                    await sync_to_async(
+                                        get_volumes_size, dirpath, file_, files
+                                    ),
                                 )
-                            _, stderr = await self.suproc.communicate()
-                            code = self.suproc.returncode
-                            if code == -9:
-                                return
-                            if code != 0:
+                            if code is None or code == -9:
+                                stopped = True
+                            elif code != 0:
+                                failed.add(dirpath)
                                 LOGGER.error(
                                     "%s. Unable to extract archive splits!. Path: %s",
-                                    stderr.decode().strip(),
+                                    stderr,
                                     f_path,
                                 )
-                    if (
-                        not self.seed
-                        and self.suproc is not None
-                        and self.suproc.returncode == 0
-                    ):
-                        for file_ in natsorted(files):
-                            if is_archive_split(file_) or is_archive(file_):
-                                del_path = ospath.join(dirpath, file_)
-                                if not await clean_target(del_path):
-                                    return
-            else:
-                up_path = get_base_name(dl_path)
-                if self.seed:
-                    self.newDir = f"{self.dir}10000"
-                    up_path = up_path.replace(self.dir, self.newDir)
-                cmd = [
-                    "7z",
-                    "x",
-                    f"-p{pswd}",
-                    dl_path,
-                    f"-o{up_path}",
-                    "-aot",
-                    "-xr!@PaxHeader",
-                ]
-                if not pswd:
-                    del cmd[2]
-                async with subprocess_lock:
-                    if self.suproc == "cancelled":
-                        return
-                    self.suproc = await create_subprocess_exec(*cmd, stderr=PIPE)
-                _, stderr = await self.suproc.communicate()
-                code = self.suproc.returncode
-                if code == -9:
-                    return
-                if code == 0:
-                    LOGGER.info("Extracted Path: %s", up_path)
-                    if not self.seed and not await clean_target(dl_path):
+
+                    await gather(
+                        *(
+                            _extract(dirpath, file_, files)
+                            for dirpath, (files, names) in archives.items()
+                            for file_ in names
+                        )
+                    )
+                    if stopped:
                         return
+                    if not self.seed:
+                        for dirpath, (files, _) in archives.items():
+                            if dirpath in failed:
+                                continue
+                            for file_ in natsorted(files):
+                                if is_archive_split(file_) or is_archive(file_):
+                                    del_path = ospath.join(dirpath, file_)
+                                    if not await clean_target(del_path):
+                                        return
                 else:
-                    LOGGER.error(
-                        "%s. Unable to extract archive! Uploading anyway. Path: %s",
-                        stderr.decode().strip(),
+                    up_path = get_base_name(dl_path)
+                    if self.seed:
+                        self.newDir = f"{self.dir}10000"
+                        up_path = up_path.replace(self.dir, self.newDir)
+                    cmd = [
+                        "7z",
+                        "x",
+                        f"-p{pswd}",
                         dl_path,
-                    )
-                    self.newDir = ""
-                    up_path = dl_path
-        except NotSupportedExtractionArchive:
-            LOGGER.info(
-                "Not any valid archive, uploading file as it is. Path: %s", dl_path
-            )
-            self.newDir = ""
-            up_path = dl_path
+                        f"-o{up_path}",
+                        "-aot",
+                        "-xr!@PaxHeader",
+                    ]
+                    if not pswd:
+                        del cmd[2]
+                    async with archive_excludes(self, dl_path, pswd) as excludes:
+                        code, stderr = await run_7z(self, cmd + excludes, size)
+                    if code is None or code == -9:
+                        return
+                    if code == 0:
+                        LOGGER.info("Extracted Path: %s", up_path)
+                        if not self.seed and not await clean_target(dl_path):
+                            return
+                    else:
+                        LOGGER.error(
+                            "%s. Unable to extract archive! Uploading anyway. Path: %s",
+                            stderr,
+                            dl_path,
+                        )
+                        self.newDir = ""
+                        up_path = dl_path
+            except NotSupportedExtractionArchive:
+                LOGGER.info(
+                    "Not any valid archive, uploading file as it is. Path: %s", dl_path
+                )
+                self.newDir = ""
+                up_path = dl_path
 
         up_path = await self.preName(up_path)
         await self.editMetadata(up_path, gid)
@@ -767,98 +801,116 @@ class TaskConfig:
         dl_path = await self.preName(dl_path)
         await self.editMetadata(dl_path, gid)
         self.name = ospath.basename(dl_path)
-        zipmode = self.user_dict.get("zipmode", "zfolder")
-        zfpart = ""
-        pswd = self.compress if isinstance(self.compress, str) else ""
-        if zipmode in ["zfolder", "zfpart"]:
-            async with task_dict_lock:
-                task_dict[self.mid] = ZipStatus(self, size, gid)
-            if self.seed and self.isLeech:
-                self.newDir = f"{self.dir}10000"
-                up_path = ospath.join(self.newDir, f"{self.name}.zip")
-            elif not self.isLeech and zipmode == "zfpart":
-                self.newDir = f"{self.dir}10000"
-                base_name = (
-                    self.name.rsplit(".", 1)[0]
-                    if await aiopath.isfile(dl_path)
-                    else self.name
+        async with stage_pools["compress"]:
+            zipmode = self.user_dict.get("zipmode", "zfolder")
+            zfpart = ""
+            pswd = self.compress if isinstance(self.compress, str) else ""
+            if (
+                config_dict["STREAM_ARCHIVE"]
+                and zipmode == "zfolder"
+                and not pswd
+                and not self.isLeech
+                and not self.isGofile
+                and is_rclone_path(self.upDest)
+            ):
+                # the rclone upload zips dl_path straight into rcat, the
+                # archive never lands on disk
+                self.streamArchive = dl_path
+                return f"{dl_path}.zip"
+            if zipmode in ["zfolder", "zfpart"]:
+                async with task_dict_lock:
+                    task_dict[self.mid] = ZipStatus(self, size, gid)
+                if self.seed and self.isLeech:
+                    self.newDir = f"{self.dir}10000"
+                    up_path = ospath.join(self.newDir, f"{self.name}.zip")
+                elif not self.isLeech and zipmode == "zfpart":
+                    self.newDir = f"{self.dir}10000"
+                    base_name = (
+                        self.name.rsplit(".", 1)[0]
+                        if await aiopath.isfile(dl_path)
+                        else self.name
+                    )
+                    zfpart = ospath.join(self.newDir, base_name)
+                    up_path = ospath.join(zfpart, f"{self.name}.zip")
+                else:
+                    up_path = f"{dl_path}.zip"
+                res = await createArchive(
+                    self, dl_path, up_path, size, pswd, zipmode == "zfpart"
                 )
-                zfpart = ospath.join(self.newDir, base_name)
-                up_path = ospath.join(zfpart, f"{self.name}.zip")
-            else:
-                up_path = f"{dl_path}.zip"
-            res = await createArchive(
-                self, dl_path, up_path, size, pswd, zipmode == "zfpart"
-            )
-            if not res:
-                return
-            return zfpart or up_path
-
-        self.seed = False
-        org_path, archived = dl_path, []
-        for dirpath, _, files in await sync_to_async(walk, self.dir):
-            for file_ in natsorted(files):
-                if self.suproc == "cancelled":
+                if not res:
                     return
-                fpath = ospath.join(dirpath, file_)
-                if file_.lower().endswith(tuple(self.extensionFilter)):
-                    if self.isLeech and file_.startswith("Thumb"):
+                return zfpart or up_path
+
+            self.seed = False
+            org_path, archived = dl_path, []
+            for dirpath, _, files in await sync_to_async(walk, self.dir):
+                for file_ in natsorted(files):
+                    if self.suproc == "cancelled":
+                        return
+                    fpath = ospath.join(dirpath, file_)
+                    if file_.lower().endswith(tuple(self.extensionFilter)):
+                        if self.isLeech and file_.startswith("Thumb"):
+                            continue
+                        await clean_target(fpath)
                         continue
-                    await clean_target(fpath)
-                    continue
-                size = await get_path_size(fpath)
-                self.newDir = f"{self.dir}10000"
-                dest_path = ospath.join(self.newDir, f"{file_}.zip")
-                async with task_dict_lock:
-                    task_dict[self.mid] = ZipStatus(self, size, gid, fpath)
-                if zipmode == "zeach":
-                    archived.append(
-                        await createArchive(self, fpath, dest_path, size, pswd)
-                    )
-                elif zipmode == "zpart" or (
-                    zipmode == "auto" and int(size) > self.splitSize
-                ):
-                    archived.append(
-                        await createArchive(self, fpath, dest_path, size, pswd, True)
-                    )
-                for item in glob(f"{self.newDir}/*"):
-                    await move(item, dirpath)
-                await clean_target(self.newDir)
-        if archived and not all(archived):
-            return
-        return org_path
+                    size = await get_path_size(fpath)
+                    self.newDir = f"{self.dir}10000"
+                    dest_path = ospath.join(self.newDir, f"{file_}.zip")
+                    async with task_dict_lock:
+                        task_dict[self.mid] = ZipStatus(self, size, gid, fpath)
+                    if zipmode == "zeach":
+                        archived.append(
+                            await createArchive(self, fpath, dest_path, size, pswd)
+                        )
+                    elif zipmode == "zpart" or (
+                        zipmode == "auto" and int(size) > self.splitSize
+                    ):
+                        archived.append(
+                            await createArchive(
+                                self, fpath, dest_path, size, pswd, True
+                            )
+                        )
+                    for item in glob(f"{self.newDir}/*"):
+                        await move(item, dirpath)
+                    await clean_target(self.newDir)
+            if archived and not all(archived):
+                return
+            return org_path
 
     async def proceedSplit(
         self, up_dir: str, m_size: list, o_files: list, size: int, gid: str
     ):
-        sp = False
-        self.total_size = 0
-        for dirpath, _, files in await sync_to_async(walk, up_dir, topdown=False):
-            for file_ in files:
-                f_path = ospath.join(dirpath, file_)
-                f_size = await aiopath.getsize(f_path)
-                if f_size > self.splitSize:
-                    if not sp:
-                        sp = SplitStatus(self, size, gid)
-                        async with task_dict_lock:
-                            task_dict[self.mid] = sp
-                        LOGGER.info("Splitting (%s): %s", self.splitSize, self.name)
-                    res = await split_file(
-                        f_path, f_size, dirpath, self.splitSize, self, sp
-                    )
-                    if not res:
-                        return
-                    if res == "errored":
-                        if f_size <= self.maxSplitSize:
-                            continue
-                        if not await clean_target(f_path):
-                            return
-                    elif not self.seed or self.newDir:
-                        if not await clean_target(f_path):
+        async with stage_pools["split"]:
+            sp = False
+            self.total_size = 0
+            for dirpath, _, files in await sync_to_async(walk, up_dir, topdown=False):
+                for file_ in files:
+                    f_path = ospath.join(dirpath, file_)
+                    f_size = await aiopath.getsize(f_path)
+                    if f_size > self.splitSize:
+                        if not sp:
+                            sp = SplitStatus(self, size, gid)
+                            async with task_dict_lock:
+                                task_dict[self.mid] = sp
+                            LOGGER.info("Splitting (%s): %s", self.splitSize, self.name)
+                        res = await split_file(
+                            f_path, f_size, dirpath, self.splitSize, self, sp
+                        )
+                        if not res:
                             return
-                    else:
-                        m_size.append(f_size)
-                        o_files.append(file_)
+                        if res == "virtual":
+                            continue
+                        if res == "errored":
+                            if f_size <= self.maxSplitSize:
+                                continue
+                            if not await clean_target(f_path):
+                                return
+                        elif not self.seed or self.newDir:
+                            if not await clean_target(f_path):
+                                return
+                        else:
+                            m_size.append(f_size)
+                            o_files.append(file_)
         return True
 
     async def generateSampleVideo(self, dl_path, gid):
@@ -871,7 +923,7 @@ class TaskConfig:
 
         samvid = SampleVideo(self, sample_duration, part_duration, gid)
 
-        async with cpu_eater_lock:
+        async with stage_pools["ffmpeg"]:
             checked = False
             if await aiopath.isfile(dl_path):
                 if (await get_document_type(dl_path))[0]:
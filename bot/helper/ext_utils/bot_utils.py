@@ -93,8 +93,7 @@ def bt_selection_buttons(id_: int):
 
 async def get_user_task(user_id: int):
     async with task_dict_lock:
-        uid_count = sum(task.listener.user_id == user_id for task in task_dict.values())
-    return uid_count
+        return task_dict.count_by_user(user_id)
 
 
 def presuf_remname_name(user_dict: int, name: str):
@@ -27,10 +27,11 @@ from bot import (
 from bot.helper.ext_utils.bot_utils import setInterval, sync_to_async
 from bot.helper.ext_utils.db_handler import DbManager
 from bot.helper.ext_utils.files_utils import clean_target
+from bot.helper.ext_utils.flood_limiter import flood_limiter
 from bot.helper.ext_utils.task_manager import start_from_queued
 from bot.helper.mirror_utils.rclone_utils.serve import rclone_serve_booter
 from bot.helper.stream_utils.web_services import start_server, server
-from bot.helper.telegram_helper.message_utils import update_status_message
+from bot.helper.telegram_helper.message_utils import update_all_status_messages
 from bot.modules.rss import addJob
 from bot.modules.torrent_search import initiate_search_tools
 
@@ -44,10 +45,17 @@ default_values = {
     "DOWNLOAD_DIR": "/usr/src/app/downloads/",
     "DISABLE_MIRROR_LEECH": "",
     "USER_SESSION_STRING": "",
+    "HELPER_BOT_TOKENS": "",
     "LEECH_SPLIT_SIZE": DEFAULT_SPLIT_SIZE,
     "STATUS_UPDATE_INTERVAL": 10,
     "SEARCH_LIMIT": 0,
     "STATUS_LIMIT": 10,
+    "EXTRACT_WORKERS": 2,
+    "EXTRACT_ARCHIVE_WORKERS": 1,
+    "COMPRESS_WORKERS": 2,
+    "FFMPEG_WORKERS": 1,
+    "SPLIT_WORKERS": 2,
+    "LEECH_UPLOAD_WORKERS": 1,
     "RSS_DELAY": 900,
     "CLOUD_LINK_FILTERS": "",
     "UPSTREAM_BRANCH": "main",
@@ -214,10 +222,25 @@ async def load_config():
     QUEUE_UPLOAD = int(QUEUE_UPLOAD) if QUEUE_UPLOAD else ""
 
     QUEUE_COMPLETE = environ.get("QUEUE_COMPLETE", "False").lower() == "true"
+    QUEUE_ADAPTIVE = environ.get("QUEUE_ADAPTIVE", "False").lower() == "true"
+    EXTRACT_WORKERS = environ.get("EXTRACT_WORKERS", "")
+    EXTRACT_WORKERS = int(EXTRACT_WORKERS) if EXTRACT_WORKERS else 2
+    EXTRACT_ARCHIVE_WORKERS = environ.get("EXTRACT_ARCHIVE_WORKERS", "")
+    EXTRACT_ARCHIVE_WORKERS = (
+        int(EXTRACT_ARCHIVE_WORKERS) if EXTRACT_ARCHIVE_WORKERS else 1
+    )
+    COMPRESS_WORKERS = environ.get("COMPRESS_WORKERS", "")
+    COMPRESS_WORKERS = int(COMPRESS_WORKERS) if COMPRESS_WORKERS else 2
+    STREAM_ARCHIVE = environ.get("STREAM_ARCHIVE", "False").lower() == "true"
+    FFMPEG_WORKERS = environ.get("FFMPEG_WORKERS", "")
+    FFMPEG_WORKERS = int(FFMPEG_WORKERS) if FFMPEG_WORKERS else 1
+    SPLIT_WORKERS = environ.get("SPLIT_WORKERS", "")
+    SPLIT_WORKERS = int(SPLIT_WORKERS) if SPLIT_WORKERS else 2
 
     ENABLE_STREAM_LINK = environ.get("ENABLE_STREAM_LINK", "False").lower() == "true"
     STREAM_BASE_URL = environ.get("STREAM_BASE_URL", "").rstrip("/")
     STREAM_PORT = environ.get("STREAM_PORT", "")
+    METRICS_TOKEN = environ.get("METRICS_TOKEN", "")
 
     DISABLE_MIRROR_LEECH = environ.get("DISABLE_MIRROR_LEECH", "")
     INDEX_URL = environ.get("INDEX_URL", "").rstrip("/")
@@ -240,6 +263,9 @@ async def load_config():
     USER_SESSION_STRING = environ.get("USER_SESSION_STRING", "")
     SAVE_SESSION_STRING = environ.get("SAVE_SESSION_STRING", "")
     USERBOT_LEECH = environ.get("USERBOT_LEECH", "False").lower() == "true"
+    HELPER_BOT_TOKENS = environ.get("HELPER_BOT_TOKENS", "")
+    LEECH_UPLOAD_WORKERS = environ.get("LEECH_UPLOAD_WORKERS", "")
+    LEECH_UPLOAD_WORKERS = int(LEECH_UPLOAD_WORKERS) if LEECH_UPLOAD_WORKERS else 1
     AUTO_DELETE_MESSAGE_DURATION = int(environ.get("AUTO_DELETE_MESSAGE_DURATION", 30))
     AUTO_DELETE_UPLOAD_MESSAGE_DURATION = int(
         environ.get("AUTO_DELETE_UPLOAD_MESSAGE_DURATION", 0)
@@ -259,11 +285,10 @@ async def load_config():
     START_MESSAGE = environ.get("START_MESSAGE", "")
     STATUS_UPDATE_INTERVAL = int(environ.get("STATUS_UPDATE_INTERVAL", 5))
     if len(task_dict) != 0 and (st := Intervals["status"]):
-        for key, intvl in list(st.items()):
-            intvl.cancel()
-            Intervals["status"][key] = setInterval(
-                STATUS_UPDATE_INTERVAL, update_status_message, key
-            )
+        st.cancel()
+        Intervals["status"] = setInterval(
+            STATUS_UPDATE_INTERVAL, update_all_status_messages
+        )
 
     INCOMPLETE_TASK_NOTIFIER = (
         environ.get("INCOMPLETE_TASK_NOTIFIER", "True").lower() == "true"
@@ -315,6 +340,7 @@ async def load_config():
 
     # ============================= LIMITS =================================
     EQUAL_SPLITS = environ.get("EQUAL_SPLITS", "False").lower() == "true"
+    VIRTUAL_SPLIT = environ.get("VIRTUAL_SPLIT", "False").lower() == "true"
 
     CLONE_LIMIT = environ.get("CLONE_LIMIT", "")
     CLONE_LIMIT = float(CLONE_LIMIT) if CLONE_LIMIT else ""
@@ -334,6 +360,8 @@ async def load_config():
     STATUS_LIMIT = environ.get("STATUS_LIMIT", "")
     STATUS_LIMIT = int(STATUS_LIMIT) if STATUS_LIMIT else 10
 
+    STATUS_SPARKLINE = environ.get("STATUS_SPARKLINE", "False").lower() == "true"
+
     TORRENT_DIRECT_LIMIT = environ.get("TORRENT_DIRECT_LIMIT", "")
     TORRENT_DIRECT_LIMIT = float(TORRENT_DIRECT_LIMIT) if TORRENT_DIRECT_LIMIT else ""
 
@@ -669,6 +697,7 @@ async def load_config():
             "ENABLE_STREAM_LINK": ENABLE_STREAM_LINK,
             "STREAM_BASE_URL": STREAM_BASE_URL,
             "STREAM_PORT": STREAM_PORT,
+            "METRICS_TOKEN": METRICS_TOKEN,
             "DISABLE_MIRROR_LEECH": DISABLE_MIRROR_LEECH,
             "AUTHORIZED_CHATS": AUTHORIZED_CHATS,
             "SUDO_USERS": SUDO_USERS,
@@ -689,6 +718,8 @@ async def load_config():
             "USER_SESSION_STRING": USER_SESSION_STRING,
             "SAVE_SESSION_STRING": SAVE_SESSION_STRING,
             "USERBOT_LEECH": USERBOT_LEECH,
+            "HELPER_BOT_TOKENS": HELPER_BOT_TOKENS,
+            "LEECH_UPLOAD_WORKERS": LEECH_UPLOAD_WORKERS,
             "AUTO_DELETE_MESSAGE_DURATION": AUTO_DELETE_MESSAGE_DURATION,
             "AUTO_DELETE_UPLOAD_MESSAGE_DURATION": AUTO_DELETE_UPLOAD_MESSAGE_DURATION,
             "STATUS_UPDATE_INTERVAL": STATUS_UPDATE_INTERVAL,
@@ -702,6 +733,13 @@ async def load_config():
             "QUEUE_DOWNLOAD": QUEUE_DOWNLOAD,
             "QUEUE_UPLOAD": QUEUE_UPLOAD,
             "QUEUE_COMPLETE": QUEUE_COMPLETE,
+            "QUEUE_ADAPTIVE": QUEUE_ADAPTIVE,
+            "EXTRACT_WORKERS": EXTRACT_WORKERS,
+            "EXTRACT_ARCHIVE_WORKERS": EXTRACT_ARCHIVE_WORKERS,
+            "COMPRESS_WORKERS": COMPRESS_WORKERS,
+            "STREAM_ARCHIVE": STREAM_ARCHIVE,
+            "FFMPEG_WORKERS": FFMPEG_WORKERS,
+            "SPLIT_WORKERS": SPLIT_WORKERS,
             # RCLONE
             "ENABLE_FASTDL": ENABLE_FASTDL,
             "RCLONE_FLAGS": RCLONE_FLAGS,
@@ -719,6 +757,7 @@ async def load_config():
             "LINK_LOG": LINK_LOG,
             # LIMITS
             "EQUAL_SPLITS": EQUAL_SPLITS,
+            "VIRTUAL_SPLIT": VIRTUAL_SPLIT,
             "DAILY_LIMIT_SIZE": DAILY_LIMIT_SIZE,
             "CLONE_LIMIT": CLONE_LIMIT,
             "LEECH_LIMIT": LEECH_LIMIT,
@@ -726,6 +765,7 @@ async def load_config():
             "MEGA_LIMIT": MEGA_LIMIT,
             "NONPREMIUM_LIMIT": NONPREMIUM_LIMIT,
             "STATUS_LIMIT": STATUS_LIMIT,
+            "STATUS_SPARKLINE": STATUS_SPARKLINE,
             "TORRENT_DIRECT_LIMIT": TORRENT_DIRECT_LIMIT,
             "TOTAL_TASKS_LIMIT": TOTAL_TASKS_LIMIT,
             "USER_TASKS_LIMIT": USER_TASKS_LIMIT,
@@ -858,6 +898,7 @@ async def load_config():
     await gather(
         server.cleanup(),
         intialize_userbot(),
+        intialize_helperbots(),
         initiate_search_tools(),
         start_from_queued(),
         rclone_serve_booter(),
@@ -889,6 +930,7 @@ async def intialize_userbot(check=True):
                     no_updates=True,
                     **kwargs,
                 ).start()
+                flood_limiter.attach(userbot)
                 bot_dict["IS_PREMIUM"] = userbot.me.is_premium
                 if bot_dict["IS_PREMIUM"]:
                     bot_dict["USERBOT"] = userbot
@@ -918,6 +960,33 @@ async def intialize_userbot(check=True):
     LOGGER.info("Leech Split Size: %s.", config_dict["LEECH_SPLIT_SIZE"])
 
 
+async def intialize_helperbots(check=True):
+    async with bot_lock:
+        if check:
+            for helper in bot_dict.get("HELPERS", []):
+                if helper.is_connected:
+                    await helper.stop()
+        bot_dict["HELPERS"] = []
+        for index, token in enumerate(config_dict["HELPER_BOT_TOKENS"].split(), 1):
+            try:
+                helper = await Client(
+                    f"helper{index}",
+                    config_dict["TELEGRAM_API"],
+                    config_dict["TELEGRAM_HASH"],
+                    bot_token=token,
+                    in_memory=True,
+                    no_updates=True,
+                    **kwargs,
+                ).start()
+                bot_dict["HELPERS"].append(flood_limiter.attach(helper))
+            except Exception as e:
+                LOGGER.error("Helper bot %s: %s", index, e)
+        if bot_dict["HELPERS"]:
+            LOGGER.info(
+                "%s helper bot(s) added to leech uploads.", len(bot_dict["HELPERS"])
+            )
+
+
 async def intialize_savebot(session_string=None, check=True, user_id=None):
     async with bot_lock:
         if session_string == config_dict["USER_SESSION_STRING"] and (
@@ -962,6 +1031,7 @@ async def intialize_savebot(session_string=None, check=True, user_id=None):
                     no_updates=True,
                     **kwargs,
                 ).start()
+                flood_limiter.attach(savebot)
                 if user_id:
                     bot_dict[user_id]["SAVEBOT"] = savebot
                 else:
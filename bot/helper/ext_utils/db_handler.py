@@ -1,6 +1,7 @@
 from aiofiles import open as aiopen
 from aiofiles.os import path as aiopath, makedirs
 from dotenv import dotenv_values
+from json import dumps, loads
 from motor.motor_asyncio import AsyncIOMotorClient
 from pymongo.errors import PyMongoError
 
@@ -199,6 +200,27 @@ class DbManager:
         await self._db.tasks[bot_id].drop()
         return notifier_dict  # return a dict ==> {cid: {tag: [_id, _id, ...]}}
 
+    async def update_task_journal(self, link, entry):
+        if self._err:
+            return
+        # entries are stored as json, file paths aren't valid field names
+        await self._db.journal[bot_id].replace_one(
+            {"_id": link}, {"entry": dumps(entry)}, upsert=True
+        )
+
+    async def rm_task_journal(self, link):
+        if self._err:
+            return
+        await self._db.journal[bot_id].delete_one({"_id": link})
+
+    async def get_task_journal(self):
+        journal = {}
+        if self._err:
+            return journal
+        async for row in self._db.journal[bot_id].find({}):
+            journal[row["_id"]] = loads(row["entry"])
+        return journal
+
     async def delete_user(self, user_id):
         if not self._err and user_data.pop(user_id, None):
             await self._db.users[bot_id].delete_one({"_id": user_id})
@@ -0,0 +1,66 @@
+from aria2p import Download
+from threading import Lock
+from time import time
+
+from bot import aria2, get_client, LOGGER
+
+
+class EngineSnapshot:
+    def __init__(self, ttl=1):
+        self._ttl = ttl
+        self._lock = Lock()
+        self._qb_client = None
+        self._taken = 0
+        self._qbit = {}
+        self._aria2 = {}
+
+    @property
+    def fresh(self):
+        return time() - self._taken < self._ttl
+
+    def _qbit_torrents(self):
+        if not self._qb_client:
+            self._qb_client = get_client()
+        try:
+            return {tor.tags: tor for tor in self._qb_client.torrents_info()}
+        except Exception as e:
+            LOGGER.error("%s: Qbittorrent, while taking snapshot", e)
+            self._qb_client = None
+            return {}
+
+    @staticmethod
+    def _aria2_downloads():
+        try:
+            results = aria2.client.multicall2(
+                [
+                    (aria2.client.TELL_ACTIVE,),
+                    (aria2.client.TELL_WAITING, 0, 1000),
+                ]
+            )
+        except Exception as e:
+            LOGGER.error("%s: Aria2c, while taking snapshot", e)
+            return {}
+        return {
+            struct["gid"]: Download(aria2, struct)
+            for result in results
+            for struct in result[0]
+        }
+
+    def refresh(self, tasks):
+        """Take one engine snapshot for all tasks, at most once per ttl"""
+        with self._lock:
+            if self.fresh:
+                return
+            engines = {tk.engine() for tk in tasks}
+            self._qbit = self._qbit_torrents() if "qBittorrent" in engines else {}
+            self._aria2 = self._aria2_downloads() if "Aria2" in engines else {}
+            self._taken = time()
+
+    def get_qbit(self, tag):
+        return self._qbit.get(tag) if self.fresh else None
+
+    def get_aria2(self, gid):
+        return self._aria2.get(gid) if self.fresh else None
+
+
+engine_snapshot = EngineSnapshot()
@@ -0,0 +1,62 @@
+from heapq import heapify, heappop, heappush
+from itertools import count
+
+
+class FairQueue(dict):
+    """mid -> Event dict that hands queued mids out in weighted fair order.
+
+    Every push gets a virtual finish tag of ``max(now, user's last tag) + 1/weight``,
+    so one user's bulk job interleaves with other users instead of starving them.
+    Higher priority entries always go first. Removal is lazy, so push and
+    pop_next are O(log n).
+    """
+
+    def __init__(self):
+        super().__init__()
+        self._heap = []
+        self._seq = count()
+        self._tokens = {}
+        self._finish = {}
+        self._vtime = 0.0
+
+    def push(self, mid, event, user_id=None, weight=1, priority=0):
+        super().__setitem__(mid, event)
+        tag = max(self._vtime, self._finish.get(user_id, 0)) + 1 / weight
+        self._finish[user_id] = tag
+        self._tokens[mid] = seq = next(self._seq)
+        heappush(self._heap, (-priority, tag, seq, mid))
+
+    def __setitem__(self, mid, event):
+        self.push(mid, event)
+
+    def __delitem__(self, mid):
+        super().__delitem__(mid)
+        self._forget(mid)
+
+    def pop(self, mid, *default):
+        if mid in self:
+            self._forget(mid)
+        return super().pop(mid, *default)
+
+    def clear(self):
+        super().clear()
+        self._heap.clear()
+        self._tokens.clear()
+        self._finish.clear()
+
+    def _forget(self, mid):
+        self._tokens.pop(mid, None)
+        if len(self._heap) > 2 * len(self._tokens) + 32:
+            self._heap = [e for e in self._heap if self._tokens.get(e[3]) == e[2]]
+            heapify(self._heap)
+
+    def pop_next(self):
+        """Take the next mid to admit off the schedule, or None. The caller sets
+        and deletes its event."""
+        while self._heap:
+            _, tag, seq, mid = heappop(self._heap)
+            if self._tokens.get(mid) == seq:
+                del self._tokens[mid]
+                self._vtime = max(self._vtime, tag)
+                return mid
+        return None
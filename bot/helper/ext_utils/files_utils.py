@@ -2,11 +2,36 @@ from aiofiles import open as aiopen
 from aiofiles.os import remove as aioremove, path as aiopath, listdir
 from aiohttp import ClientSession
 from aioshutil import rmtree as aiormtree, disk_usage
+from asyncio import create_subprocess_exec, gather
+from asyncio.subprocess import PIPE
+from contextlib import asynccontextmanager
+from fcntl import ioctl
+from io import RawIOBase
 from magic import Magic
-from os import walk, path as ospath, makedirs
-from re import split as re_split, search as re_search, escape, I
+from os import (
+    walk,
+    path as ospath,
+    makedirs,
+    scandir,
+    link,
+    remove,
+    open as osopen,
+    close,
+    pread,
+    O_RDONLY,
+)
+from re import (
+    split as re_split,
+    search as re_search,
+    findall as re_findall,
+    sub as re_sub,
+    escape,
+    I,
+)
+from shutil import copy
 from subprocess import run as srun
 from sys import exit as sexit
+from tempfile import NamedTemporaryFile
 
 from bot import (
     aria2,
@@ -20,7 +45,11 @@ from bot import (
 )
 from bot.helper.ext_utils.bot_utils import sync_to_async, async_to_sync, cmd_exec
 from bot.helper.ext_utils.exceptions import NotSupportedExtractionArchive
+from bot.helper.ext_utils.task_journal import task_journal
+
 
+# linux/fs.h, fcntl only exports it from python 3.12 on
+FICLONE = 0x40049409
 
 ARCH_EXT = [
     ".tar.bz2",
@@ -79,6 +108,102 @@ def is_archive_split(file):
     return bool(re_search(SPLIT_REGEX, file))
 
 
+def get_volumes_size(dirpath, file_, files):
+    """Size of the archive starting at ``file_`` with all of its split volumes"""
+    stem = re_sub(r"((\.|_)part0*1\.rar|\.7z\.0*1|\.zip\.0*1|\.rar)$", "", file_)
+    return sum(
+        ospath.getsize(ospath.join(dirpath, f))
+        for f in files
+        if f.startswith(stem) and (f == file_ or is_archive_split(f) or is_archive(f))
+    )
+
+
+def _write_listfile(members):
+    with NamedTemporaryFile(
+        "w", encoding="utf-8", suffix=".lst", delete=False
+    ) as listfile:
+        listfile.write("\n".join(members))
+    return listfile.name
+
+
+@asynccontextmanager
+async def archive_excludes(listener, path, pswd):
+    """7z switches that skip the members of archive ``path`` the extension
+    filter would drop after extraction anyway, read from its ``7z l -slt``
+    listing. The members go through a listfile, big archives would overflow
+    the command line."""
+    # aria2 and !qB are always in the filter and never inside archives
+    if len(listener.extensionFilter) <= 2:
+        yield []
+        return
+    stdout, stderr, code = await cmd_exec(["7z", "l", "-slt", f"-p{pswd}", path])
+    _, sep, members = stdout.partition("\n----------\n")
+    if code != 0 or not sep:
+        LOGGER.warning(
+            "%s. Unable to list archive, extracting all of: %s", stderr, path
+        )
+        yield []
+        return
+    excludes = []
+    for block in members.split("\n\n"):
+        entry = dict(
+            line.split(" = ", 1) for line in block.splitlines() if " = " in line
+        )
+        if (
+            (member := entry.get("Path"))
+            and entry.get("Folder") != "+"
+            and ospath.basename(member)
+            .lower()
+            .endswith(tuple(listener.extensionFilter))
+        ):
+            excludes.append(member)
+    if not excludes:
+        yield []
+        return
+    LOGGER.info("Skipping %s filtered members of: %s", len(excludes), path)
+    listfile = await sync_to_async(_write_listfile, excludes)
+    try:
+        yield ["-scsUTF-8", f"-x@{listfile}"]
+    finally:
+        await clean_target(listfile)
+
+
+async def run_7z(listener, cmd, share):
+    """Run 7z with its -bsp1 percentage stream parsed into
+    listener.archiveProcessed, ``share`` being the bytes this run stands for"""
+    async with listener.suprocLock:
+        if listener.suproc == "cancelled":
+            return None, ""
+        listener.suproc = await create_subprocess_exec(
+            *cmd, "-bsp1", "-bso0", stdout=PIPE, stderr=PIPE
+        )
+        proc = listener.suproc
+    # other 7z runs of the task may add to archiveProcessed meanwhile, so only
+    # this run's own bytes are ever added
+    counted = 0
+    listener.archiveProcs.add(proc)
+
+    async def _read_progress():
+        nonlocal counted
+        tail = b""
+        while chunk := await proc.stdout.read(4096):
+            # 7z redraws the percentage in place with backspaces
+            data, tail = tail + chunk, chunk[-8:]
+            if percents := re_findall(rb"(\d+)%", data):
+                done = share * int(percents[-1]) // 100
+                listener.archiveProcessed += max(done - counted, 0)
+                counted = max(done, counted)
+
+    try:
+        _, stderr = await gather(_read_progress(), proc.stderr.read())
+        code = await proc.wait()
+    finally:
+        listener.archiveProcs.discard(proc)
+    if code == 0:
+        listener.archiveProcessed += share - counted
+    return code, stderr.decode().strip()
+
+
 async def clean_target(path, log=False):
     if not await aiopath.exists(str(path)):
         return False
@@ -97,13 +222,23 @@ async def clean_download(path):
         await clean_target(path)
 
 
+def _clean_dir(path, keep):
+    if not ospath.isdir(path) or not any(dir_.startswith(path) for dir_ in keep):
+        async_to_sync(clean_target, path)
+        return
+    for item in scandir(path):
+        if item.path not in keep:
+            async_to_sync(clean_target, item.path)
+
+
 def clean_all():
     aria2.remove_all(True)
     get_client().torrents_delete(torrent_hashes="all")
+    keep = task_journal.keep_dirs()
     CURRENT_DIR = config_dict["DOWNLOAD_DIR"]
-    async_to_sync(clean_target, CURRENT_DIR)
+    _clean_dir(CURRENT_DIR, keep)
     if DOWNLOAD_DIR != CURRENT_DIR:
-        async_to_sync(clean_target, DOWNLOAD_DIR)
+        _clean_dir(DOWNLOAD_DIR, keep)
     makedirs(DOWNLOAD_DIR, exist_ok=True)
 
 
@@ -143,6 +278,75 @@ async def clean_unwanted(path):
             await clean_target(dirpath)
 
 
+def _link_or_copy(src, dst):
+    if ospath.lexists(dst):
+        remove(dst)
+    try:
+        link(src, dst)
+        return ospath.getsize(dst)
+    except OSError:
+        pass
+    try:
+        with open(src, "rb") as fsrc, open(dst, "wb") as fdst:
+            ioctl(fdst.fileno(), FICLONE, fsrc.fileno())
+        return ospath.getsize(dst)
+    except OSError:
+        pass
+    copy(src, dst)
+    return 0
+
+
+async def link_or_copy(src, dst):
+    """Seeding copy of ``src`` at ``dst`` sharing its data blocks when the
+    filesystem allows it: a hardlink, then a reflink, then a real copy.
+    Returns the bytes that didn't have to be written."""
+    return await sync_to_async(_link_or_copy, src, dst)
+
+
+class FileWindow(RawIOBase):
+    """Read-only view of ``length`` bytes of ``path`` from ``offset`` on, named
+    like a split part so it uploads as one without being written to disk"""
+
+    def __init__(self, path, offset, length, name):
+        super().__init__()
+        self.path = path
+        self.offset = offset
+        self.length = length
+        self.name = name
+        self._pos = 0
+        self._fd = None
+
+    def readable(self):
+        return True
+
+    def seekable(self):
+        return True
+
+    def seek(self, pos, whence=0):
+        base = (0, self._pos, self.length)[whence]
+        self._pos = min(max(base + pos, 0), self.length)
+        return self._pos
+
+    def tell(self):
+        return self._pos
+
+    def readinto(self, b):
+        if (size := min(len(b), self.length - self._pos)) <= 0:
+            return 0
+        if self._fd is None:
+            self._fd = osopen(self.path, O_RDONLY)
+        data = pread(self._fd, size, self.offset + self._pos)
+        b[: len(data)] = data
+        self._pos += len(data)
+        return len(data)
+
+    def close(self):
+        if self._fd is not None:
+            close(self._fd)
+            self._fd = None
+        super().close()
+
+
 async def get_path_size(path):
     if await aiopath.isfile(path):
         return await aiopath.getsize(path)
@@ -170,19 +374,17 @@ async def check_storage_threshold(size: int, arch=False, alloc=False):
         config_dict["STORAGE_THRESHOLD"],
         config_dict["DOWNLOAD_DIR"],
     )
+    free = (await disk_usage(DOWNLOAD_DIR)).free
     if not alloc:
         if not arch:
-            if await disk_usage(DOWNLOAD_DIR).free - size < STORAGE_THRESHOLD * 1024**3:
+            if free - size < STORAGE_THRESHOLD * 1024**3:
                 return False
-        elif (
-            await disk_usage(DOWNLOAD_DIR).free - (size * 2)
-            < STORAGE_THRESHOLD * 1024**3
-        ):
+        elif free - (size * 2) < STORAGE_THRESHOLD * 1024**3:
             return False
     elif not arch:
-        if await disk_usage(DOWNLOAD_DIR).free < STORAGE_THRESHOLD * 1024**3:
+        if free < STORAGE_THRESHOLD * 1024**3:
             return False
-    elif await disk_usage(DOWNLOAD_DIR).free - size < STORAGE_THRESHOLD * 1024**3:
+    elif free - size < STORAGE_THRESHOLD * 1024**3:
         return False
     return True
 
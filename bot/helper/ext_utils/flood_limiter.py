@@ -0,0 +1,172 @@
+from asyncio import sleep
+from contextlib import contextmanager
+from contextvars import ContextVar
+from functools import wraps
+from pyrogram.errors import FloodWait
+from pyrogram.raw.functions.messages import (
+    EditMessage,
+    ForwardMessages,
+    SendMedia,
+    SendMessage,
+    SendMultiMedia,
+)
+from pyrogram.raw.types import InputPeerChannel, InputPeerChat, InputPeerUser
+from time import time
+
+from bot import LOGGER
+
+# Telegram's published bot limits: ~30 messages/s overall, ~1/s in one chat and
+# 20/min in one group or channel
+CLIENT_RATE, CLIENT_BURST = 30, 30
+CHAT_RATE, CHAT_BURST = 1, 2
+GROUP_RATE, GROUP_BURST = 20 / 60, 3
+# user accounts have no published limits and no 20/min group cap, they get the
+# per chat pace everywhere and FloodWaits tune the rest
+USER_RATE, USER_BURST = 10, 10
+MIN_RATE = 1 / 60
+# chat tokens only priority calls (status edits) may take
+RESERVED_TOKENS = 1
+
+# (client, private chat, group) bucket defaults, by client.me.is_bot
+LIMITS = {
+    True: (
+        (CLIENT_RATE, CLIENT_BURST),
+        (CHAT_RATE, CHAT_BURST),
+        (GROUP_RATE, GROUP_BURST),
+    ),
+    False: ((USER_RATE, USER_BURST), (CHAT_RATE, CHAT_BURST), (CHAT_RATE, CHAT_BURST)),
+}
+
+LIMITED_QUERIES = (SendMessage, SendMedia, SendMultiMedia, EditMessage, ForwardMessages)
+
+_priority = ContextVar("flood_priority", default=False)
+
+
+class TokenBucket:
+    def __init__(self, rate, burst):
+        self.default = self.rate = rate
+        self.burst = self.tokens = burst
+        self.stamp = time()
+        self.until = 0
+
+    def delay(self, now, reserve=0):
+        self.tokens = min(self.burst, self.tokens + (now - self.stamp) * self.rate)
+        self.stamp = now
+        return max(self.until - now, (1 + reserve - self.tokens) / self.rate, 0)
+
+    def take(self):
+        self.tokens -= 1
+
+    def penalize(self, seconds, now):
+        self.until = max(self.until, now + seconds)
+        self.rate = max(self.rate / 2, MIN_RATE)
+        self.tokens = 0
+
+    def relax(self):
+        self.rate = min(self.rate + self.default / 20, self.default)
+
+
+def _peer_id(query):
+    peer = getattr(query, "to_peer", None) or getattr(query, "peer", None)
+    if isinstance(peer, InputPeerUser):
+        return peer.user_id
+    if isinstance(peer, InputPeerChat):
+        return -peer.chat_id
+    if isinstance(peer, InputPeerChannel):
+        return -1000000000000 - peer.channel_id
+    return 0
+
+
+class FloodLimiter:
+    """Token buckets for every Telegram client, overall and per chat.
+
+    Attached clients take a token from both buckets before each send, edit,
+    copy or forward, so concurrent tasks share the allowance instead of
+    racing into FloodWaits. A FloodWait halves the rate of the bucket it hit
+    and blocks it for the wait, successful calls slowly restore the rate.
+    Calls made under ``priority()`` may take the chat's last token, so status
+    edits keep going while uploads drain a chat.
+    """
+
+    def __init__(self):
+        self._clients = {}
+        self._chats = {}
+
+    def _buckets(self, client, chat_id):
+        client_limit, chat_limit, group_limit = LIMITS[
+            getattr(client.me, "is_bot", True)
+        ]
+        if client.name not in self._clients:
+            self._clients[client.name] = TokenBucket(*client_limit)
+        key = (client.name, chat_id)
+        if key not in self._chats:
+            self._chats[key] = TokenBucket(
+                *(group_limit if chat_id < 0 else chat_limit)
+            )
+        return self._clients[client.name], self._chats[key]
+
+    def delay(self, client, chat_id=None, priority=False):
+        """Seconds before ``client`` may send again, to ``chat_id`` if given"""
+        now = time()
+        if chat_id is None:
+            if bucket := self._clients.get(client.name):
+                return bucket.delay(now)
+            return 0
+        client_bucket, chat_bucket = self._buckets(client, chat_id)
+        return max(
+            client_bucket.delay(now),
+            chat_bucket.delay(now, 0 if priority else RESERVED_TOKENS),
+        )
+
+    @staticmethod
+    @contextmanager
+    def priority():
+        token = _priority.set(True)
+        try:
+            yield
+        finally:
+            _priority.reset(token)
+
+    async def acquire(self, client, chat_id):
+        priority = _priority.get()
+        while (delay := self.delay(client, chat_id, priority)) > 0:
+            await sleep(delay)
+        for bucket in self._buckets(client, chat_id):
+            bucket.take()
+
+    def flood(self, client, chat_id, seconds):
+        now = time()
+        client_bucket, chat_bucket = self._buckets(client, chat_id)
+        chat_bucket.penalize(seconds, now)
+        # a wait far beyond the chat's own pace means the client is over its
+        # overall limit, not just this chat
+        if seconds > 1 / chat_bucket.default:
+            client_bucket.penalize(seconds, now)
+
+    def relax(self, client, chat_id):
+        for bucket in self._buckets(client, chat_id):
+            bucket.relax()
+
+    def attach(self, client):
+        invoke = client.invoke
+
+        @wraps(invoke)
+        async def _invoke(query, *args, **kwargs):
+            if not isinstance(query, LIMITED_QUERIES):
+                return await invoke(query, *args, **kwargs)
+            chat_id = _peer_id(query)
+            await self.acquire(client, chat_id)
+            try:
+                result = await invoke(query, *args, **kwargs)
+            except FloodWait as f:
+                LOGGER.warning("%s: FloodWait %ss in %s", client.name, f.value, chat_id)
+                self.flood(client, chat_id, f.value)
+                raise
+            self.relax(client, chat_id)
+            return result
+
+        client.invoke = _invoke
+        return client
+
+
+flood_limiter = FloodLimiter()
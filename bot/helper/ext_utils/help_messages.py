@@ -186,6 +186,7 @@ Available Arguments:
 🌝 Extract Archive: <code>-e</code>
 🌝 Join: <code>-j</code>
 🌝 Multi Link: <code>-i</code>
+🌝 Queue Priority: <code>-pr</code>
 🌝 Seed (Torrent): <code>-d</code>
 🌝 Select (Torrent) <code>-s</code>
 🌝 Same Directory: <code>-m</code>
@@ -235,6 +236,9 @@ Note: Range link will work only by replying cmd to it
 <b>Split size for current task</b>: -sp
 <code>/cmd link -sp</code> (<code>500mb</code> or <code>2gb</code> or <code>4000000000</code>)
 Note: Only mb and gb are supported or write in bytes without unit!
+
+<b>Queue priority for current task</b>: -pr
+<code>/cmd link -pr 1</code> (higher starts first from queue, only premium users can go above 0)
 """
 
     MLZUZ = """
@@ -367,6 +371,7 @@ Available Arguments:
 ⁍ New Name: <code>-n</code>
 ⁍ Zip to Archive: <code>-z</code>
 ⁍ Multi Link: <code>-i</code>
+⁍ Queue Priority: <code>-pr</code>
 ⁍ Quality Select: <code>-s</code>
 ⁍ Same Directory: <code>-m</code>
 ⁍ Bulk Download: <code>-b</code>
@@ -410,6 +415,9 @@ Up to 10 screenshots for one video
 <b>Split size for current task</b>: -sp
 <code>/cmd link -sp</code> (<code>500mb</code> or <code>2gb</code> or <code>4000000000</code>)
 Note: Only mb and gb are supported or write in bytes without unit!
+
+<b>Queue priority for current task</b>: -pr
+<code>/cmd link -pr 1</code> (higher starts first from queue, only premium users can go above 0)
 """
 
     YLBULK = """
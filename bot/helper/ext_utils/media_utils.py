@@ -1,21 +1,31 @@
-from aiofiles.os import path as aiopath, makedirs
+from aiofiles.os import path as aiopath, makedirs, stat as aiostat
 from aioshutil import move
-from ast import literal_eval
-from asyncio import create_subprocess_exec, gather, sleep, wait_for
+from collections import OrderedDict
+from asyncio import (
+    create_subprocess_exec,
+    ensure_future,
+    gather,
+    shield,
+    sleep,
+    wait_for,
+)
 from asyncio.subprocess import PIPE
+from glob import escape as glob_escape, glob
+from json import loads
 from os import path as ospath, cpu_count
 from PIL import Image
 from pyrogram.types import Message
 from re import search as re_search, findall as re_findall, split as re_split
 from time import time
 
-from bot import config_dict, subprocess_lock, LOGGER, DEFAULT_SPLIT_SIZE, FFMPEG_NAME
+from bot import config_dict, LOGGER, DEFAULT_SPLIT_SIZE, FFMPEG_NAME
 from bot.helper.ext_utils.bot_utils import cmd_exec, sync_to_async, is_premium_user
 from bot.helper.ext_utils.files_utils import (
     ARCH_EXT,
     get_mime_type,
     get_path_size,
     clean_target,
+    run_7z,
 )
 from bot.helper.ext_utils.links_utils import get_url_name
 from bot.helper.ext_utils.status_utils import get_readable_file_size
@@ -47,9 +57,13 @@ async def createThumb(msg: Message, _id: int = 0):
     return des_dir
 
 
-async def is_multi_streams(path):
+PROBE_CACHE_SIZE = 1024
+_probe_cache = OrderedDict()
+
+
+async def _ffprobe(path):
     try:
-        result = await cmd_exec(
+        stdout, stderr, rcode = await cmd_exec(
             [
                 "ffprobe",
                 "-hide_banner",
@@ -57,18 +71,42 @@ async def is_multi_streams(path):
                 "error",
                 "-print_format",
                 "json",
+                "-show_format",
                 "-show_streams",
                 path,
             ]
         )
-        if res := result[1]:
-            LOGGER.warning("Get Video Streams: %s", res)
+        if stderr:
+            LOGGER.warning("Probe: %s", stderr)
+        if rcode != 0:
+            return {}
+        return loads(stdout)
     except Exception as e:
-        LOGGER.error("Get Video Streams: %s. Mostly File not found!", e)
-        return False
-    fields = literal_eval(result[0]).get("streams")
+        LOGGER.error("Probe: %s. Mostly File not found!", e)
+        return {}
+
+
+async def probe(path):
+    """Single ffprobe (format and streams) of a file, shared by every media
+    helper and cached for as long as the file keeps its inode, size and mtime"""
+    try:
+        st = await aiostat(path)
+    except (OSError, ValueError):
+        return await _ffprobe(path)
+    key = (st.st_dev, st.st_ino, st.st_size, st.st_mtime_ns)
+    if (result := _probe_cache.get(key)) is None:
+        result = _probe_cache[key] = ensure_future(_ffprobe(path))
+        while len(_probe_cache) > PROBE_CACHE_SIZE:
+            _probe_cache.popitem(last=False)
+    else:
+        _probe_cache.move_to_end(key)
+    return await shield(result)
+
+
+async def is_multi_streams(path):
+    fields = (await probe(path)).get("streams")
     if fields is None:
-        LOGGER.error("Get Video Streams: %s", result)
+        LOGGER.error("Get Video Streams: %s", path)
         return False
     videos = audios = 0
     for stream in fields:
@@ -80,27 +118,9 @@ async def is_multi_streams(path):
 
 
 async def get_media_info(path):
-    try:
-        result = await cmd_exec(
-            [
-                "ffprobe",
-                "-hide_banner",
-                "-loglevel",
-                "error",
-                "-print_format",
-                "json",
-                "-show_format",
-                path,
-            ]
-        )
-        if res := result[1]:
-            LOGGER.warning("Get Media Info: %s", res)
-    except Exception as e:
-        LOGGER.error("Get Media Info: %s. Mostly File not found!", e)
-        return 0, None, None
-    fields = literal_eval(result[0]).get("format")
+    fields = (await probe(path)).get("format")
     if fields is None:
-        LOGGER.error("Get_media_info: %s", result)
+        LOGGER.error("Get_media_info: %s", path)
         return 0, None, None
     duration = round(float(fields.get("duration", 0)))
     tags = fields.get("tags", {})
@@ -148,27 +168,9 @@ async def get_document_type(path):
         return False, True, False
     if not mime_type.startswith("video") and not mime_type.endswith("octet-stream"):
         return is_video, is_audio, is_image
-    try:
-        result = await cmd_exec(
-            [
-                "ffprobe",
-                "-hide_banner",
-                "-loglevel",
-                "error",
-                "-print_format",
-                "json",
-                "-show_streams",
-                path,
-            ]
-        )
-        if res := result[1]:
-            LOGGER.warning("Get Document Type: %s", res)
-    except Exception as e:
-        LOGGER.error("Get Document Type: %s. Mostly File not found!", e)
-        return is_video, is_audio, is_image
-    fields = literal_eval(result[0]).get("streams")
+    fields = (await probe(path)).get("streams")
     if fields is None:
-        LOGGER.error("Get_document_type: %s", result)
+        LOGGER.error("Get_document_type: %s", path)
         return is_video, is_audio, is_image
     for stream in fields:
         if stream.get("codec_type") == "video":
@@ -298,6 +300,110 @@ async def create_thumbnail(video_file, duration):
     return des_dir
 
 
+async def _keyframe_cuts(path, split_size, listener):
+    """Cut times that keep every part under ``split_size`` bytes, planned from
+    the file offsets of the video keyframes in one demux-only ffprobe pass"""
+    cmd = [
+        "ffprobe",
+        "-v",
+        "error",
+        "-select_streams",
+        "v:0",
+        "-show_entries",
+        "packet=pts_time,pos,flags",
+        "-of",
+        "csv=p=0",
+        path,
+    ]
+    async with listener.suprocLock:
+        if listener.suproc == "cancelled":
+            return None
+        listener.suproc = await create_subprocess_exec(*cmd, stdout=PIPE, stderr=PIPE)
+    stdout, _ = await listener.suproc.communicate()
+    if listener.suproc.returncode != 0:
+        return None
+    cuts, first, start_pos, last_key = [], None, 0, None
+    for line in stdout.decode().splitlines():
+        pts, pos, flags = (line.split(",") + ["", ""])[:3]
+        if "K" not in flags or pts in ("", "N/A") or pos in ("", "N/A"):
+            continue
+        pts, pos = float(pts), int(pos)
+        if first is None:
+            first = pts
+        if last_key and pos - start_pos > split_size:
+            cuts.append(last_key[0] - first)
+            start_pos = last_key[1]
+        last_key = (pts, pos)
+    return cuts
+
+
+async def _segment_video(path, split_size, listener, multi_streams):
+    """Split a video into all its parts in one ffmpeg pass with the segment
+    muxer, returns the part paths or None when the per part split is needed"""
+    # without a cut the muxer falls back to its 2s default segment_time
+    if not (cuts := await _keyframe_cuts(path, split_size, listener)):
+        return None
+    base_name, extension = ospath.splitext(path)
+    pattern = f"{base_name.replace('%', '%%')}.part%03d{extension}"
+    cmd = [
+        FFMPEG_NAME,
+        "-hide_banner",
+        "-loglevel",
+        "error",
+        "-i",
+        path,
+        "-map",
+        "0",
+        "-map_chapters",
+        "-1",
+        "-c",
+        "copy",
+        "-f",
+        "segment",
+        "-reset_timestamps",
+        "1",
+        "-segment_start_number",
+        "1",
+        # a hair before each keyframe so the muxer cuts exactly on it
+        "-segment_times",
+        ",".join(f"{max(t - 0.001, 0):.3f}" for t in cuts),
+        pattern,
+    ]
+    if not multi_streams:
+        del cmd[6:8]
+    async with listener.suprocLock:
+        if listener.suproc == "cancelled":
+            return None
+        listener.suproc = await create_subprocess_exec(*cmd, stderr=PIPE)
+    _, stderr = await listener.suproc.communicate()
+    outputs = [f"{base_name}.part{i:03}{extension}" for i in range(1, len(cuts) + 2)]
+    # anything the muxer wrote beyond the planned parts means the plan failed
+    written = await sync_to_async(
+        glob, f"{glob_escape(base_name)}.part[0-9][0-9][0-9]*{glob_escape(extension)}"
+    )
+    code = listener.suproc.returncode
+    if (
+        code == 0
+        and set(written) == set(outputs)
+        and all(
+            [
+                await aiopath.exists(out)
+                and await get_path_size(out) <= listener.maxSplitSize
+                for out in outputs
+            ]
+        )
+    ):
+        return outputs
+    if code not in (0, -9):
+        LOGGER.warning(
+            "%s. Single pass split failed, splitting part by part. Path: %s",
+            stderr.decode().strip(),
+            path,
+        )
+    await gather(*[clean_target(out) for out in {*outputs, *written}])
+    return None
+
+
 async def split_file(
     path,
     size,
@@ -326,6 +432,19 @@ async def split_file(
         duration = (await get_media_info(path))[0]
         base_name, extension = ospath.splitext(path)
         split_size -= 5000000
+        if not inLoop and (
+            outputs := await _segment_video(path, split_size, listener, multi_streams)
+        ):
+            # split status counts the task dir growth, the original leaves it
+            # right after unless it stays for seeding
+            if not listener.seed or listener.newDir:
+                for out in outputs:
+                    listener.total_size += await get_path_size(out)
+            return True
+        if listener.suproc == "cancelled" or (
+            listener.suproc and listener.suproc.returncode == -9
+        ):
+            return
         while i <= parts or start_time < duration - 4:
             out_path = f"{base_name}.part{i:03}{extension}"
             cmd = [
@@ -353,7 +472,7 @@ async def split_file(
             ]
             if not multi_streams:
                 del cmd[10:12]
-            async with subprocess_lock:
+            async with listener.suprocLock:
                 if listener.suproc == "cancelled":
                     return False
                 listener.suproc = await create_subprocess_exec(*cmd, stderr=PIPE)
@@ -422,10 +541,15 @@ async def split_file(
                 break
             start_time += lpd - 3
             i += 1
+    elif config_dict["VIRTUAL_SPLIT"]:
+        # the uploader sends the parts straight from byte windows of the file
+        listener.virtualSplits[path] = split_size
+        listener.total_size += size
+        return "virtual"
     else:
         obj.state = "archive"
         out_path = f"{path}."
-        async with subprocess_lock:
+        async with listener.suprocLock:
             if listener.suproc == "cancelled":
                 return False
             listener.suproc = await create_subprocess_exec(
@@ -453,7 +577,7 @@ class FFProgress:
         self._duration = 0
         self._start_time = time()
         self._eta = 0
-        self._percentage = "0%"
+        self._progress_raw = 0
         self._processed_bytes = 0
 
     @property
@@ -461,8 +585,8 @@ class FFProgress:
         return self._processed_bytes
 
     @property
-    def percentage(self):
-        return self._percentage
+    def progress_raw(self):
+        return self._progress_raw
 
     @property
     def eta(self):
@@ -505,9 +629,7 @@ class FFProgress:
                 hh, mm, sms = progress["time"].split(":")
                 time_to_second = (int(hh) * 3600) + (int(mm) * 60) + float(sms)
                 self._processed_bytes = int(progress["size"].rstrip("kB")) * 1024
-                self._percentage = (
-                    f"{round((time_to_second / self._duration) * 100, 2)}%"
-                )
+                self._progress_raw = time_to_second / self._duration * 100
                 try:
                     self._eta = (
                         self._duration / float(progress["speed"].strip("x"))
@@ -634,19 +756,14 @@ async def createArchive(listener, scr_path, dest_path, size, pswd, mpart=False):
         if not pswd:
             del cmd[3]
         LOGGER.info("Zip: orig_path: %s, zip_path: %s", scr_path, dest_path)
-    async with subprocess_lock:
-        if listener.suproc == "cancelled":
-            return
-        listener.suproc = await create_subprocess_exec(*cmd, stderr=PIPE)
-    _, stderr = await listener.suproc.communicate()
-    code = listener.suproc.returncode
-    if code == -9:
+    code, stderr = await run_7z(listener, cmd, int(size))
+    if code is None or code == -9:
         return
     if code == 0:
         if not listener.seed:
             await clean_target(scr_path, True)
         return True
-    LOGGER.error("%s. Unable to zip this path: %s", stderr.decode().strip(), scr_path)
+    LOGGER.error("%s. Unable to zip this path: %s", stderr, scr_path)
     return True
 
 
@@ -0,0 +1,113 @@
+from collections import defaultdict
+from time import time
+
+from bot import (
+    task_dict,
+    queued_dl,
+    queued_up,
+    non_queued_dl,
+    non_queued_up,
+)
+from bot.helper.ext_utils.engine_snapshot import engine_snapshot
+from bot.helper.ext_utils.status_utils import MirrorStatus
+
+STAGE_BUCKETS = (1, 5, 15, 60, 300, 900, 1800, 3600, 10800, 21600, 43200)
+
+
+class Metrics:
+    """In-process counters and histograms rendered in OpenMetrics text format"""
+
+    def __init__(self):
+        self.flood_waits = defaultdict(int)
+        self.bytes_downloaded = 0
+        self.bytes_uploaded = 0
+        self._stage_buckets = defaultdict(lambda: [0] * len(STAGE_BUCKETS))
+        self._stage_sum = defaultdict(float)
+        self._stage_count = defaultdict(int)
+
+    def flood_wait(self, func_name):
+        self.flood_waits[func_name] += 1
+
+    def downloaded(self, size):
+        self.bytes_downloaded += int(size or 0)
+
+    def uploaded(self, size):
+        self.bytes_uploaded += int(size or 0)
+
+    def observe_stage(self, stage, started):
+        if not started:
+            return
+        duration = time() - started
+        buckets = self._stage_buckets[stage]
+        for index, bound in enumerate(STAGE_BUCKETS):
+            if duration <= bound:
+                buckets[index] += 1
+        self._stage_sum[stage] += duration
+        self._stage_count[stage] += 1
+
+    @staticmethod
+    def _engine_speeds():
+        tasks = list(task_dict.values())
+        engine_snapshot.refresh(tasks)
+        dl_speeds, up_speeds = defaultdict(float), defaultdict(float)
+        for task in tasks:
+            try:
+                tstatus = task.status()
+                if tstatus == MirrorStatus.STATUS_SEEDING:
+                    up_speeds[task.engine()] += task.upload_speed_raw()
+                elif tstatus == MirrorStatus.STATUS_UPLOADING:
+                    up_speeds[task.engine()] += task.speed_raw()
+                else:
+                    dl_speeds[task.engine()] += task.speed_raw()
+            except Exception:
+                continue
+        return dl_speeds, up_speeds
+
+    def render(self):
+        lines = [
+            "# TYPE mltb_tasks gauge",
+            f"mltb_tasks {len(task_dict)}",
+            "# TYPE mltb_queue_size gauge",
+            f'mltb_queue_size{{queue="queued_dl"}} {len(queued_dl)}',
+            f'mltb_queue_size{{queue="queued_up"}} {len(queued_up)}',
+            f'mltb_queue_size{{queue="non_queued_dl"}} {len(non_queued_dl)}',
+            f'mltb_queue_size{{queue="non_queued_up"}} {len(non_queued_up)}',
+        ]
+        dl_speeds, up_speeds = self._engine_speeds()
+        lines.append("# TYPE mltb_engine_speed_bytes gauge")
+        for direction, speeds in (("down", dl_speeds), ("up", up_speeds)):
+            lines.extend(
+                f'mltb_engine_speed_bytes{{engine="{engine}",direction="{direction}"}} {speed}'
+                for engine, speed in speeds.items()
+            )
+        lines.extend(
+            (
+                "# TYPE mltb_downloaded_bytes counter",
+                f"mltb_downloaded_bytes_total {self.bytes_downloaded}",
+                "# TYPE mltb_uploaded_bytes counter",
+                f"mltb_uploaded_bytes_total {self.bytes_uploaded}",
+                "# TYPE mltb_flood_waits counter",
+            )
+        )
+        lines.extend(
+            f'mltb_flood_waits_total{{func="{func_name}"}} {count}'
+            for func_name, count in self.flood_waits.items()
+        )
+        lines.append("# TYPE mltb_stage_duration_seconds histogram")
+        for stage, buckets in self._stage_buckets.items():
+            lines.extend(
+                f'mltb_stage_duration_seconds_bucket{{stage="{stage}",le="{bound}"}} {count}'
+                for bound, count in zip(STAGE_BUCKETS, buckets)
+            )
+            lines.extend(
+                (
+                    f'mltb_stage_duration_seconds_bucket{{stage="{stage}",le="+Inf"}} {self._stage_count[stage]}',
+                    f'mltb_stage_duration_seconds_sum{{stage="{stage}"}} {self._stage_sum[stage]}',
+                    f'mltb_stage_duration_seconds_count{{stage="{stage}"}} {self._stage_count[stage]}',
+                )
+            )
+        lines.append("# EOF")
+        return "\n".join(lines) + "\n"
+
+
+metrics = Metrics()
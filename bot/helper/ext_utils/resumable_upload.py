@@ -0,0 +1,167 @@
+from asyncio import gather
+from contextvars import ContextVar
+from functools import wraps
+from os import O_RDONLY, close, open as osopen, path as ospath, pread
+from pyrogram.raw.functions.upload import SaveBigFilePart
+from pyrogram.raw.types import InputFileBig
+from pyrogram.session import Session
+from random import randint
+from re import search as re_search
+from weakref import WeakSet
+
+from bot import bot_loop
+from bot.helper.ext_utils.bot_utils import sync_to_async
+
+PART_SIZE = 512 * 1024
+BIG_FILE_SIZE = 10 * 1024 * 1024
+PART_WORKERS = 4
+SAVE_EVERY = 64
+
+_current = ContextVar("resumable_upload", default=None)
+_attached = WeakSet()
+
+
+class ResumableUpload:
+    """SaveBigFilePart state of one leech file, kept across retries and restarts.
+
+    Telegram holds on to the parts of a big file by its file_id for a while, so
+    a failed send only has to push the parts after the last acknowledged one.
+    Parts are uploaded by the client that has to send the file, so the state is
+    dropped whenever the file goes through another client.
+    """
+
+    def __init__(self, client=None, file_id=0, part=0, size=0, on_save=None):
+        self.client = client
+        self.file_id = file_id
+        # every part below this one is acknowledged
+        self.part = part
+        self.size = size
+        self.path = None
+        self.on_save = on_save
+
+    @property
+    def total(self):
+        return -(-self.size // PART_SIZE)
+
+    def dump(self):
+        return {
+            "client": self.client,
+            "file_id": self.file_id,
+            "part": self.part,
+            "size": self.size,
+        }
+
+    def bind(self, client, path, size):
+        """Have the next save_file of ``path`` on ``client`` resume this upload,
+        ``path`` may also be a FileWindow of a virtual split part"""
+        if size <= BIG_FILE_SIZE:
+            return
+        if not self.file_id or (self.client, self.size) != (client.name, size):
+            self.client, self.size = client.name, size
+            self.file_id = randint(1, 2**62)
+            self.part = 0
+        self.path = path
+        _attach(client)
+        _current.set(self)
+
+    def unbind(self):
+        self.path = None
+        _current.set(None)
+
+    def missing(self, err):
+        if match := re_search(r"FILE_PART_(\d+)_MISSING", str(err)):
+            self.part = min(self.part, int(match.group(1)))
+
+    async def _save(self, client, progress, progress_args):
+        # same transport as pyrogram's save_file: one of the client's
+        # max_concurrent_transmissions slots and a media session of its own,
+        # so parts don't queue behind updates and other RPCs
+        async with client.save_file_semaphore:
+            session = Session(
+                client,
+                await client.storage.dc_id(),
+                await client.storage.auth_key(),
+                await client.storage.test_mode(),
+                is_media=True,
+            )
+            await session.start()
+            try:
+                return await self._save_parts(session, progress, progress_args)
+            finally:
+                await session.stop()
+
+    async def _save_parts(self, session, progress, progress_args):
+        total, acked = self.total, set()
+        next_part, saved = self.part, self.part
+        offset = getattr(self.path, "offset", 0)
+        name = ospath.basename(getattr(self.path, "name", self.path))
+        fd = await sync_to_async(
+            osopen, getattr(self.path, "path", self.path), O_RDONLY
+        )
+
+        async def _worker():
+            nonlocal next_part, saved
+            while next_part < total:
+                index, next_part = next_part, next_part + 1
+                chunk = await sync_to_async(
+                    pread,
+                    fd,
+                    min(PART_SIZE, self.size - index * PART_SIZE),
+                    offset + index * PART_SIZE,
+                )
+                await session.invoke(
+                    SaveBigFilePart(
+                        file_id=self.file_id,
+                        file_part=index,
+                        file_total_parts=total,
+                        bytes=chunk,
+                    )
+                )
+                acked.add(index)
+                while self.part in acked:
+                    acked.discard(self.part)
+                    self.part += 1
+                if progress:
+                    await progress(
+                        min(self.part * PART_SIZE, self.size), self.size, *progress_args
+                    )
+                if self.on_save and self.part - saved >= SAVE_EVERY:
+                    saved = self.part
+                    await self.on_save(self)
+
+        workers = [bot_loop.create_task(_worker()) for _ in range(PART_WORKERS)]
+        try:
+            await gather(*workers)
+        except BaseException:
+            for worker in workers:
+                worker.cancel()
+            await gather(*workers, return_exceptions=True)
+            raise
+        finally:
+            if self.on_save:
+                await self.on_save(self)
+            close(fd)
+        return InputFileBig(id=self.file_id, parts=total, name=name)
+
+
+def _attach(client):
+    if client in _attached:
+        return
+    save_file = client.save_file
+
+    @wraps(save_file)
+    async def _save_file(path, *args, **kwargs):
+        upload = _current.get()
+        if (
+            upload is None
+            or args
+            or kwargs.get("file_id") is not None
+            or path != upload.path
+        ):
+            return await save_file(path, *args, **kwargs)
+        return await upload._save(
+            client, kwargs.get("progress"), kwargs.get("progress_args", ())
+        )
+
+    client.save_file = _save_file
+    _attached.add(client)
@@ -0,0 +1,51 @@
+from asyncio import Condition
+
+from bot import config_dict
+
+
+class StagePool:
+    """Concurrency slots for one post-download stage, sized from config_dict"""
+
+    def __init__(self, name, key):
+        self.name = name
+        self.key = key
+        self.active = 0
+        self.waiting = 0
+        self._cond = Condition()
+
+    @property
+    def size(self):
+        return max(config_dict[self.key] or 1, 1)
+
+    async def __aenter__(self):
+        async with self._cond:
+            self.waiting += 1
+            try:
+                await self._cond.wait_for(lambda: self.active < self.size)
+            finally:
+                self.waiting -= 1
+            self.active += 1
+        return self
+
+    async def __aexit__(self, *_):
+        async with self._cond:
+            self.active -= 1
+            self._cond.notify()
+
+    async def wake(self):
+        async with self._cond:
+            self._cond.notify_all()
+
+
+stage_pools = {
+    "extract": StagePool("Extract", "EXTRACT_WORKERS"),
+    "compress": StagePool("Compress", "COMPRESS_WORKERS"),
+    "ffmpeg": StagePool("FFmpeg", "FFMPEG_WORKERS"),
+    "split": StagePool("Split", "SPLIT_WORKERS"),
+}
+STAGE_POOL_KEYS = [pool.key for pool in stage_pools.values()]
+
+
+async def wake_stage_pools():
+    for pool in stage_pools.values():
+        await pool.wake()
@@ -1,15 +1,21 @@
+from array import array
 from html import escape
-from psutil import virtual_memory, cpu_percent, disk_usage, net_io_counters
+from math import exp
 from pyrogram.types import Message
 from time import time
 from pytz import timezone
 
 from bot import bot_name, task_dict, task_dict_lock, botStartTime, config_dict
+from bot.helper.ext_utils.bot_utils import sync_to_async
+from bot.helper.ext_utils.engine_snapshot import engine_snapshot
+from bot.helper.ext_utils.stage_pools import stage_pools
+from bot.helper.ext_utils.sys_stats import sys_stats
 from bot.helper.telegram_helper.bot_commands import BotCommands
 from bot.helper.telegram_helper.button_build import ButtonMaker
 
 
 SIZE_UNITS = ["B", "KB", "MB", "GB", "TB", "PB"]
+SPARK_CHARS = "▁▂▃▄▅▆▇█"
 
 
 class MirrorStatus:
@@ -56,14 +62,16 @@ STATUS_VALUES = [
 
 async def getTaskByGid(gid: str):
     async with task_dict_lock:
-        return next((tk for tk in task_dict.values() if tk.gid() == gid), None)
+        await sync_to_async(engine_snapshot.refresh, list(task_dict.values()))
+        return task_dict.get_by_gid(gid)
 
 
 async def getAllTasks(req_status: str):
     async with task_dict_lock:
         if req_status == "all":
             return list(task_dict.values())
-        return [tk for tk in task_dict.values() if tk.status() == req_status]
+        await sync_to_async(engine_snapshot.refresh, list(task_dict.values()))
+        return task_dict.by_status(req_status)
 
 
 def get_readable_file_size(size_in_bytes: int | str):
@@ -82,6 +90,135 @@ def get_readable_file_size(size_in_bytes: int | str):
     )
 
 
+class SpeedHistory:
+    """Fixed-size ring buffer of speed samples with a time-weighted EWMA"""
+
+    __slots__ = ("_samples", "_index", "_count", "_bytes", "_taken", "ewma")
+
+    def __init__(self, size=120):
+        self._samples = array("d", bytes(8 * size))
+        self._index = 0
+        self._count = 0
+        self._bytes = 0
+        self._taken = 0
+        self.ewma = 0.0
+
+    @property
+    def ready(self):
+        return self._count > 0
+
+    def add(self, processed, tau=10, min_gap=1):
+        now = time()
+        if self._taken:
+            elapsed = now - self._taken
+            if elapsed < min_gap:
+                return
+            speed = max(processed - self._bytes, 0) / elapsed
+            self._samples[self._index] = speed
+            self._index = (self._index + 1) % len(self._samples)
+            if self._count:
+                self.ewma += (1 - exp(-elapsed / tau)) * (speed - self.ewma)
+            else:
+                self.ewma = speed
+            self._count = min(self._count + 1, len(self._samples))
+        self._bytes = processed
+        self._taken = now
+
+    def samples(self):
+        size = len(self._samples)
+        start = (self._index - self._count) % size
+        return [self._samples[(start + i) % size] for i in range(self._count)]
+
+    def sparkline(self, width=12):
+        if not (samples := self.samples()):
+            return ""
+        step = max(len(samples) // width, 1)
+        points = [
+            sum(chunk) / len(chunk)
+            for i in range(0, len(samples), step)
+            if (chunk := samples[i : i + step])
+        ][-width:]
+        peak = max(points) or 1
+        return "".join(
+            SPARK_CHARS[int(point / peak * (len(SPARK_CHARS) - 1))] for point in points
+        )
+
+
+class BaseStatus:
+    """Raw numeric metrics shared by all status classes, formatted only on render"""
+
+    # set when gid()/status() can change without the object being swapped
+    dynamic_gid = False
+    dynamic_status = False
+    # byte-transfer statuses keep a SpeedHistory filled on every status tick
+    track_speed = False
+    _history = None
+
+    def sample_speed(self):
+        if not self.track_speed:
+            return
+        if self._history is None:
+            self._history = SpeedHistory()
+        try:
+            self._history.add(self.processed_raw())
+        except:
+            pass
+
+    def smooth_speed_raw(self):
+        if self._history and self._history.ready:
+            return self._history.ewma
+        return self.speed_raw()
+
+    def sparkline(self):
+        return self._history.sparkline() if self._history else ""
+
+    def processed_raw(self):
+        return 0
+
+    def size_raw(self):
+        return 0
+
+    def speed_raw(self):
+        return 0
+
+    def upload_speed_raw(self):
+        return 0
+
+    def eta_raw(self):
+        try:
+            return (self.size_raw() - self.processed_raw()) / self.speed_raw()
+        except:
+            return 0
+
+    def progress_raw(self):
+        try:
+            return self.processed_raw() / self.size_raw() * 100
+        except:
+            return 0
+
+    def processed_bytes(self):
+        return get_readable_file_size(self.processed_raw())
+
+    def size(self):
+        return get_readable_file_size(self.size_raw())
+
+    def speed(self):
+        return f"{get_readable_file_size(self.smooth_speed_raw())}/s"
+
+    def eta(self):
+        if self._history and self._history.ready:
+            try:
+                eta = (self.size_raw() - self.processed_raw()) / self._history.ewma
+            except:
+                eta = 0
+        else:
+            eta = self.eta_raw()
+        return get_readable_time(eta) if eta > 0 else "~"
+
+    def progress(self):
+        return f"{round(self.progress_raw(), 2)}%"
+
+
 def get_date_time(message: Message):
     dt = message.date.astimezone(timezone(config_dict["TIME_ZONE"]))
     return dt.strftime("%B %d, %Y"), dt.strftime("%H:%M:%S")
@@ -135,26 +272,17 @@ def action(message: Message):
     )
 
 
-def get_readable_message(
-    sid: int, is_user: bool, page_no: int = 1, status: str = "All", page_step: int = 1
-):
+def _render_status_page(uid: int, page_no: int, status: str, page_step: int):
     msg = f'<a href="https://t.me/PBX1_BOTS"><b><i>𝗕𝗼𝘁 𝗕𝘆 𝗣𝗕𝗫𝟭 𝗕𝗢𝗧𝗦</b></i></a>\n\n'
     dl_speed = up_speed = 0
+    engine_snapshot.refresh(list(task_dict.values()))
+    for task in task_dict.values():
+        task.sample_speed()
 
     if status == "All":
-        tasks = (
-            [tk for tk in task_dict.values() if tk.listener.user_id == sid]
-            if is_user
-            else list(task_dict.values())
-        )
-    elif is_user:
-        tasks = [
-            tk
-            for tk in task_dict.values()
-            if tk.status() == status and tk.listener.user_id == sid
-        ]
+        tasks = task_dict.by_user(uid) if uid else list(task_dict.values())
     else:
-        tasks = [tk for tk in task_dict.values() if tk.status() == status]
+        tasks = task_dict.by_status(status, uid or None)
 
     STATUS_LIMIT = config_dict["STATUS_LIMIT"]
     tasks_no = len(tasks)
@@ -200,11 +328,19 @@ def get_readable_message(
                 f"\n<b>├ Processed:</b> {task.processed_bytes()}"
                 f"\n<b>├ Total Size:</b> {task.size()}"
                 f"\n<b>├ Speed:</b> {task.speed()}"
+            )
+            if config_dict["STATUS_SPARKLINE"] and (spark := task.sparkline()):
+                msg += f"\n<b>├ Trend:</b> {spark}"
+            msg += (
                 f"\n<b>├ ETA:</b> {task.eta() or '~'}"
                 f"\n<b>├ Elapsed: </b>{task.elapsed() or '~'}"
             )
             if tstatus == MirrorStatus.STATUS_WAIT:
                 msg += f"\n<b>├ Timeout: </b>{task.timeout()}"
+            if hasattr(task, "parts") and (parts := task.parts()):
+                msg += f"\n<b>├ Parts:</b> {parts}"
+            if hasattr(task, "saved_bytes") and (saved := task.saved_bytes()):
+                msg += f"\n<b>├ Seed Saved:</b> {saved}"
             if hasattr(task, "seeders_num"):
                 try:
                     msg += f"\n<b>├ S/L:</b> {task.seeders_num()}/{task.leechers_num()}"
@@ -228,24 +364,63 @@ def get_readable_message(
 
     if not msg:
         if status == "All":
-            return None, None
+            return None, tasks_no, page_no, pages
         msg = f"No Active {status} Task!\n"
 
     for task in tasks:
         tstatus = task.status()
         if tstatus == MirrorStatus.STATUS_DOWNLOADING or task.engine() == "JDownloader":
-            dl_speed += speed_string_to_bytes(task.speed())
+            dl_speed += task.smooth_speed_raw()
         elif tstatus == MirrorStatus.STATUS_UPLOADING:
-            up_speed += speed_string_to_bytes(task.speed())
+            up_speed += task.smooth_speed_raw()
         elif tstatus == MirrorStatus.STATUS_SEEDING:
-            up_speed += speed_string_to_bytes(task.upload_speed())
+            up_speed += task.upload_speed_raw()
+
+    if tasks_no > STATUS_LIMIT:
+        msg += f"<b>Page:</b> {page_no}/{pages} | <b>Tasks:</b> {tasks_no} | <b>Step:</b> {page_step}\n"
+    if busy := [pool for pool in stage_pools.values() if pool.active or pool.waiting]:
+        msg += (
+            " | ".join(
+                f"<b>{pool.name}:</b> {pool.active}/{pool.size}"
+                + (f" +{pool.waiting}" if pool.waiting else "")
+                for pool in busy
+            )
+            + "\n"
+        )
+    msg += (
+        "▬▬▬▬▬▬▬▬▬▬▬▬▬▬▬▬▬▬▬\n"
+        f"<b>CPU:</b> {sys_stats.cpu}% <b>| RAM:</b> {sys_stats.memory.percent}% <b>| FREE:</b> {get_readable_file_size(sys_stats.download_free)}\n"
+        f"<b>IN:</b> {get_readable_file_size(sys_stats.net.bytes_recv)}<b> | OUT:</b> {get_readable_file_size(sys_stats.net.bytes_sent)}\n"
+        f"<b>DL:</b> {get_readable_file_size(dl_speed)}/s<b> | UL:</b> {get_readable_file_size(up_speed)}/s <b>|</b> {get_readable_time(time() - botStartTime)}"
+    )
+    return msg, tasks_no, page_no, pages
+
 
+def get_readable_message(
+    sid: int,
+    is_user: bool,
+    page_no: int = 1,
+    status: str = "All",
+    page_step: int = 1,
+    pages: dict = None,
+):
+    """Pass the same pages dict to render each distinct view only once"""
+    key = (sid if is_user else 0, page_no, status, page_step)
+    if pages is None or key not in pages:
+        page = _render_status_page(key[0], page_no, status, page_step)
+        if pages is not None:
+            pages[key] = page
+    else:
+        page = pages[key]
+    msg, tasks_no, page_no, pages_no = page
+    if msg is None:
+        return None, None
+
+    STATUS_LIMIT = config_dict["STATUS_LIMIT"]
     buttons = ButtonMaker()
     if not is_user:
         buttons.button_data("☲", "status 0 ov", "header")
-
-    if len(tasks) > STATUS_LIMIT:
-        msg += f"<b>Page:</b> {page_no}/{pages} | <b>Tasks:</b> {tasks_no} | <b>Step:</b> {page_step}\n"
+    if tasks_no > STATUS_LIMIT:
         buttons.button_data("Back", f"status {sid} pre", "header")
         buttons.button_data("Next", f"status {sid} nex", "header")
         if tasks_no > 30:
@@ -258,10 +433,4 @@ def get_readable_message(
     buttons.button_data("♻️", f"status {sid} ref", "header")
     if is_user:
         buttons.button_data("✘", f"status {sid} cls", "header")
-    msg += (
-        "▬▬▬▬▬▬▬▬▬▬▬▬▬▬▬▬▬▬▬\n"
-        f"<b>CPU:</b> {cpu_percent()}% <b>| RAM:</b> {virtual_memory().percent}% <b>| FREE:</b> {get_readable_file_size(disk_usage(config_dict['DOWNLOAD_DIR']).free)}\n"
-        f"<b>IN:</b> {get_readable_file_size(net_io_counters().bytes_recv)}<b> | OUT:</b> {get_readable_file_size(net_io_counters().bytes_sent)}\n"
-        f"<b>DL:</b> {get_readable_file_size(dl_speed)}/s<b> | UL:</b> {get_readable_file_size(up_speed)}/s <b>|</b> {get_readable_time(time() - botStartTime)}"
-    )
     return msg, buttons.build_menu(6)
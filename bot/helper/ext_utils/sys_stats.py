@@ -0,0 +1,73 @@
+from psutil import (
+    cpu_percent,
+    cpu_times_percent,
+    disk_usage,
+    net_io_counters,
+    swap_memory,
+    virtual_memory,
+)
+from time import time
+
+from bot import config_dict, LOGGER
+from bot.helper.ext_utils.bot_utils import setInterval, sync_to_async
+
+SAMPLE_INTERVAL = 2
+
+
+class SystemStats:
+    """Cached psutil readings, refreshed off the event loop by one sampler task"""
+
+    def __init__(self):
+        self.cpu = 0.0
+        self.iowait = 0.0
+        self.memory = None
+        self.swap = None
+        self.disk = None
+        self.download_free = 0
+        self.net = None
+        self.sent_rate = 0
+        self.recv_rate = 0
+        self._taken = 0
+        self._interval = None
+        self.sample()
+
+    def _read(self, name, func, *args):
+        """One failing reading keeps its last value instead of skipping the rest"""
+        try:
+            return func(*args)
+        except Exception as e:
+            LOGGER.error("%s: while sampling %s", e, name)
+            return getattr(self, name)
+
+    def sample(self):
+        now = time()
+        net = self._read("net", net_io_counters)
+        if net is not self.net:
+            if self.net and now > self._taken:
+                elapsed = now - self._taken
+                self.sent_rate = max(net.bytes_sent - self.net.bytes_sent, 0) / elapsed
+                self.recv_rate = max(net.bytes_recv - self.net.bytes_recv, 0) / elapsed
+            self.net = net
+            self._taken = now
+        self.cpu = self._read("cpu", cpu_percent)
+        self.iowait = self._read(
+            "iowait", lambda: getattr(cpu_times_percent(), "iowait", 0.0)
+        )
+        self.memory = self._read("memory", virtual_memory)
+        self.swap = self._read("swap", swap_memory)
+        self.disk = self._read("disk", disk_usage, "/")
+        self.download_free = self._read(
+            "download_free", lambda: disk_usage(config_dict["DOWNLOAD_DIR"]).free
+        )
+
+    async def _sample(self):
+        await sync_to_async(self.sample)
+
+    def start(self, interval=SAMPLE_INTERVAL):
+        if self._interval:
+            self._interval.cancel()
+        self.sample()
+        self._interval = setInterval(interval, self._sample)
+
+
+sys_stats = SystemStats()
@@ -0,0 +1,238 @@
+from asyncio import sleep
+from json import dumps, loads
+from os import path as ospath, walk
+from sqlite3 import connect, Error as SqliteError
+from threading import RLock
+
+from bot import DATABASE_URL, LOGGER, bot_loop, config_dict
+from bot.helper.ext_utils.bot_utils import sync_to_async
+from bot.helper.ext_utils.db_handler import DbManager
+
+JOURNAL_FILE = "journal.db"
+STAGES = ("download", "process", "split")
+# per-file progress, kept as one row per path instead of inside the entry
+PROGRESS_KEYS = ("uploaded", "gd_dirs", "parts")
+MIRROR_DELAY = 5
+
+
+class TaskJournal:
+    """Stage checkpoints of running tasks in a local SQLite file, mirrored to
+    Mongo while the incomplete task notifier is on.
+
+    Entries are keyed by the task message link, the same key the incomplete
+    task notifier uses, so a resumed task can look its checkpoint back up and
+    continue from the last completed stage. Paths are absolute and rebased on
+    to the new task dir when a task resumes.
+
+    Every mutation is one read-modify-write under the journal lock. Mongo gets
+    the whole entry from one writer per link, a few seconds after the last
+    change, so bursts of per-file updates collapse into one ordered write.
+    """
+
+    def __init__(self, path=JOURNAL_FILE):
+        self._lock = RLock()
+        self._conn = None
+        # link -> whether it changed again since its mirror writer last read it
+        self._mirrors = {}
+        try:
+            self._conn = connect(path, check_same_thread=False, isolation_level=None)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS journal (link TEXT PRIMARY KEY, entry TEXT NOT NULL)"
+            )
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS progress (link TEXT NOT NULL, key TEXT NOT NULL, "
+                "path TEXT NOT NULL, value TEXT, PRIMARY KEY (link, key, path))"
+            )
+        except SqliteError as e:
+            LOGGER.error("%s: while opening task journal", e)
+            self._conn = None
+
+    def _execute(self, query, params=()):
+        if not self._conn:
+            return []
+        try:
+            with self._lock:
+                return self._conn.execute(query, params).fetchall()
+        except SqliteError as e:
+            LOGGER.error("%s: while writing task journal", e)
+            return []
+
+    @staticmethod
+    def _merge(entry, rows):
+        entry = loads(entry)
+        for key in PROGRESS_KEYS:
+            entry.setdefault(key, {})
+        for key, path, value in rows:
+            entry[key][path] = loads(value)
+        return entry
+
+    def get(self, link):
+        with self._lock:
+            if rows := self._execute(
+                "SELECT entry FROM journal WHERE link = ?", (link,)
+            ):
+                return self._merge(
+                    rows[0][0],
+                    self._execute(
+                        "SELECT key, path, value FROM progress WHERE link = ?", (link,)
+                    ),
+                )
+        return None
+
+    def entries(self):
+        with self._lock:
+            progress = {}
+            for link, key, path, value in self._execute(
+                "SELECT link, key, path, value FROM progress"
+            ):
+                progress.setdefault(link, []).append((key, path, value))
+            return {
+                link: self._merge(entry, progress.get(link, []))
+                for link, entry in self._execute("SELECT link, entry FROM journal")
+            }
+
+    def _mirror(self, link, upsert=True):
+        if not DATABASE_URL or (upsert and not config_dict["INCOMPLETE_TASK_NOTIFIER"]):
+            return
+        if link in self._mirrors:
+            self._mirrors[link] = True
+            return
+        self._mirrors[link] = True
+        bot_loop.create_task(self._flush(link))
+
+    async def _flush(self, link):
+        try:
+            while self._mirrors[link]:
+                await sleep(MIRROR_DELAY)
+                self._mirrors[link] = False
+                entry = await sync_to_async(self.get, link)
+                if entry is None:
+                    await DbManager().rm_task_journal(link)
+                else:
+                    await DbManager().update_task_journal(link, entry)
+        finally:
+            del self._mirrors[link]
+
+    def _save(self, link, entry, mirror=True):
+        entry = dict(entry)
+        progress = [
+            (link, key, path, dumps(value))
+            for key in PROGRESS_KEYS
+            for path, value in (entry.pop(key, None) or {}).items()
+        ]
+        if not self._conn:
+            return
+        with self._lock:
+            try:
+                self._conn.execute("BEGIN")
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO journal (link, entry) VALUES (?, ?)",
+                    (link, dumps(entry)),
+                )
+                self._conn.execute("DELETE FROM progress WHERE link = ?", (link,))
+                self._conn.executemany(
+                    "INSERT INTO progress (link, key, path, value) VALUES (?, ?, ?, ?)",
+                    progress,
+                )
+                self._conn.execute("COMMIT")
+            except SqliteError as e:
+                LOGGER.error("%s: while writing task journal", e)
+                if self._conn.in_transaction:
+                    self._conn.execute("ROLLBACK")
+                return
+        if mirror:
+            bot_loop.call_soon_threadsafe(self._mirror, link)
+
+    def remove(self, link):
+        with self._lock:
+            entry = self.get(link)
+            self._execute("DELETE FROM journal WHERE link = ?", (link,))
+            self._execute("DELETE FROM progress WHERE link = ?", (link,))
+        bot_loop.call_soon_threadsafe(self._mirror, link, False)
+        return entry
+
+    def checkpoint(self, link, stage, path, **fields):
+        """Record that a task finished ``stage`` with its output at ``path``"""
+        root = ospath.dirname(path)
+        inventory = (
+            {
+                ospath.join(dirpath, file_): ospath.getsize(ospath.join(dirpath, file_))
+                for dirpath, _, files in walk(root)
+                for file_ in files
+            }
+            if ospath.isdir(root)
+            else {}
+        )
+        with self._lock:
+            entry = self.get(link) or {}
+            entry.update(fields, stage=stage, path=path, inventory=inventory)
+            self._save(link, entry)
+
+    def uploaded(self, link, path, value=None, key="uploaded"):
+        """Mark one file (or drive folder) of a checkpointed task as uploaded"""
+        with self._lock:
+            if not self._execute("SELECT 1 FROM journal WHERE link = ?", (link,)):
+                return
+            self._execute(
+                "INSERT OR REPLACE INTO progress (link, key, path, value) VALUES (?, ?, ?, ?)",
+                (link, key, path, dumps(value)),
+            )
+        bot_loop.call_soon_threadsafe(self._mirror, link)
+
+    @staticmethod
+    def valid(entry):
+        """Every journaled file that isn't uploaded yet is still on disk unchanged"""
+        if entry.get("stage") not in STAGES:
+            return False
+        uploaded = entry.get("uploaded", {})
+        for path, size in entry.get("inventory", {}).items():
+            if path in uploaded:
+                continue
+            if not ospath.isfile(path) or ospath.getsize(path) != size:
+                return False
+        return bool(entry.get("inventory"))
+
+    def rebase(self, link, new_link, new_dir):
+        """Move the checkpoint of ``link`` to a resumed task at ``new_dir``"""
+        with self._lock:
+            if (entry := self.get(link)) is None:
+                return None
+            old_dir = entry["dir"]
+
+            def _rebase(path):
+                return (
+                    f"{new_dir}{path[len(old_dir) :]}"
+                    if path.startswith(old_dir)
+                    else path
+                )
+
+            entry["dir"] = new_dir
+            entry["path"] = _rebase(entry["path"])
+            if entry.get("stream_archive"):
+                entry["stream_archive"] = _rebase(entry["stream_archive"])
+            for key in ("inventory", *PROGRESS_KEYS, "virtual_splits"):
+                entry[key] = {_rebase(k): v for k, v in entry.get(key, {}).items()}
+            self.remove(link)
+            self._save(new_link, entry)
+            return entry
+
+    def keep_dirs(self):
+        """Task dirs clean_all has to leave in place so checkpoints stay resumable"""
+        dirs = set()
+        for entry in self.entries().values():
+            if dir_ := entry.get("dir"):
+                dirs.update((dir_, f"{dir_}10000"))
+        return dirs
+
+    async def restore(self):
+        """Fill the local journal with entries only Mongo still has"""
+        if not DATABASE_URL:
+            return
+        local = self.entries()
+        for link, entry in (await DbManager().get_task_journal()).items():
+            if link not in local:
+                self._save(link, entry, False)
+
+
+task_journal = TaskJournal()
@@ -1,9 +1,12 @@
 from aiofiles.os import path as aiopath
-from asyncio import Event, sleep
+from aioshutil import disk_usage
+from asyncio import Event, Lock
+from collections import deque
 from os import path as ospath
 
 from bot import (
     config_dict,
+    task_dict,
     queued_dl,
     queued_up,
     non_queued_up,
@@ -18,8 +21,142 @@ from bot.helper.ext_utils.bot_utils import (
 )
 from bot.helper.ext_utils.files_utils import get_base_name, check_storage_threshold
 from bot.helper.ext_utils.links_utils import is_gdrive_id, is_mega_link
+from bot.helper.ext_utils.status_utils import MirrorStatus
+from bot.helper.ext_utils.sys_stats import sys_stats
 from bot.helper.mirror_utils.gdrive_utlis.search import gdSearch
 
+PREMIUM_WEIGHT = 2
+ADMISSION_WINDOW = 15
+ADMISSION_HOLD = 4
+IOWAIT_LIMIT = 25
+
+
+class AdmissionControl:
+    """AIMD concurrency window: probe one more task while throughput keeps
+    growing, step back after a probe that didn't help and halve on disk stall"""
+
+    def __init__(self, rate):
+        self._rate = rate
+        self._samples = deque(maxlen=ADMISSION_WINDOW)
+        self._last = 0
+        self._probing = False
+        self._hold = 0
+        self.limit = None
+
+    def cap(self, static_limit):
+        """Only ever tightens a configured limit, never creates one"""
+        if not static_limit or self.limit is None:
+            return static_limit
+        return min(self.limit, static_limit)
+
+    def sample(self, running, queued, static_limit):
+        """Returns True when the window grew and queued tasks can be admitted"""
+        if not static_limit:
+            self.limit = None
+            self._samples.clear()
+            return False
+        if self.limit is None:
+            self.limit = min(max(running, 1), static_limit)
+        self._samples.append(self._rate())
+        if len(self._samples) < ADMISSION_WINDOW:
+            return False
+        throughput = sum(self._samples) / len(self._samples)
+        self._samples.clear()
+        grew = False
+        if sys_stats.iowait > IOWAIT_LIMIT:
+            self.limit = max(self.limit // 2, 1)
+            self._probing = False
+            self._hold = ADMISSION_HOLD
+        elif self._probing:
+            self._probing = False
+            if throughput < self._last * 1.05:
+                self.limit = max(self.limit - 1, 1)
+                self._hold = ADMISSION_HOLD
+        elif self._hold:
+            self._hold -= 1
+        elif queued and running >= self.limit:
+            if not static_limit or self.limit < static_limit:
+                self.limit += 1
+                self._probing = grew = True
+        self._last = throughput
+        return grew
+
+
+class StorageLedger:
+    """Disk space charged to admitted tasks, so concurrent storage checks see
+    each other instead of all passing against the same free space"""
+
+    def __init__(self):
+        self._reserved = {}
+        self._lock = Lock()
+
+    def _outstanding(self, exclude):
+        total = 0
+        for mid, (footprint, size) in self._reserved.items():
+            if mid == exclude:
+                continue
+            written = size
+            if task := task_dict.get(mid):
+                try:
+                    tstatus = task.status()
+                    if tstatus == MirrorStatus.STATUS_QUEUEDL:
+                        written = 0
+                    elif tstatus == MirrorStatus.STATUS_DOWNLOADING:
+                        written = min(task.processed_raw(), size)
+                except:
+                    pass
+            total += max(footprint - written, 0)
+        return total
+
+    async def reserve(self, mid, size, arch, strict=True):
+        """Charge size (twice for archive work, as STORAGE_THRESHOLD implies)
+        to mid. Returns False if it doesn't fit the free space left by the
+        other reservations, or by itself when strict is False."""
+        footprint = size * 2 if arch else size
+        threshold = config_dict["STORAGE_THRESHOLD"] * 1024**3
+        async with self._lock:
+            free = (await disk_usage(config_dict["DOWNLOAD_DIR"])).free - threshold
+            if strict:
+                free -= self._outstanding(mid)
+            if footprint > free:
+                return False
+            self._reserved[mid] = (footprint, size)
+            return True
+
+    async def release(self, mid):
+        self._reserved.pop(mid, None)
+
+
+storage_ledger = StorageLedger()
+dl_admission = AdmissionControl(lambda: sys_stats.recv_rate)
+up_admission = AdmissionControl(lambda: sys_stats.sent_rate)
+
+
+def queue_limits():
+    all_limit, dl_limit, up_limit = (
+        config_dict["QUEUE_ALL"],
+        config_dict["QUEUE_DOWNLOAD"],
+        config_dict["QUEUE_UPLOAD"],
+    )
+    if config_dict["QUEUE_ADAPTIVE"]:
+        dl_limit = dl_admission.cap(dl_limit)
+        up_limit = up_admission.cap(up_limit)
+    return all_limit, dl_limit, up_limit
+
+
+async def adjust_admission():
+    if not config_dict["QUEUE_ADAPTIVE"]:
+        return
+    async with queue_dict_lock:
+        dl_grew = dl_admission.sample(
+            len(non_queued_dl), len(queued_dl), config_dict["QUEUE_DOWNLOAD"]
+        )
+        up_grew = up_admission.sample(
+            len(non_queued_up), len(queued_up), config_dict["QUEUE_UPLOAD"]
+        )
+    if dl_grew or up_grew:
+        await start_from_queued()
+
 
 async def stop_duplicate_check(listener):
     if (
@@ -57,7 +194,9 @@ async def stop_duplicate_check(listener):
     return None, ""
 
 
-async def check_limits_size(listener, size, playlist=False, play_count=False):
+async def check_limits_size(
+    listener, size, playlist=False, play_count=False, strict=True
+):
     msgerr = None
     max_pyt, megadl, torddl, zuzdl, leechdl, storage = (
         config_dict["MAX_YTPLAYLIST"],
@@ -85,16 +224,26 @@ async def check_limits_size(listener, size, playlist=False, play_count=False):
         msgerr = f"Mega limit is {megadl}GB"
     if max_pyt and playlist and (play_count > max_pyt):
         msgerr = f"Only {max_pyt} playlist allowed. Current playlist is {play_count}."
-    if storage and not await check_storage_threshold(size, arch):
-        msgerr = f"Need {storage}GB free storage"
+    if storage and not msgerr:
+        if not await check_storage_threshold(size, arch) or not (
+            await storage_ledger.reserve(listener.mid, size, arch, strict)
+        ):
+            msgerr = f"Need {storage}GB free storage"
     return msgerr
 
 
-async def check_running_tasks(mid: int, state="dl"):
-    all_limit = config_dict["QUEUE_ALL"]
-    state_limit = (
-        config_dict["QUEUE_DOWNLOAD"] if state == "dl" else config_dict["QUEUE_UPLOAD"]
-    )
+def queue_share(listener):
+    weight = PREMIUM_WEIGHT if is_premium_user(listener.user_id) else 1
+    priority = listener.priority
+    if priority > 0 and weight == 1:
+        priority = 0
+    return weight, priority
+
+
+async def check_running_tasks(listener, state="dl"):
+    mid = listener.mid
+    all_limit, dl_limit, up_limit = queue_limits()
+    state_limit = dl_limit if state == "dl" else up_limit
     event = None
     is_over_limit = False
     if all_limit or state_limit:
@@ -102,53 +251,56 @@ async def check_running_tasks(mid: int, state="dl"):
             if state == "up" and mid in non_queued_dl:
                 non_queued_dl.remove(mid)
             dl_count, up_count = len(non_queued_dl), len(non_queued_up)
+            state_count = dl_count if state == "dl" else up_count
             is_over_limit = (
                 all_limit
                 and dl_count + up_count >= all_limit
-                and (not state_limit or dl_count >= state_limit)
-            ) or (state_limit and dl_count >= state_limit)
+                and (not state_limit or state_count >= state_limit)
+            ) or (state_limit and state_count >= state_limit)
             if is_over_limit:
                 event = Event()
-                if state == "dl":
-                    queued_dl[mid] = event
-                else:
-                    queued_up[mid] = event
+                weight, priority = queue_share(listener)
+                (queued_dl if state == "dl" else queued_up).push(
+                    mid, event, listener.user_id, weight, priority
+                )
 
     return is_over_limit, event
 
 
+# Admitted mids count as running right away, under queue_dict_lock. The task
+# adds itself again once its setup is done, which is a no-op on the set, but
+# a concurrent start_from_queued in between would otherwise see a stale count.
 async def start_dl_from_queued(mid: int):
     queued_dl[mid].set()
     del queued_dl[mid]
-    await sleep(0.7)
+    non_queued_dl.add(mid)
 
 
 async def start_up_from_queued(mid: int):
     queued_up[mid].set()
     del queued_up[mid]
-    await sleep(0.7)
+    non_queued_up.add(mid)
+
+
+async def _admit_from_queued(task_type, limit, non_queued, queued):
+    count = len(non_queued)
+    if queued and count < limit:
+        for _ in range(min(limit - count, len(queued))):
+            if (mid := queued.pop_next()) is None:
+                break
+            if task_type == "up":
+                await start_up_from_queued(mid)
+            else:
+                await start_dl_from_queued(mid)
 
 
 async def start_task_from_queued(task_type, limit, non_queued, queued):
     async with queue_dict_lock:
-        count = len(non_queued)
-        if queued and count < limit:
-            f_tasks = limit - count
-            for index, mid in enumerate(list(queued), start=1):
-                if task_type == "up":
-                    await start_up_from_queued(mid)
-                else:
-                    await start_dl_from_queued(mid)
-                if index == f_tasks:
-                    break
+        await _admit_from_queued(task_type, limit, non_queued, queued)
 
 
 async def start_from_queued():
-    all_limit, dl_limit, up_limit = (
-        config_dict["QUEUE_ALL"],
-        config_dict["QUEUE_DOWNLOAD"],
-        config_dict["QUEUE_UPLOAD"],
-    )
+    all_limit, dl_limit, up_limit = queue_limits()
 
     if all_limit:
         async with queue_dict_lock:
@@ -156,14 +308,17 @@ async def start_from_queued():
             all_ = dl + up
             if all_ < all_limit:
                 if queued_up and (not up_limit or up < up_limit):
-                    await start_task_from_queued(
+                    await _admit_from_queued(
                         "up",
                         min(all_limit - all_, up_limit or all_limit),
                         non_queued_up,
                         queued_up,
                     )
-                if queued_dl and (not dl_limit or dl < dl_limit):
-                    await start_task_from_queued(
+                # up admissions above already count as running
+                dl, up = len(non_queued_dl), len(non_queued_up)
+                all_ = dl + up
+                if queued_dl and all_ < all_limit and (not dl_limit or dl < dl_limit):
+                    await _admit_from_queued(
                         "dl",
                         min(all_limit - all_, dl_limit or all_limit),
                         non_queued_dl,
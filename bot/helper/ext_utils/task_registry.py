@@ -0,0 +1,111 @@
+class TaskRegistry(dict):
+    """task_dict keeping gid, user and status indexes in sync on every swap.
+
+    Status classes whose gid or status can change on their own (engine-backed
+    ones) set ``dynamic_gid``/``dynamic_status`` and are resolved on query.
+    Filtered lookups are returned in mid order, which is the order tasks were
+    created in.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self._gids = {}
+        self._mid_gids = {}
+        self._users = {}
+        self._statuses = {}
+        self._mid_status = {}
+        self._dynamic_gids = {}
+        self._dynamic_status = {}
+
+    def __setitem__(self, mid, task):
+        if mid in self:
+            self._unindex(mid, self[mid])
+        super().__setitem__(mid, task)
+        self._index(mid, task)
+
+    def __delitem__(self, mid):
+        self._unindex(mid, self[mid])
+        super().__delitem__(mid)
+
+    def pop(self, mid, *default):
+        if mid in self:
+            self._unindex(mid, self[mid])
+        return super().pop(mid, *default)
+
+    def clear(self):
+        super().clear()
+        for index in (
+            self._gids,
+            self._mid_gids,
+            self._users,
+            self._statuses,
+            self._mid_status,
+            self._dynamic_gids,
+            self._dynamic_status,
+        ):
+            index.clear()
+
+    def _index(self, mid, task):
+        self._users.setdefault(task.listener.user_id, {})[mid] = None
+        if getattr(task, "dynamic_gid", True):
+            self._dynamic_gids[mid] = None
+        else:
+            try:
+                self._cache_gid(mid, task.gid())
+            except Exception:
+                self._dynamic_gids[mid] = None
+        if getattr(task, "dynamic_status", True):
+            self._dynamic_status[mid] = None
+        else:
+            try:
+                status = task.status()
+                self._statuses.setdefault(status, {})[mid] = None
+                self._mid_status[mid] = status
+            except Exception:
+                self._dynamic_status[mid] = None
+
+    def _unindex(self, mid, task):
+        user_mids = self._users.get(task.listener.user_id, {})
+        user_mids.pop(mid, None)
+        if not user_mids:
+            self._users.pop(task.listener.user_id, None)
+        if (gid := self._mid_gids.pop(mid, None)) and self._gids.get(gid) == mid:
+            del self._gids[gid]
+        self._dynamic_gids.pop(mid, None)
+        if (status := self._mid_status.pop(mid, None)) is not None:
+            status_mids = self._statuses[status]
+            status_mids.pop(mid, None)
+            if not status_mids:
+                del self._statuses[status]
+        self._dynamic_status.pop(mid, None)
+
+    def _cache_gid(self, mid, gid):
+        if (old_gid := self._mid_gids.get(mid)) and self._gids.get(old_gid) == mid:
+            del self._gids[old_gid]
+        self._gids[gid] = mid
+        self._mid_gids[mid] = gid
+
+    def get_by_gid(self, gid):
+        if (mid := self._gids.get(gid)) is not None and (task := self.get(mid)):
+            if task.gid() == gid:
+                return task
+        for mid in self._dynamic_gids:
+            task = self[mid]
+            if (task_gid := task.gid()) == gid:
+                self._cache_gid(mid, task_gid)
+                return task
+        return None
+
+    def by_user(self, user_id):
+        return [self[mid] for mid in sorted(self._users.get(user_id, ()))]
+
+    def count_by_user(self, user_id):
+        return len(self._users.get(user_id, ()))
+
+    def by_status(self, status, user_id=None):
+        mids = self._statuses.get(status, {}).keys() | {
+            mid for mid in self._dynamic_status if self[mid].status() == status
+        }
+        if user_id is not None:
+            mids &= self._users.get(user_id, {}).keys()
+        return [self[mid] for mid in sorted(mids)]
@@ -0,0 +1,43 @@
+from collections import defaultdict
+
+from bot import bot, bot_dict, bot_lock, config_dict, DEFAULT_SPLIT_SIZE
+from bot.helper.ext_utils.flood_limiter import flood_limiter
+
+
+class UploadPool:
+    """Leech upload clients (bot, helper bots, premium userbot) balanced by load.
+
+    Each file goes to the client with the fewest bytes in flight, skipping
+    clients the flood limiter is holding back. Files over the bot limit can
+    only go through the premium userbot.
+    """
+
+    def __init__(self):
+        self._inflight = defaultdict(int)
+
+    @staticmethod
+    def clients(size):
+        userbot = bot_dict.get("USERBOT")
+        if userbot and size > DEFAULT_SPLIT_SIZE:
+            return [userbot]
+        clients = [bot, *bot_dict.get("HELPERS", [])]
+        if userbot and config_dict["USERBOT_LEECH"]:
+            clients.append(userbot)
+        return clients
+
+    async def acquire(self, size, prefer=None):
+        """``prefer`` names a client that already holds part of this upload"""
+        async with bot_lock:
+            clients = self.clients(size)
+            client = next((c for c in clients if c.name == prefer), None) or min(
+                clients,
+                key=lambda c: (flood_limiter.delay(c), self._inflight[c.name]),
+            )
+            self._inflight[client.name] += size
+        return client
+
+    def release(self, client, size):
+        self._inflight[client.name] = max(self._inflight[client.name] - size, 0)
+
+
+upload_pool = UploadPool()
@@ -57,7 +57,7 @@ async def _onDownloadStarted(api, gid):
             return
 
         size = download.total_length
-        if msg := await check_limits_size(task.listener, size):
+        if msg := await check_limits_size(task.listener, size, strict=False):
             LOGGER.info("File/folder size over the limit size!")
             await gather(
                 task.listener.onDownloadError(
@@ -76,7 +76,7 @@ async def _stop_duplicate(tor):
 async def _download_limits(tor):
     task = await getTaskByGid(tor.hash[:12])
     if hasattr(task, "listener") and (
-        msg := await check_limits_size(task.listener, tor.size)
+        msg := await check_limits_size(task.listener, tor.size, strict=False)
     ):
         LOGGER.info("File/folder size over the limit size!")
         _onDownloadError(
@@ -47,6 +47,7 @@ from bot.helper.ext_utils.links_utils import (
     get_stream_link,
     is_gdrive_id,
 )
+from bot.helper.ext_utils.metrics import metrics
 from bot.helper.ext_utils.shortenurl import short_url
 from bot.helper.ext_utils.status_utils import (
     action,
@@ -54,7 +55,12 @@ from bot.helper.ext_utils.status_utils import (
     get_readable_file_size,
     get_readable_time,
 )
-from bot.helper.ext_utils.task_manager import start_from_queued, check_running_tasks
+from bot.helper.ext_utils.task_manager import (
+    start_from_queued,
+    check_running_tasks,
+    storage_ledger,
+)
+from bot.helper.ext_utils.task_journal import task_journal
 from bot.helper.ext_utils.telegraph_helper import TelePost
 from bot.helper.mirror_utils.gdrive_utlis.upload import gdUpload
 from bot.helper.mirror_utils.rclone_utils.transfer import RcloneTransferHelper
@@ -76,6 +82,7 @@ from bot.helper.telegram_helper.message_utils import (
     sendFile,
     copyMessage,
     sendingMessage,
+    sendStatusMessage,
     update_status_message,
     delete_status,
 )
@@ -90,9 +97,8 @@ class TaskListener(TaskConfig):
     async def clean():
         try:
             if st := Intervals["status"]:
-                for intvl in list(st.values()):
-                    intvl.cancel()
-            Intervals["status"].clear()
+                st.cancel()
+            Intervals["status"] = ""
             await gather(sync_to_async(aria2.purge), delete_status())
         except:
             pass
@@ -103,6 +109,7 @@ class TaskListener(TaskConfig):
             self.sameDir["total"] -= 1
 
     async def onDownloadStart(self):
+        self.downloadStart = time()
         if (
             self.isSuperChat
             and config_dict["INCOMPLETE_TASK_NOTIFIER"]
@@ -112,6 +119,48 @@ class TaskListener(TaskConfig):
                 self.message.chat.id, self.message.link, self.tag
             )
 
+    async def saveCheckpoint(self, stage, up_path, size, gid, **fields):
+        await sync_to_async(
+            task_journal.checkpoint,
+            self.message.link,
+            stage,
+            up_path,
+            dir=self.dir,
+            name=self.name,
+            size=size,
+            gid=gid,
+            **fields,
+        )
+
+    async def resumeCheckpoint(self):
+        if not self.resumeFrom or not (
+            checkpoint := await sync_to_async(task_journal.get, self.resumeFrom)
+        ):
+            return False
+        if not await sync_to_async(task_journal.valid, checkpoint):
+            LOGGER.info("Checkpoint is stale, starting over: %s", checkpoint["name"])
+            await sync_to_async(task_journal.remove, self.resumeFrom)
+            return False
+        old_dir = checkpoint["dir"]
+        await move(old_dir, self.dir)
+        if await aiopath.exists(f"{old_dir}10000"):
+            self.newDir = f"{self.dir}10000"
+            await move(f"{old_dir}10000", self.newDir)
+        self.checkpoint = await sync_to_async(
+            task_journal.rebase, self.resumeFrom, self.message.link, self.dir
+        )
+        self.name = checkpoint["name"]
+        self.seed = False
+        LOGGER.info("Resuming from %s checkpoint: %s", checkpoint["stage"], self.name)
+        await self.onDownloadStart()
+        async with task_dict_lock:
+            task_dict[self.mid] = QueueStatus(
+                self, checkpoint["size"], checkpoint["gid"], "dl"
+            )
+        await sendStatusMessage(self.message)
+        bot_loop.create_task(self.onDownloadComplete())
+        return True
+
     async def onDownloadComplete(self):
         multi_links = False
         if self.sameDir and self.mid in self.sameDir["tasks"]:
@@ -152,26 +201,34 @@ class TaskListener(TaskConfig):
             self.name = task.name()
             gid = task.gid()
         LOGGER.info("Download completed: %s", self.name)
+        metrics.observe_stage("download", self.downloadStart)
         if multi_links:
             await self.onUploadError("Downloaded! Waiting for other tasks.")
             return
 
-        up_path = ospath.join(self.dir, self.name)
-        if not await aiopath.exists(up_path):
-            try:
-                files = await listdir(self.dir)
-                self.name = files[-1]
-                if self.name == "yt-dlp-thumb":
-                    self.name = files[0]
-            except Exception as e:
-                await self.onUploadError(e)
-                return
+        resumed = self.checkpoint["stage"] if self.checkpoint else ""
+        if resumed:
+            up_path, size = self.checkpoint["path"], self.checkpoint["size"]
+            self.streamArchive = self.checkpoint.get("stream_archive", "")
+        else:
+            up_path = ospath.join(self.dir, self.name)
+            if not await aiopath.exists(up_path):
+                try:
+                    files = await listdir(self.dir)
+                    self.name = files[-1]
+                    if self.name == "yt-dlp-thumb":
+                        self.name = files[0]
+                except Exception as e:
+                    await self.onUploadError(e)
+                    return
 
-        await self.isOneFile(up_path)
-        await self.reName()
+            await self.isOneFile(up_path)
+            await self.reName()
 
-        up_path = ospath.join(self.dir, self.name)
-        size = await get_path_size(up_path)
+            up_path = ospath.join(self.dir, self.name)
+            size = await get_path_size(up_path)
+            metrics.downloaded(size)
+            await self.saveCheckpoint("download", up_path, size, gid)
 
         if not config_dict["QUEUE_ALL"]:
             if not config_dict["QUEUE_COMPLETE"]:
@@ -180,57 +237,78 @@ class TaskListener(TaskConfig):
                         non_queued_dl.remove(self.mid)
             await start_from_queued()
 
-        if self.join and await aiopath.isdir(up_path):
-            await join_files(up_path)
+        if resumed not in ("process", "split"):
+            if self.join and await aiopath.isdir(up_path):
+                await join_files(up_path)
 
-        if self.extract:
-            up_path = await self.proceedExtract(up_path, size, gid)
-            if not up_path:
-                return
-            up_dir, self.name = ospath.split(up_path)
-            size = await get_path_size(up_dir)
+            if self.extract:
+                extract_start = time()
+                up_path = await self.proceedExtract(up_path, size, gid)
+                if not up_path:
+                    return
+                metrics.observe_stage("extract", extract_start)
+                up_dir, self.name = ospath.split(up_path)
+                size = await get_path_size(up_dir)
 
-        if self.sampleVideo:
-            up_path = await self.generateSampleVideo(up_path, gid)
-            if not up_path:
-                return
-            up_dir, self.name = ospath.split(up_path)
-            size = await get_path_size(up_dir)
+            if self.sampleVideo:
+                up_path = await self.generateSampleVideo(up_path, gid)
+                if not up_path:
+                    return
+                up_dir, self.name = ospath.split(up_path)
+                size = await get_path_size(up_dir)
 
-        if self.compress:
-            if self.vidMode:
+            if self.compress:
+                if self.vidMode:
+                    up_path = await VidEcxecutor(self, up_path, gid).execute()
+                    if not up_path:
+                        return
+                    self.seed = False
+
+                up_path = await self.proceedCompress(up_path, size, gid)
+                if not up_path:
+                    return
+
+            if not self.compress and self.vidMode:
                 up_path = await VidEcxecutor(self, up_path, gid).execute()
                 if not up_path:
                     return
                 self.seed = False
 
-            up_path = await self.proceedCompress(up_path, size, gid)
-            if not up_path:
-                return
-
-        if not self.compress and self.vidMode:
-            up_path = await VidEcxecutor(self, up_path, gid).execute()
-            if not up_path:
-                return
-            self.seed = False
-
-        if not self.compress and not self.extract:
-            up_path = await self.preName(up_path)
-            await self.editMetadata(up_path, gid)
+            if not self.compress and not self.extract:
+                up_path = await self.preName(up_path)
+                await self.editMetadata(up_path, gid)
 
-        if one_path := await self.isOneFile(up_path):
-            up_path = one_path
+            if one_path := await self.isOneFile(up_path):
+                up_path = one_path
+            await self.saveCheckpoint(
+                "process", up_path, size, gid, stream_archive=self.streamArchive
+            )
 
         up_dir, self.name = ospath.split(up_path)
         size = await get_path_size(up_dir)
         if self.isLeech:
-            o_files, m_size = [], []
-            if not self.compress:
-                result = await self.proceedSplit(up_dir, m_size, o_files, size, gid)
-                if not result:
-                    return
+            if resumed == "split":
+                o_files, m_size = self.checkpoint["o_files"], self.checkpoint["m_size"]
+                self.virtualSplits = self.checkpoint.get("virtual_splits", {})
+            else:
+                o_files, m_size = [], []
+                if not self.compress:
+                    split_start = time()
+                    result = await self.proceedSplit(up_dir, m_size, o_files, size, gid)
+                    if not result:
+                        return
+                    metrics.observe_stage("split", split_start)
+                await self.saveCheckpoint(
+                    "split",
+                    up_path,
+                    size,
+                    gid,
+                    o_files=o_files,
+                    m_size=m_size,
+                    virtual_splits=self.virtualSplits,
+                )
 
-        add_to_queue, event = await check_running_tasks(self.mid, "up")
+        add_to_queue, event = await check_running_tasks(self, "up")
         await start_from_queued()
         if add_to_queue:
             LOGGER.info("Added to Queue/Upload: %s", self.name)
@@ -245,6 +323,7 @@ class TaskListener(TaskConfig):
             non_queued_up.add(self.mid)
 
         size = await get_path_size(up_dir)
+        self.uploadStart = time()
 
         if not self.isLeech and self.isGofile:
             go = GoFileUploader(self)
@@ -286,6 +365,7 @@ class TaskListener(TaskConfig):
     async def onUploadComplete(
         self, link, size, files, folders, mime_type, rclonePath="", dir_id=""
     ):
+        await sync_to_async(task_journal.remove, self.message.link)
         if (
             self.isSuperChat
             and config_dict["INCOMPLETE_TASK_NOTIFIER"]
@@ -294,6 +374,8 @@ class TaskListener(TaskConfig):
             await DbManager().rm_complete_task(self.message.link)
 
         LOGGER.info("Task Done: %s", self.name)
+        metrics.observe_stage("upload", self.uploadStart)
+        metrics.uploaded(size)
         dt_date, dt_time = get_date_time(self.message)
         buttons = ButtonMaker()
         buttons_scr = ButtonMaker()
@@ -589,6 +671,7 @@ class TaskListener(TaskConfig):
         async with task_dict_lock:
             task_dict.pop(self.mid, None)
             count = len(task_dict)
+        await storage_ledger.release(self.mid)
         if count == 0:
             await self.clean()
         else:
@@ -614,10 +697,12 @@ class TaskListener(TaskConfig):
             task_dict.pop(self.mid, None)
             count = len(task_dict)
             self.removeFromSameDir()
+        await storage_ledger.release(self.mid)
         if count == 0:
             await self.clean()
         else:
             await update_status_message(self.message.chat.id)
+        await sync_to_async(task_journal.remove, self.message.link)
         if (
             self.isSuperChat
             and config_dict["INCOMPLETE_TASK_NOTIFIER"]
@@ -708,10 +793,12 @@ class TaskListener(TaskConfig):
         async with task_dict_lock:
             task_dict.pop(self.mid, None)
             count = len(task_dict)
+        await storage_ledger.release(self.mid)
         if count == 0:
             await self.clean()
         else:
             await update_status_message(self.message.chat.id)
+        await sync_to_async(task_journal.remove, self.message.link)
         if (
             self.isSuperChat
             and config_dict["INCOMPLETE_TASK_NOTIFIER"]
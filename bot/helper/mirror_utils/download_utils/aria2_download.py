@@ -38,7 +38,7 @@ async def add_aria2c_download(
         a2c_opt["seed-time"] = seed_time
     if TORRENT_TIMEOUT := config_dict["TORRENT_TIMEOUT"]:
         a2c_opt["bt-stop-timeout"] = f"{TORRENT_TIMEOUT}"
-    add_to_queue, event = await check_running_tasks(listener.mid)
+    add_to_queue, event = await check_running_tasks(listener)
     if add_to_queue:
         if listener.link.startswith("magnet:"):
             a2c_opt["pause-metadata"] = "true"
@@ -37,7 +37,7 @@ async def add_qb_torrent(
         if await aiopath.exists(listener.link):
             url = None
             tpath = listener.link
-        add_to_queue, event = await check_running_tasks(listener.mid)
+        add_to_queue, event = await check_running_tasks(listener)
         op = await sync_to_async(
             client.torrents_add,
             url,
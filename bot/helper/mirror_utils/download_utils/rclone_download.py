@@ -86,7 +86,7 @@ async def add_rclone_download(listener: task.TaskListener, path: str):
         )
         return
 
-    add_to_queue, event = await check_running_tasks(listener.mid)
+    add_to_queue, event = await check_running_tasks(listener)
     if add_to_queue:
         LOGGER.info("Added to Queue/Download: %s", listener.name)
         async with task_dict_lock:
@@ -125,7 +125,7 @@ class TelegramDownloadHelper:
                     )
                     return
 
-                add_to_queue, event = await check_running_tasks(self._listener.mid)
+                add_to_queue, event = await check_running_tasks(self._listener)
                 if add_to_queue:
                     LOGGER.info("Added to Queue/Download: %s", self._listener.name)
                     async with task_dict_lock:
@@ -13,6 +13,7 @@ from tenacity import (
 from bot import config_dict
 from bot.helper.ext_utils.bot_utils import async_to_sync, setInterval
 from bot.helper.ext_utils.files_utils import get_mime_type, clean_target
+from bot.helper.ext_utils.task_journal import task_journal
 from bot.helper.mirror_utils.gdrive_utlis.helper import GoogleDriveHelper
 
 LOGGER = getLogger(__name__)
@@ -24,6 +25,9 @@ class gdUpload(GoogleDriveHelper):
         self._updater = None
         self._path = path
         self._is_errored = False
+        checkpoint = listener.checkpoint or {}
+        self._uploaded = checkpoint.get("uploaded", {})
+        self._gd_dirs = checkpoint.get("gd_dirs", {})
         super().__init__()
         self.is_uploading = True
 
@@ -75,10 +79,12 @@ class gdUpload(GoogleDriveHelper):
                 LOGGER.info("Uploaded to GDrive: %s", self._path)
             else:
                 mime_type = "Folder"
-                dir_id = self.create_directory(
+                dir_id = self._create_directory(
+                    self._path,
                     ospath.basename(ospath.abspath(self.listener.name)),
                     self.listener.upDest,
                 )
+                self.total_files += len(self._uploaded)
                 result = self._upload_dir(self._path, dir_id)
                 if result is None:
                     raise Exception("Upload has been manually cancelled!")
@@ -121,14 +127,21 @@ class gdUpload(GoogleDriveHelper):
         new_id = None
         for item in list_dirs:
             current_file_name = ospath.join(input_directory, item)
-            if ospath.isdir(current_file_name):
-                current_dir_id = self.create_directory(item, dest_id)
+            if current_file_name in self._uploaded:
+                new_id = dest_id
+            elif ospath.isdir(current_file_name):
+                current_dir_id = self._create_directory(
+                    current_file_name, item, dest_id
+                )
                 new_id = self._upload_dir(current_file_name, current_dir_id)
                 self.total_folders += 1
             elif not item.lower().endswith(tuple(self.listener.extensionFilter)):
                 mime_type = get_mime_type(current_file_name)
                 file_name = current_file_name.split("/")[-1]
                 self._upload_file(current_file_name, file_name, mime_type, dest_id)
+                if self.is_cancelled:
+                    break
+                task_journal.uploaded(self.listener.message.link, current_file_name)
                 self.total_files += 1
                 new_id = dest_id
             else:
@@ -139,6 +152,13 @@ class gdUpload(GoogleDriveHelper):
                 break
         return new_id
 
+    def _create_directory(self, path, name, dest_id):
+        if dir_id := self._gd_dirs.get(path):
+            return dir_id
+        dir_id = self.create_directory(name, dest_id)
+        task_journal.uploaded(self.listener.message.link, path, dir_id, "gd_dirs")
+        return dir_id
+
     @retry(
         wait=wait_exponential(multiplier=2, min=3, max=6),
         stop=stop_after_attempt(3),
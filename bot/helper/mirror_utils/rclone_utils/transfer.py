@@ -5,24 +5,33 @@ from asyncio import create_subprocess_exec, gather
 from asyncio.subprocess import PIPE
 from configparser import ConfigParser
 from json import loads
+from natsort import natsorted
+from os import close, pipe, path as ospath, walk
 from random import randrange
 from re import findall as re_findall
+from time import time
+from zipfile import ZipFile, ZipInfo, ZIP_STORED
 
 from bot import config_dict, LOGGER
 from bot.helper.ext_utils.bot_utils import cmd_exec, sync_to_async
 from bot.helper.ext_utils.files_utils import get_mime_type, count_files_and_folders
+from bot.helper.ext_utils.status_utils import speed_string_to_bytes
 from bot.helper.listeners import tasks_listener as task
 
 
+ETA_UNITS = {"w": 604800, "d": 86400, "h": 3600, "m": 60, "s": 1}
+STREAM_CHUNK = 1024 * 1024
+
+
 class RcloneTransferHelper:
     def __init__(self, listener: task.TaskListener = None):
         self._listener = listener
         self._proc = None
-        self._transferred_size = "0 B"
-        self._eta = "~"
-        self._percentage = "0%"
-        self._speed = "0 B/s"
-        self._size = "0 B"
+        self._transferred_size = 0
+        self._eta = 0
+        self._percentage = 0
+        self._speed = 0
+        self._size = 0
         self._is_cancelled = False
         self._is_download = False
         self._is_upload = False
@@ -62,13 +71,15 @@ class RcloneTransferHelper:
                 r"Transferred:\s+([\d.]+\s*\w+)\s+/\s+([\d.]+\s*\w+),\s+([\d.]+%)\s*,\s+([\d.]+\s*\w+/s),\s+ETA\s+([\dwdhms]+)",
                 data,
             ):
-                (
-                    self._transferred_size,
-                    self._size,
-                    self._percentage,
-                    self._speed,
-                    self._eta,
-                ) = data[0]
+                transferred, size, percentage, speed, eta = data[0]
+                self._transferred_size = speed_string_to_bytes(transferred)
+                self._size = speed_string_to_bytes(size)
+                self._percentage = float(percentage.rstrip("%"))
+                self._speed = speed_string_to_bytes(speed)
+                self._eta = sum(
+                    int(value) * ETA_UNITS[unit]
+                    for value, unit in re_findall(r"(\d+)([wdhms])", eta)
+                )
 
     def _switchServiceAccount(self):
         if self._sa_index == self._sa_number - 1:
@@ -204,11 +215,74 @@ class RcloneTransferHelper:
             link = ""
         return link, destination
 
-    async def _start_upload(self, cmd, remote_type, using_sa):
-        self._proc = await create_subprocess_exec(*cmd, stdout=PIPE, stderr=PIPE)
-        _, return_code = await gather(self._progress(), self._proc.wait())
+    def _write_zip(self, path, fd):
+        """Store-level zip of ``path``, the layout ``7z a -mx=0`` gives, written
+        to ``fd`` while it is read"""
+        root = ospath.dirname(path)
+        tree = (
+            walk(path) if ospath.isdir(path) else [(root, [], [ospath.basename(path)])]
+        )
+        self._transferred_size, start = 0, time()
+        # fd stays open on errors, so rclone never sees EOF of a broken archive
+        with open(fd, "wb", closefd=False) as out, ZipFile(out, "w", ZIP_STORED) as zf:
+            for dirpath, _, files in tree:
+                if dirpath != root:
+                    zf.write(dirpath, ospath.relpath(dirpath, root))
+                for file_ in natsorted(files):
+                    if file_.lower().endswith(tuple(self._listener.extensionFilter)):
+                        continue
+                    fpath = ospath.join(dirpath, file_)
+                    zinfo = ZipInfo.from_file(fpath, ospath.relpath(fpath, root))
+                    with open(fpath, "rb") as src, zf.open(zinfo, "w") as dest:
+                        while chunk := src.read(STREAM_CHUNK):
+                            if self._is_cancelled:
+                                return
+                            dest.write(chunk)
+                            self._transferred_size += len(chunk)
+                            self._speed = self._transferred_size / max(
+                                time() - start, 1
+                            )
+                            if self._size:
+                                self._percentage = min(
+                                    self._transferred_size / self._size * 100, 100
+                                )
+                                self._eta = int(
+                                    max(self._size - self._transferred_size, 0)
+                                    / self._speed
+                                )
+
+    async def _stream_zip(self, path, fd):
+        try:
+            await sync_to_async(self._write_zip, path, fd)
+        except BrokenPipeError:
+            # rclone exited, its return code tells why
+            pass
+        except Exception as e:
+            self._proc.kill()
+            if not self._is_cancelled:
+                LOGGER.error("%s. While streaming archive of: %s", e, path)
+                return str(e)
+        finally:
+            close(fd)
+
+    async def _start_upload(self, cmd, remote_type, using_sa, stream=""):
+        stdin, writers = None, []
+        if stream:
+            stdin, write_fd = pipe()
+        self._proc = await create_subprocess_exec(
+            *cmd, stdin=stdin, stdout=PIPE, stderr=PIPE
+        )
+        if stream:
+            close(stdin)
+            writers.append(self._stream_zip(stream, write_fd))
+        _, return_code, *stream_error = await gather(
+            self._progress(), self._proc.wait(), *writers
+        )
         if self._is_cancelled:
             return False
+        if stream_error and stream_error[0]:
+            await self._listener.onUploadError(stream_error[0])
+            return False
         if return_code == -9:
             return False
         if return_code != 0:
@@ -219,11 +293,15 @@ class RcloneTransferHelper:
             if self._sa_number != 0 and "RATE_LIMIT_EXCEEDED" in error and using_sa:
                 if self._sa_count < self._sa_number:
                     remote = self._switchServiceAccount()
-                    cmd[7] = f"{remote}:{cmd[7].split(':', 1)[1]}"
+                    # rcat takes the destination as its only argument
+                    index = 5 if stream else 7
+                    cmd[index] = f"{remote}:{cmd[index].split(':', 1)[1]}"
                     return (
                         False
                         if self._is_cancelled
-                        else await self._start_upload(cmd, remote_type, using_sa)
+                        else await self._start_upload(
+                            cmd, remote_type, using_sa, stream
+                        )
                     )
                 LOGGER.info(
                     "Reached maximum number of service accounts switching, which is %s",
@@ -243,7 +321,8 @@ class RcloneTransferHelper:
         else:
             oconfig_path = "rclone.conf"
         oremote, rc_path = rc_path.split(":", 1)
-        if await aiopath.isdir(path):
+        stream = self._listener.streamArchive
+        if not stream and await aiopath.isdir(path):
             mime_type = "Folder"
             folders, files = await count_files_and_folders(
                 path, self._listener.extensionFilter
@@ -255,7 +334,11 @@ class RcloneTransferHelper:
                     f"This file extension is excluded by extension filter ({', '.join(self._listener.extensionFilter[2:])})!"
                 )
                 return
-            mime_type = await sync_to_async(get_mime_type, path)
+            if stream:
+                mime_type = "application/zip"
+                self._size = size
+            else:
+                mime_type = await sync_to_async(get_mime_type, path)
             files, folders = 1, 0
         try:
             remote_opts = await self._get_remote_options(oconfig_path, oremote)
@@ -279,17 +362,31 @@ class RcloneTransferHelper:
                 self._sa_index = randrange(self._sa_number)
                 fremote = f"sa{self._sa_index:03}"
                 LOGGER.info("Upload with service account %s", fremote)
-        method = "move" if not self._listener.seed or self._listener.newDir else "copy"
-        cmd = self._getUpdatedCommand(
-            fconfig_path, path, f"{fremote}:{rc_path}", method
-        )
+        if stream:
+            cmd = self._getUpdatedCommand(
+                fconfig_path,
+                f"{fremote}:{rc_path}/{self._listener.name}"
+                if rc_path
+                else f"{fremote}:{self._listener.name}",
+                [],
+                "rcat",
+            )
+            # progress comes from the zip writer, rcat can't know the total
+            cmd.remove("-P")
+        else:
+            method = (
+                "move" if not self._listener.seed or self._listener.newDir else "copy"
+            )
+            cmd = self._getUpdatedCommand(
+                fconfig_path, path, f"{fremote}:{rc_path}", method
+            )
         if (
             remote_type == "drive"
             and not config_dict["RCLONE_FLAGS"]
             and not self._listener.rcFlags
         ):
             cmd.extend(("--drive-chunk-size", "128M", "--drive-upload-cutoff", "128M"))
-        result = await self._start_upload(cmd, remote_type, using_sa)
+        result = await self._start_upload(cmd, remote_type, using_sa, stream)
         if not result:
             return
         if remote_type == "drive":
@@ -3,7 +3,13 @@ from time import time
 
 from bot import aria2, LOGGER
 from bot.helper.ext_utils.bot_utils import sync_to_async
-from bot.helper.ext_utils.status_utils import MirrorStatus, get_readable_time
+from bot.helper.ext_utils.engine_snapshot import engine_snapshot
+from bot.helper.ext_utils.status_utils import (
+    BaseStatus,
+    MirrorStatus,
+    get_readable_file_size,
+    get_readable_time,
+)
 
 
 def get_download(gid, old_info=None):
@@ -14,7 +20,11 @@ def get_download(gid, old_info=None):
         return old_info
 
 
-class Aria2Status:
+class Aria2Status(BaseStatus):
+    dynamic_gid = True
+    dynamic_status = True
+    track_speed = True
+
     def __init__(self, listener, gid, seeding=False, queued=False):
         self._gid = gid
         self._download = None
@@ -32,32 +42,30 @@ class Aria2Status:
         return get_readable_time(time() - self._elapsed)
 
     def _update(self):
-        if not self._download:
+        if download := engine_snapshot.get_aria2(self._gid):
+            self._download = download
+        elif not self._download:
             self._download = get_download(self._gid, self._download)
         else:
             self._download = self._download.live
 
         if self._download.followed_by_ids:
             self._gid = self._download.followed_by_ids[0]
-            self._download = get_download(self._gid)
-
-    def progress(self):
-        return self._download.progress_string()
+            self._download = engine_snapshot.get_aria2(self._gid) or get_download(
+                self._gid
+            )
 
-    def processed_bytes(self):
-        return self._download.completed_length_string()
+    def processed_raw(self):
+        return self._download.completed_length
 
-    def speed(self):
-        return self._download.download_speed_string()
+    def speed_raw(self):
+        return self._download.download_speed
 
     def name(self):
         return self._download.name
 
-    def size(self):
-        return self._download.total_length_string()
-
-    def eta(self):
-        return self._download.eta_string()
+    def size_raw(self):
+        return self._download.total_length
 
     def status(self):
         self._update()
@@ -80,11 +88,14 @@ class Aria2Status:
         return self._download.connections
 
     def uploaded_bytes(self):
-        return self._download.upload_length_string()
+        return get_readable_file_size(self._download.upload_length)
 
-    def upload_speed(self):
+    def upload_speed_raw(self):
         self._update()
-        return self._download.upload_speed_string()
+        return self._download.upload_speed
+
+    def upload_speed(self):
+        return f"{get_readable_file_size(self.upload_speed_raw())}/s"
 
     def ratio(self):
         return f"{round(self._download.upload_length / self._download.completed_length, 3)}"
@@ -4,13 +4,13 @@ from bot import LOGGER, VID_MODE
 from bot.helper.ext_utils.bot_utils import async_to_sync
 from bot.helper.ext_utils.files_utils import get_path_size
 from bot.helper.ext_utils.status_utils import (
-    get_readable_file_size,
+    BaseStatus,
     MirrorStatus,
     get_readable_time,
 )
 
 
-class FFMpegStatus:
+class FFMpegStatus(BaseStatus):
     def __init__(self, listener, obj, gid, status):
         self._gid = gid
         self._obj = obj
@@ -25,47 +25,37 @@ class FFMpegStatus:
     def elapsed(self):
         return get_readable_time(time() - self._time)
 
-    def processed_bytes(self):
-        return get_readable_file_size(self._obj.processed_bytes)
+    def processed_raw(self):
+        return self._obj.processed_bytes
 
     def gid(self):
         return self._gid
 
-    def progress(self):
+    def progress_raw(self):
         if self._status != "direct":
-            return self._obj.percentage
-        try:
-            progress_raw = self._obj.processed_bytes / self._obj.size * 100
-        except:
-            progress_raw = 0
-        return f"{round(progress_raw, 2)}%"
+            return self._obj.progress_raw
+        return super().progress_raw()
 
-    def speed(self):
-        return f"{get_readable_file_size(self._obj.speed)}/s"
+    def speed_raw(self):
+        return self._obj.speed
 
     def name(self):
         return self._obj.name if self._obj else self.listener.name
 
-    def size(self):
-        size = (
+    def size_raw(self):
+        return (
             self._obj.size
             if self._obj
             else async_to_sync(get_path_size, self.listener.dir)
         )
-        return get_readable_file_size(size)
 
     def timeout(self):
         return get_readable_time(180 - (time() - self._time))
 
-    def eta(self):
+    def eta_raw(self):
         if self._status != "direct":
-            return get_readable_time(self._obj.eta)
-        try:
-            return get_readable_time(
-                (self._obj.size - self._obj.processed_bytes) / self._obj.speed
-            )
-        except:
-            return "~"
+            return self._obj.eta
+        return super().eta_raw()
 
     def status(self):
         match self._status:
@@ -1,13 +1,15 @@
 from time import time
 
 from bot.helper.ext_utils.status_utils import (
+    BaseStatus,
     MirrorStatus,
-    get_readable_file_size,
     get_readable_time,
 )
 
 
-class GdriveStatus:
+class GdriveStatus(BaseStatus):
+    track_speed = True
+
     def __init__(self, listener, obj, size, gid, status):
         self._obj = obj
         self._size = size
@@ -23,11 +25,11 @@ class GdriveStatus:
     def elapsed(self):
         return get_readable_time(time() - self._elapsed)
 
-    def processed_bytes(self):
-        return get_readable_file_size(self._obj.processed_bytes)
+    def processed_raw(self):
+        return self._obj.processed_bytes
 
-    def size(self):
-        return get_readable_file_size(self._size)
+    def size_raw(self):
+        return self._size
 
     def status(self):
         if self._status == "up":
@@ -42,25 +44,8 @@ class GdriveStatus:
     def gid(self):
         return self._gid
 
-    def progress_raw(self):
-        try:
-            return self._obj.processed_bytes / self._size * 100
-        except:
-            return 0
-
-    def progress(self):
-        return f"{round(self.progress_raw(), 2)}%"
-
-    def speed(self):
-        return f"{get_readable_file_size(self._obj.speed)}/s"
-
-    def eta(self):
-        try:
-            return get_readable_time(
-                (self._size - self._obj.processed_bytes) / self._obj.speed
-            )
-        except:
-            return "~"
+    def speed_raw(self):
+        return self._obj.speed
 
     def task(self):
         return self._obj
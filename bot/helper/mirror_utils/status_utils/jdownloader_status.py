@@ -5,8 +5,8 @@ from bot import LOGGER, jd_lock, jd_downloads
 from bot.helper.ext_utils.bot_utils import retry_function
 from bot.helper.ext_utils.jdownloader_booter import jdownloader
 from bot.helper.ext_utils.status_utils import (
+    BaseStatus,
     MirrorStatus,
-    get_readable_file_size,
     get_readable_time,
 )
 
@@ -59,7 +59,10 @@ def get_download(gid, old_info, start_time):
         return old_info
 
 
-class JDownloaderStatus:
+class JDownloaderStatus(BaseStatus):
+    dynamic_status = True
+    track_speed = True
+
     def __init__(self, listener, gid):
         self.listener = listener
         self._gid = gid
@@ -76,26 +79,20 @@ class JDownloaderStatus:
     def _update(self):
         self._info = get_download(int(self._gid), self._info, self._start_time)
 
-    def progress(self):
-        try:
-            return f"{round((self._info.get('bytesLoaded', 0) / self._info.get('bytesTotal', 0)) * 100, 2)}%"
-        except:
-            return "0%"
-
-    def processed_bytes(self):
-        return get_readable_file_size(self._info.get("bytesLoaded", 0))
+    def processed_raw(self):
+        return self._info.get("bytesLoaded", 0)
 
-    def speed(self):
-        return f"{get_readable_file_size(self._info.get('speed', 0))}/s"
+    def speed_raw(self):
+        return self._info.get("speed", 0)
 
     def name(self):
         return self._info.get("name") or self.listener.name
 
-    def size(self):
-        return get_readable_file_size(self._info.get("bytesTotal", 0))
+    def size_raw(self):
+        return self._info.get("bytesTotal", 0)
 
-    def eta(self):
-        return get_readable_time(eta) if (eta := self._info.get("eta", False)) else "-"
+    def eta_raw(self):
+        return self._info.get("eta", 0)
 
     def status(self):
         self._update()
@@ -3,7 +3,9 @@ from time import time
 
 from bot import QbTorrents, qb_listener_lock, get_client, LOGGER
 from bot.helper.ext_utils.bot_utils import sync_to_async
+from bot.helper.ext_utils.engine_snapshot import engine_snapshot
 from bot.helper.ext_utils.status_utils import (
+    BaseStatus,
     MirrorStatus,
     get_readable_file_size,
     get_readable_time,
@@ -18,7 +20,11 @@ def get_download(client, tag, old_info=None):
         return old_info
 
 
-class QbittorrentStatus:
+class QbittorrentStatus(BaseStatus):
+    dynamic_gid = True
+    dynamic_status = True
+    track_speed = True
+
     def __init__(self, listener, seeding=False, queued=False):
         self.listener = listener
         self.queued = queued
@@ -32,7 +38,9 @@ class QbittorrentStatus:
         return "qBittorrent"
 
     def _update(self, attempt=0):
-        if new_info := get_download(self.client, f"{self.listener.mid}"):
+        if new_info := engine_snapshot.get_qbit(f"{self.listener.mid}"):
+            self._info = new_info
+        elif new_info := get_download(self.client, f"{self.listener.mid}"):
             self._info = new_info
         elif attempt < 3:
             return self._update(attempt + 1)
@@ -40,14 +48,14 @@ class QbittorrentStatus:
     def elapsed(self):
         return get_readable_time(time() - self._elapsed)
 
-    def progress(self):
-        return f"{round(self._info.progress * 100, 2)}%"
+    def progress_raw(self):
+        return self._info.progress * 100
 
-    def processed_bytes(self):
-        return get_readable_file_size(self._info.downloaded)
+    def processed_raw(self):
+        return self._info.downloaded
 
-    def speed(self):
-        return f"{get_readable_file_size(self._info.dlspeed)}/s"
+    def speed_raw(self):
+        return self._info.dlspeed
 
     def name(self):
         return (
@@ -56,11 +64,11 @@ class QbittorrentStatus:
             else self._info.name
         )
 
-    def size(self):
-        return get_readable_file_size(self._info.size)
+    def size_raw(self):
+        return self._info.size
 
-    def eta(self):
-        return get_readable_time(self._info.eta)
+    def eta_raw(self):
+        return self._info.eta
 
     def status(self):
         self._update()
@@ -86,8 +94,11 @@ class QbittorrentStatus:
     def uploaded_bytes(self):
         return get_readable_file_size(self._info.uploaded)
 
+    def upload_speed_raw(self):
+        return self._info.upspeed
+
     def upload_speed(self):
-        return f"{get_readable_file_size(self._info.upspeed)}/s"
+        return f"{get_readable_file_size(self.upload_speed_raw())}/s"
 
     def ratio(self):
         return f"{round(self._info.ratio, 3)}"
@@ -99,7 +110,7 @@ class QbittorrentStatus:
         return self
 
     def gid(self):
-        return self.hash()[:12]
+        return (self._info.hash if self._info else self.hash())[:12]
 
     def hash(self):
         self._update()
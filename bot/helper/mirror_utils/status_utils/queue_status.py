@@ -2,13 +2,13 @@ from time import time
 
 from bot import LOGGER
 from bot.helper.ext_utils.status_utils import (
-    get_readable_file_size,
+    BaseStatus,
     MirrorStatus,
     get_readable_time,
 )
 
 
-class QueueStatus:
+class QueueStatus(BaseStatus):
     def __init__(self, listener, size, gid, status):
         self._size = size
         self._gid = gid
@@ -29,8 +29,8 @@ class QueueStatus:
     def name(self):
         return self.listener.name
 
-    def size(self):
-        return get_readable_file_size(self._size)
+    def size_raw(self):
+        return self._size
 
     def status(self):
         return (
@@ -39,22 +39,6 @@ class QueueStatus:
             else MirrorStatus.STATUS_QUEUEUP
         )
 
-    @staticmethod
-    def processed_bytes():
-        return 0
-
-    @staticmethod
-    def progress():
-        return "0%"
-
-    @staticmethod
-    def speed():
-        return "0B/s"
-
-    @staticmethod
-    def eta():
-        return "~"
-
     def task(self):
         return self
 
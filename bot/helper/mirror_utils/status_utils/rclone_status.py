@@ -1,9 +1,15 @@
 from time import time
 
-from bot.helper.ext_utils.status_utils import MirrorStatus, get_readable_time
+from bot.helper.ext_utils.status_utils import (
+    BaseStatus,
+    MirrorStatus,
+    get_readable_time,
+)
 
 
-class RcloneStatus:
+class RcloneStatus(BaseStatus):
+    track_speed = True
+
     def __init__(self, listener, obj, gid, status):
         self._obj = obj
         self._gid = gid
@@ -21,19 +27,19 @@ class RcloneStatus:
     def gid(self):
         return self._gid
 
-    def progress(self):
+    def progress_raw(self):
         return self._obj.percentage
 
-    def speed(self):
+    def speed_raw(self):
         return self._obj.speed
 
     def name(self):
         return self.listener.name
 
-    def size(self):
+    def size_raw(self):
         return self._obj.size
 
-    def eta(self):
+    def eta_raw(self):
         return self._obj.eta
 
     def status(self):
@@ -45,7 +51,7 @@ class RcloneStatus:
             case _:
                 return MirrorStatus.STATUS_CLONING
 
-    def processed_bytes(self):
+    def processed_raw(self):
         return self._obj.transferred_size
 
     def task(self):
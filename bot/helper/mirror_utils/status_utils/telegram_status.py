@@ -1,13 +1,16 @@
 from time import time
 
 from bot.helper.ext_utils.status_utils import (
+    BaseStatus,
     MirrorStatus,
     get_readable_file_size,
     get_readable_time,
 )
 
 
-class TelegramStatus:
+class TelegramStatus(BaseStatus):
+    track_speed = True
+
     def __init__(self, listener, obj, size, gid, status):
         self._obj = obj
         self._size = size
@@ -23,11 +26,19 @@ class TelegramStatus:
     def elapsed(self):
         return get_readable_time(time() - self._elapsed)
 
-    def processed_bytes(self):
-        return get_readable_file_size(self._obj.processed_bytes)
+    def processed_raw(self):
+        return self._obj.processed_bytes
+
+    def parts(self):
+        if parts := getattr(self._obj, "parts", None):
+            return f"{parts[0]}/{parts[1]}"
+
+    def saved_bytes(self):
+        if saved := getattr(self._obj, "saved_bytes", 0):
+            return get_readable_file_size(saved)
 
-    def size(self):
-        return get_readable_file_size(self._size)
+    def size_raw(self):
+        return self._size
 
     def status(self):
         return (
@@ -39,23 +50,8 @@ class TelegramStatus:
     def name(self):
         return self.listener.name
 
-    def progress(self):
-        try:
-            progress_raw = self._obj.processed_bytes / self._size * 100
-        except:
-            progress_raw = 0
-        return f"{round(progress_raw, 2)}%"
-
-    def speed(self):
-        return f"{get_readable_file_size(self._obj.speed)}/s"
-
-    def eta(self):
-        try:
-            return get_readable_time(
-                (self._size - self._obj.processed_bytes) / self._obj.speed
-            )
-        except:
-            return "~"
+    def speed_raw(self):
+        return self._obj.speed
 
     def gid(self):
         return self._gid
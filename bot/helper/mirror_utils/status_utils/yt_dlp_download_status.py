@@ -3,13 +3,15 @@ from time import time
 from bot.helper.ext_utils.bot_utils import async_to_sync
 from bot.helper.ext_utils.files_utils import get_path_size
 from bot.helper.ext_utils.status_utils import (
+    BaseStatus,
     MirrorStatus,
-    get_readable_file_size,
     get_readable_time,
 )
 
 
-class YtDlpDownloadStatus:
+class YtDlpDownloadStatus(BaseStatus):
+    track_speed = True
+
     def __init__(self, listener, obj, gid):
         self._obj = obj
         self._gid = gid
@@ -26,9 +28,6 @@ class YtDlpDownloadStatus:
     def gid(self):
         return self._gid
 
-    def processed_bytes(self):
-        return get_readable_file_size(self.processed_raw())
-
     def processed_raw(self):
         return (
             self._obj.downloaded_bytes
@@ -36,8 +35,8 @@ class YtDlpDownloadStatus:
             else async_to_sync(get_path_size, self.listener.dir)
         )
 
-    def size(self):
-        return get_readable_file_size(self._obj.size)
+    def size_raw(self):
+        return self._obj.size
 
     @staticmethod
     def status():
@@ -46,21 +45,16 @@ class YtDlpDownloadStatus:
     def name(self):
         return self.listener.name
 
-    def progress(self):
-        return f"{round(self._obj.progress, 2)}%"
+    def progress_raw(self):
+        return self._obj.progress
 
-    def speed(self):
-        return f"{get_readable_file_size(self._obj.download_speed)}/s"
+    def speed_raw(self):
+        return self._obj.download_speed or 0
 
-    def eta(self):
+    def eta_raw(self):
         if self._obj.eta != "~":
-            return get_readable_time(self._obj.eta)
-        try:
-            return get_readable_time(
-                (self._obj.size - self.processed_raw()) / self._obj.download_speed
-            )
-        except:
-            return "~"
+            return self._obj.eta
+        return super().eta_raw()
 
     def task(self):
         return self._obj
@@ -1,7 +1,7 @@
 from __future__ import annotations
 from aiofiles.os import path as aiopath, rename as aiorename, makedirs
-from aioshutil import copy
-from asyncio import sleep, gather
+from asyncio import Condition, Lock, Semaphore, gather
+from functools import partial
 from logging import getLogger
 from natsort import natsorted
 from os import path as ospath, walk
@@ -18,7 +18,7 @@ from tenacity import (
 )
 from time import time
 
-from bot import bot, bot_dict, bot_lock, config_dict, DEFAULT_SPLIT_SIZE, LOGGER
+from bot import bot, config_dict, LOGGER
 from bot.helper.ext_utils.bot_utils import sync_to_async, default_button
 from bot.helper.ext_utils.files_utils import (
     clean_unwanted,
@@ -26,6 +26,8 @@ from bot.helper.ext_utils.files_utils import (
     get_path_size,
     is_archive,
     get_base_name,
+    link_or_copy,
+    FileWindow,
 )
 from bot.helper.ext_utils.media_utils import (
     create_thumbnail,
@@ -36,7 +38,10 @@ from bot.helper.ext_utils.media_utils import (
     post_media_info,
     GenSS,
 )
+from bot.helper.ext_utils.resumable_upload import ResumableUpload
 from bot.helper.ext_utils.shortenurl import short_url
+from bot.helper.ext_utils.task_journal import task_journal
+from bot.helper.ext_utils.upload_pool import upload_pool
 from bot.helper.listeners import tasks_listener as task
 from bot.helper.stream_utils.file_properties import gen_link
 from bot.helper.telegram_helper.button_build import ButtonMaker
@@ -46,10 +51,38 @@ from bot.helper.telegram_helper.message_utils import deleteMessage, handle_messa
 LOGGER = getLogger(__name__)
 
 
+PREP_AHEAD = 2
+
+
+class UploadItem:
+    """One leech file, carried from its preparation to its ordered delivery"""
+
+    def __init__(self, index, dirpath, file_, parts, window=None):
+        self.index = index
+        self.dirpath = dirpath
+        self.file_ = file_
+        self.src = self.path = ospath.join(dirpath, file_)
+        self.parts = parts
+        # byte range of a virtually split file, item.path is then only its name
+        self.window = window
+        self.client = None
+        self.msg = None
+        self.key = None
+        self.uploaded = 0
+        self.caption = None
+        self.thumb = None
+        self.ss_image = None
+        self.screens = []
+        self.is_video = self.is_audio = self.is_image = False
+        self.duration = 0
+        self.artist = self.title = None
+        self.width, self.height = 480, 320
+
+
 class TgUploader:
     def __init__(self, listener: task.TaskListener, path: str, size: int):
-        self._last_uploaded = 0
         self._processed_bytes = 0
+        self._saved_bytes = 0
         self._listener = listener
         self._path = path
         self._start_time = time()
@@ -62,97 +95,104 @@ class TgUploader:
         self._size = size
         self._media_dict = {"videos": {}, "documents": {}}
         self._last_msg_in_group = False
-        self._client = None
         self._send_msg = None
-        self._up_path = ""
         self._leech_log = config_dict["LEECH_LOG"]
+        self._total_files = 0
+        self._corrupted_files = 0
+        self._ready = {}
+        self._next_index = 0
+        self._deliver_lock = Lock()
+        self._turn = Condition()
+        self._sending = {}
 
-    async def _upload_progress(self, current, _):
+    async def _upload_progress(self, current, _, item):
         if self._is_cancelled:
-            self._client.stop_transmission()
-        chunk_size = current - self._last_uploaded
-        self._last_uploaded = current
+            item.client.stop_transmission()
+        chunk_size = current - item.uploaded
+        item.uploaded = current
         self._processed_bytes += chunk_size
 
     async def upload(self, o_files, m_size):
         await self._user_settings()
         await self._msg_to_reply()
-        corrupted_files = total_files = 0
+        uploaded = (self._listener.checkpoint or {}).get("uploaded", {})
+        parts = (self._listener.checkpoint or {}).get("parts", {})
+        for sent in uploaded.values():
+            self._total_files += 1
+            if sent:
+                self._msgs_dict[sent[0]] = sent[1]
+        items = []
         for dirpath, _, files in sorted(await sync_to_async(walk, self._path)):
             if dirpath.endswith("/yt-dlp-thumb"):
                 continue
             for file_ in natsorted(files):
-                self._up_path = ospath.join(dirpath, file_)
+                up_path = ospath.join(dirpath, file_)
+                if up_path in uploaded:
+                    continue
                 if file_.lower().endswith(
                     tuple(self._listener.extensionFilter)
                 ) or file_.startswith("Thumb"):
                     if not file_.startswith("Thumb"):
-                        await clean_target(self._up_path)
+                        await clean_target(up_path)
                     continue
-                try:
-                    f_size = await get_path_size(self._up_path)
-                    if self._listener.seed and file_ in o_files and f_size in m_size:
-                        continue
-                    if f_size == 0:
-                        corrupted_files += 1
-                        LOGGER.error(
-                            "%s size is zero, telegram don't upload zero size files",
-                            self._up_path,
-                        )
-                        continue
-                    if self._is_cancelled:
-                        return
-                    caption = await self._prepare_file(file_, dirpath)
-                    if self._last_msg_in_group:
-                        group_lists = [
-                            x for v in self._media_dict.values() for x in v.keys()
-                        ]
-                        match = re_match(
-                            r".+(?=\.0*\d+$)|.+(?=\.part\d+\..+$)", self._up_path
+                f_size = await get_path_size(up_path)
+                if split_size := self._listener.virtualSplits.get(up_path):
+                    for i, offset in enumerate(range(0, f_size, split_size), 1):
+                        name = f"{file_}.{i:03}"
+                        part_path = ospath.join(dirpath, name)
+                        if part_path in uploaded:
+                            continue
+                        item = UploadItem(
+                            len(items),
+                            dirpath,
+                            name,
+                            ResumableUpload(**(parts.get(part_path) or {})),
+                            FileWindow(
+                                up_path,
+                                offset,
+                                min(split_size, f_size - offset),
+                                name,
+                            ),
                         )
-                        if not match or match and match.group(0) not in group_lists:
-                            for key, value in list(self._media_dict.items()):
-                                for subkey, msgs in list(value.items()):
-                                    if len(msgs) > 1:
-                                        await self._send_media_group(msgs, subkey, key)
-                    self._last_msg_in_group = False
-                    self._last_uploaded = 0
-                    await self._upload_file(caption, file_)
-                    total_files += 1
-                    if self._is_cancelled:
-                        return
-                    if not self._is_corrupted and (
-                        self._listener.isSuperChat or self._leech_log
-                    ):
-                        self._msgs_dict[self._send_msg.link] = file_
-                    await sleep(3)
-                except Exception as err:
-                    if isinstance(err, RetryError):
-                        LOGGER.info(
-                            "Total Attempts: %s",
-                            err.last_attempt.attempt_number,
-                            exc_info=True,
-                        )
-                        corrupted_files += 1
-                        self._is_corrupted = True
-                        err = err.last_attempt.exception()
-                    LOGGER.error("%s. Path: %s", err, self._up_path)
-                    corrupted_files += 1
-                    if self._is_cancelled:
-                        return
+                        item.parts.on_save = partial(self._save_parts, item)
+                        items.append(item)
                     continue
-                finally:
-                    if (
-                        not self._is_cancelled
-                        and await aiopath.exists(self._up_path)
-                        and (
-                            not self._listener.seed
-                            or self._listener.newDir
-                            or dirpath.endswith("/splited_files_mltb")
-                            or "/copied_mltb/" in self._up_path
-                        )
-                    ):
-                        await clean_target(self._up_path)
+                if self._listener.seed and file_ in o_files and f_size in m_size:
+                    continue
+                if f_size == 0:
+                    self._corrupted_files += 1
+                    LOGGER.error(
+                        "%s size is zero, telegram don't upload zero size files",
+                        up_path,
+                    )
+                    continue
+                item = UploadItem(
+                    len(items),
+                    dirpath,
+                    file_,
+                    ResumableUpload(**(parts.get(up_path) or {})),
+                )
+                item.parts.on_save = partial(self._save_parts, item)
+                items.append(item)
+
+        # Files are prepared (rename, probe, thumbnail, screenshots) up to
+        # PREP_AHEAD files ahead of the transfers, transferred up to
+        # LEECH_UPLOAD_WORKERS at a time past the last delivered file and then
+        # delivered (copies, media groups, result links) strictly in walk order.
+        workers = max(config_dict["LEECH_UPLOAD_WORKERS"], 1)
+        slots = Semaphore(workers + PREP_AHEAD)
+
+        async def _run(item):
+            async with slots:
+                if not self._is_cancelled:
+                    await self._transfer(item, workers)
+                await self._deliver(item)
+
+        await gather(*(_run(item) for item in items))
+        if not self._is_cancelled and (
+            not self._listener.seed or self._listener.newDir
+        ):
+            await gather(*[clean_target(path) for path in self._listener.virtualSplits])
 
         for key, value in list(self._media_dict.items()):
             for subkey, msgs in list(value.items()):
@@ -162,186 +202,290 @@ class TgUploader:
             return
         if self._listener.seed and not self._listener.newDir:
             await clean_unwanted(self._path)
-        if total_files == 0:
+        if self._total_files == 0:
             await self._listener.onUploadError(
                 f"No files to upload or in blocked list ({', '.join(self._listener.extensionFilter[2:])})!"
             )
             return
-        if total_files <= corrupted_files:
+        if self._total_files <= self._corrupted_files:
             await self._listener.onUploadError(
                 "Files Corrupted or unable to upload. Check logs!"
             )
             return
         LOGGER.info("Leech Completed: %s", self._listener.name)
         await self._listener.onUploadComplete(
-            None, self._size, self._msgs_dict, total_files, corrupted_files
+            None,
+            self._size,
+            self._msgs_dict,
+            self._total_files,
+            self._corrupted_files,
+        )
+
+    async def _transfer(self, item, workers):
+        try:
+            await self._prepare(item)
+            async with self._turn:
+                await self._turn.wait_for(
+                    lambda: (
+                        self._is_cancelled or item.index < self._next_index + workers
+                    )
+                )
+            await self._upload_file(item)
+        except Exception as err:
+            item.msg = None
+            if isinstance(err, RetryError):
+                LOGGER.info(
+                    "Total Attempts: %s",
+                    err.last_attempt.attempt_number,
+                    exc_info=True,
+                )
+                self._corrupted_files += 1
+                self._is_corrupted = True
+                err = err.last_attempt.exception()
+            LOGGER.error("%s. Path: %s", err, item.path)
+            self._corrupted_files += 1
+        finally:
+            if item.window:
+                item.window.close()
+            if item.thumb and item.thumb != self._thumb:
+                await clean_target(item.thumb)
+            await gather(*[clean_target(m) for m in [item.ss_image, *item.screens]])
+            if (
+                not self._is_cancelled
+                and await aiopath.exists(item.path)
+                and (
+                    not self._listener.seed
+                    or self._listener.newDir
+                    or item.dirpath.endswith("/splited_files_mltb")
+                    or "/copied_mltb/" in item.path
+                )
+            ):
+                await clean_target(item.path)
+
+    async def _deliver(self, item):
+        self._ready[item.index] = item
+        async with self._deliver_lock:
+            while (item := self._ready.pop(self._next_index, None)) is not None:
+                self._next_index += 1
+                if item.msg is None or self._is_cancelled:
+                    continue
+                await self._deliver_file(item)
+        async with self._turn:
+            self._turn.notify_all()
+
+    async def _deliver_file(self, item):
+        if self._last_msg_in_group:
+            group_lists = [x for v in self._media_dict.values() for x in v.keys()]
+            match = re_match(r".+(?=\.0*\d+$)|.+(?=\.part\d+\..+$)", item.path)
+            if not match or match and match.group(0) not in group_lists:
+                for key, value in list(self._media_dict.items()):
+                    for subkey, msgs in list(value.items()):
+                        if len(msgs) > 1:
+                            await self._send_media_group(msgs, subkey, key)
+        self._last_msg_in_group = False
+        self._send_msg = item.msg
+
+        await self._copy_Leech(self._listener.user_id, item.msg)
+        if self._listener.upDest:
+            await self._copy_Leech(self._listener.upDest, item.msg)
+
+        if (
+            not self._is_cancelled
+            and self._media_group
+            and (item.msg.video or item.msg.document)
+        ):
+            if match := re_match(r".+(?=\.0*\d+$)|.+(?=\.part\d+\..+$)", item.path):
+                subkey = match.group(0)
+                if subkey in self._media_dict[item.key].keys():
+                    self._media_dict[item.key][subkey].append(item.msg)
+                else:
+                    self._media_dict[item.key][subkey] = [item.msg]
+                msgs = self._media_dict[item.key][subkey]
+                if len(msgs) == 10:
+                    await self._send_media_group(msgs, subkey, item.key)
+                else:
+                    self._last_msg_in_group = True
+
+        self._total_files += 1
+        sent = None
+        if not self._is_corrupted and (self._listener.isSuperChat or self._leech_log):
+            self._msgs_dict[self._send_msg.link] = item.file_
+            sent = [self._send_msg.link, item.file_]
+        await sync_to_async(
+            task_journal.uploaded, self._listener.message.link, item.src, sent
         )
 
+    async def _prepare(self, item):
+        item.caption = await self._prepare_file(item)
+        if self._thumb and not await aiopath.exists(self._thumb):
+            self._thumb = None
+        item.thumb = self._thumb
+        if item.window:
+            return
+        item.is_video, item.is_audio, item.is_image = await get_document_type(item.path)
+        if not item.is_image and item.thumb is None:
+            file_name = ospath.splitext(item.file_)[0]
+            thumb_path = ospath.join(self._path, "yt-dlp-thumb", f"{file_name}.jpg")
+            if await aiopath.isfile(thumb_path):
+                item.thumb = thumb_path
+            elif item.is_audio and not item.is_video:
+                item.thumb = await get_audio_thumb(item.path)
+        if item.is_video:
+            item.duration = (await get_media_info(item.path))[0]
+            item.ss_image = await self._gen_ss(item.path)
+            if self._listener.screenShots:
+                ss_nb = (
+                    int(self._listener.screenShots)
+                    if isinstance(self._listener.screenShots, str)
+                    else 10
+                )
+                item.screens = await take_ss(item.path, ss_nb) or []
+            if not item.thumb:
+                item.thumb = await create_thumbnail(item.path, item.duration)
+            if item.thumb:
+                with Image.open(item.thumb) as img:
+                    item.width, item.height = img.size
+            if not self._listener.as_doc and not item.path.upper().endswith(
+                (".MKV", ".MP4")
+            ):
+                dirpath, file_ = ospath.split(item.path)
+                if (
+                    self._listener.seed
+                    and not self._listener.newDir
+                    and not dirpath.endswith("/splited_files_mltb")
+                ):
+                    dirpath = ospath.join(dirpath, "copied_mltb")
+                    await makedirs(dirpath, exist_ok=True)
+                    new_path = ospath.join(dirpath, f"{ospath.splitext(file_)[0]}.mp4")
+                    self._saved_bytes += await link_or_copy(item.path, new_path)
+                    item.path = new_path
+                else:
+                    new_path = f"{ospath.splitext(item.path)[0]}.mp4"
+                    await aiorename(item.path, new_path)
+                    item.path = new_path
+        elif item.is_audio:
+            item.duration, item.artist, item.title = await get_media_info(item.path)
+
     @retry(
         wait=wait_exponential(multiplier=2, min=4, max=8),
         stop=stop_after_attempt(4),
         retry=retry_if_exception_type(Exception),
     )
-    async def _upload_file(self, caption, file, force_document=False):
-        if self._thumb and not await aiopath.exists(self._thumb):
-            self._thumb = None
-        thumb, ss_image = self._thumb, None
+    async def _upload_file(self, item, force_document=False):
         if self._is_cancelled:
             return
+        # new files reply to the latest delivered message, which keeps the
+        # reply chain intact when files go one at a time
+        reply_to = self._send_msg
+        f_size = item.window.length if item.window else await get_path_size(item.path)
+        client = item.client = await upload_pool.acquire(
+            f_size, item.parts.client if item.parts.part else None
+        )
+        as_document = False
         try:
-            async with bot_lock:
-                self._client = (
-                    bot_dict["USERBOT"]
-                    if bot_dict["IS_PREMIUM"]
-                    and await get_path_size(self._up_path) > DEFAULT_SPLIT_SIZE
-                    or bot_dict["USERBOT"]
-                    and config_dict["USERBOT_LEECH"]
-                    else bot
-                )
-            is_video, is_audio, is_image = await get_document_type(self._up_path)
-            if not is_image and thumb is None:
-                file_name = ospath.splitext(file)[0]
-                thumb_path = ospath.join(self._path, "yt-dlp-thumb", f"{file_name}.jpg")
-                if await aiopath.isfile(thumb_path):
-                    thumb = thumb_path
-                elif is_audio and not is_video:
-                    thumb = await get_audio_thumb(self._up_path)
-            if is_video:
-                duration = (await get_media_info(self._up_path))[0]
-                ss_image = await self._gen_ss(self._up_path)
-                if self._listener.screenShots:
-                    await self._send_screenshots()
-                if not thumb:
-                    thumb = await create_thumbnail(self._up_path, duration)
-
+            if item.screens:
+                reply_to = await self._send_screenshots(item, reply_to) or reply_to
+            item.parts.bind(item.client, item.window or item.path, f_size)
+            self._sending[item.index] = item.parts
             if (
                 self._listener.as_doc
                 or force_document
-                or (not is_video and not is_audio and not is_image)
+                or (not item.is_video and not item.is_audio and not item.is_image)
             ):
-                key = "documents"
+                item.key = "documents"
                 if self._is_cancelled:
                     return
-                self._send_msg = await self._client.send_document(
-                    chat_id=self._send_msg.chat.id,
-                    document=self._up_path,
-                    thumb=thumb,
-                    caption=caption,
+                item.msg = await item.client.send_document(
+                    chat_id=reply_to.chat.id,
+                    document=item.window or item.path,
+                    thumb=item.thumb,
+                    caption=item.caption,
                     disable_notification=True,
                     progress=self._upload_progress,
-                    reply_to_message_id=self._send_msg.id,
+                    progress_args=(item,),
+                    reply_to_message_id=reply_to.id,
                 )
-            elif is_video:
-                key = "videos"
-                if thumb:
-                    with Image.open(thumb) as img:
-                        width, height = img.size
-                else:
-                    width, height = 480, 320
-                if not self._up_path.upper().endswith((".MKV", ".MP4")):
-                    dirpath, file_ = ospath.split(self._up_path)
-                    if (
-                        self._listener.seed
-                        and not self._listener.newDir
-                        and not dirpath.endswith("/splited_files_mltb")
-                    ):
-                        dirpath = ospath.join(dirpath, "copied_mltb")
-                        await makedirs(dirpath, exist_ok=True)
-                        new_path = ospath.join(
-                            dirpath, f"{ospath.splitext(file_)[0]}.mp4"
-                        )
-                        self._up_path = await copy(self._up_path, new_path)
-                    else:
-                        new_path = f"{ospath.splitext(self._up_path)[0]}.mp4"
-                        await aiorename(self._up_path, new_path)
-                        self._up_path = new_path
+            elif item.is_video:
+                item.key = "videos"
                 if self._is_cancelled:
                     return
-                self._send_msg = await self._client.send_video(
-                    chat_id=self._send_msg.chat.id,
-                    video=self._up_path,
-                    caption=caption,
-                    duration=duration,
-                    width=width,
-                    height=height,
-                    thumb=thumb,
+                item.msg = await item.client.send_video(
+                    chat_id=reply_to.chat.id,
+                    video=item.path,
+                    caption=item.caption,
+                    duration=item.duration,
+                    width=item.width,
+                    height=item.height,
+                    thumb=item.thumb,
                     supports_streaming=True,
                     disable_notification=True,
                     progress=self._upload_progress,
-                    reply_to_message_id=self._send_msg.id,
+                    progress_args=(item,),
+                    reply_to_message_id=reply_to.id,
                 )
-            elif is_audio:
-                key = "audios"
-                duration, artist, title = await get_media_info(self._up_path)
+            elif item.is_audio:
+                item.key = "audios"
                 if self._is_cancelled:
                     return
-                self._send_msg = await self._client.send_audio(
-                    chat_id=self._send_msg.chat.id,
-                    audio=self._up_path,
-                    caption=caption,
-                    duration=duration,
-                    performer=artist,
-                    title=title,
-                    thumb=thumb,
+                item.msg = await item.client.send_audio(
+                    chat_id=reply_to.chat.id,
+                    audio=item.path,
+                    caption=item.caption,
+                    duration=item.duration,
+                    performer=item.artist,
+                    title=item.title,
+                    thumb=item.thumb,
                     disable_notification=True,
                     progress=self._upload_progress,
-                    reply_to_message_id=self._send_msg.id,
+                    progress_args=(item,),
+                    reply_to_message_id=reply_to.id,
                 )
             else:
-                key = "photos"
+                item.key = "photos"
                 if self._is_cancelled:
                     return
-                self._send_msg = await bot.send_photo(
-                    chat_id=self._send_msg.chat.id,
-                    photo=self._up_path,
-                    caption=caption,
+                item.msg = await item.client.send_photo(
+                    chat_id=reply_to.chat.id,
+                    photo=item.path,
+                    caption=item.caption,
                     disable_notification=True,
                     progress=self._upload_progress,
-                    reply_to_message_id=self._send_msg.id,
+                    progress_args=(item,),
+                    reply_to_message_id=reply_to.id,
                 )
             if self._is_cancelled:
                 return
-            await self._final_message(ss_image, bool(is_video or is_audio))
-
-            await self._copy_Leech(self._listener.user_id, self._send_msg)
-            if self._listener.upDest:
-                await self._copy_Leech(self._listener.upDest, self._send_msg)
-
-            if (
-                not self._is_cancelled
-                and self._media_group
-                and (self._send_msg.video or self._send_msg.document)
-            ):
-                if match := re_match(
-                    r".+(?=\.0*\d+$)|.+(?=\.part\d+\..+$)", self._up_path
-                ):
-                    subkey = match.group(0)
-                    if subkey in self._media_dict[key].keys():
-                        self._media_dict[key][subkey].append(self._send_msg)
-                    else:
-                        self._media_dict[key][subkey] = [self._send_msg]
-                    msgs = self._media_dict[key][subkey]
-                    if len(msgs) == 10:
-                        await self._send_media_group(msgs, subkey, key)
-                    else:
-                        self._last_msg_in_group = True
-
-            if not self._thumb and thumb:
-                await clean_target(thumb)
+            await self._final_message(item, bool(item.is_video or item.is_audio))
         except FloodWait as f:
+            # the flood limiter has already learned it, retry once it allows
             LOGGER.warning(f, exc_info=True)
-            await sleep(f.value * 1.2)
+            raise f
         except Exception as err:
-            if not self._thumb and thumb:
-                await clean_target(thumb)
+            item.parts.missing(err)
             err_type = "RPCError: " if isinstance(err, RPCError) else ""
-            LOGGER.error("%s%s. Path: %s", err_type, err, self._up_path)
-            if "Telegram says: [400" in str(err) and key != "documents":
-                LOGGER.error(
-                    "Retrying As Document. Path: %s", self._up_path, exc_info=True
-                )
-                return await self._upload_file(caption, file, True)
-            raise err
+            LOGGER.error("%s%s. Path: %s", err_type, err, item.path)
+            if "Telegram says: [400" in str(err) and item.key != "documents":
+                LOGGER.error("Retrying As Document. Path: %s", item.path, exc_info=True)
+                as_document = True
+            else:
+                raise err
+        finally:
+            item.parts.unbind()
+            self._sending.pop(item.index, None)
+            upload_pool.release(client, f_size)
+        # retried only once this attempt's client is released, the retry
+        # acquires and releases its own
+        if as_document:
+            return await self._upload_file(item, True)
+
+    async def _save_parts(self, item, parts):
+        await sync_to_async(
+            task_journal.uploaded,
+            self._listener.message.link,
+            item.src,
+            parts.dump(),
+            key="parts",
+        )
 
     async def _user_settings(self):
         self._media_group = self._listener.user_dict.get("media_group", False) or (
@@ -373,6 +517,18 @@ class TgUploader:
         except:
             return 0
 
+    @property
+    def parts(self):
+        if uploads := [parts for parts in self._sending.values() if parts.path]:
+            return (
+                sum(parts.part for parts in uploads),
+                sum(parts.total for parts in uploads),
+            )
+
+    @property
+    def saved_bytes(self):
+        return self._saved_bytes
+
     @property
     def processed_bytes(self):
         return self._processed_bytes
@@ -380,10 +536,13 @@ class TgUploader:
     async def cancel_task(self):
         self._is_cancelled = True
         LOGGER.info("Cancelling Upload: %s", self._listener.name)
+        async with self._turn:
+            self._turn.notify_all()
         await self._listener.onUploadError("Upload stopped by user!")
 
     # ================================================== UTILS ==================================================
-    async def _prepare_file(self, file_, dirpath):
+    async def _prepare_file(self, item):
+        file_, dirpath = item.file_, item.dirpath
         caption = self._caption_mode(file_)
         if len(file_) > 60:
             if is_archive(file_):
@@ -397,7 +556,9 @@ class TgUploader:
             else:
                 name, ext = file_, ""
             name = name[: 60 - len(ext)]
-            if (
+            if item.window:
+                item.window.name = f"{name}{ext}"
+            elif (
                 self._listener.seed
                 and not self._listener.newDir
                 and not dirpath.endswith("/splited_files_mltb")
@@ -405,11 +566,12 @@ class TgUploader:
                 dirpath = ospath.join(dirpath, "copied_mltb")
                 await makedirs(dirpath, exist_ok=True)
                 new_path = ospath.join(dirpath, f"{name}{ext}")
-                self._up_path = await copy(self._up_path, new_path)
+                self._saved_bytes += await link_or_copy(item.path, new_path)
+                item.path = new_path
             else:
                 new_path = ospath.join(dirpath, f"{name}{ext}")
-                await aiorename(self._up_path, new_path)
-                self._up_path = new_path
+                await aiorename(item.path, new_path)
+                item.path = new_path
         return caption
 
     def _caption_mode(self, file):
@@ -486,30 +648,23 @@ class TgUploader:
         self._send_msg = msgs_list[-1]
 
     @handle_message
-    async def _send_screenshots(self):
-        if isinstance(self._listener.screenShots, str):
-            ss_nb = int(self._listener.screenShots)
-        else:
-            ss_nb = 10
-        outputs = await take_ss(self._up_path, ss_nb)
-        inputs = []
-        if outputs:
-            for m in outputs:
-                if await aiopath.exists(m):
-                    cap = m.rsplit("/", 1)[-1]
-                    inputs.append(InputMediaPhoto(m, cap))
-                else:
-                    outputs.remove(m)
-        if outputs:
-            msgs_list = await self._send_msg.reply_media_group(
+    async def _send_screenshots(self, item, reply_to):
+        inputs = [
+            InputMediaPhoto(m, m.rsplit("/", 1)[-1])
+            for m in item.screens
+            if await aiopath.exists(m)
+        ]
+        if inputs:
+            msgs_list = await reply_to.reply_media_group(
                 media=inputs, quote=True, disable_notification=True
             )
             #    if self._send_pm:
             await self._copy_media_group(self._listener.user_id, msgs_list)
             if self._listener.upDest:
                 await self._copy_media_group(self._listener.upDest, msgs_list)
-            self._send_msg = msgs_list[-1]
-            await gather(*[clean_target(m) for m in outputs])
+            await gather(*[clean_target(m) for m in item.screens])
+            item.screens = []
+            return msgs_list[-1]
 
     @handle_message
     async def _copy_media_group(self, chat_id: int, msgs: list[Message]):
@@ -538,32 +693,34 @@ class TgUploader:
         )
 
     @handle_message
-    async def _final_message(self, ss_image, media_info: bool = False):
-        self._buttons = ButtonMaker()
+    async def _final_message(self, item, media_info: bool = False):
+        buttons = ButtonMaker()
         media_result = (
-            await post_media_info(self._up_path, self._size, ss_image)
+            await post_media_info(item.path, self._size, item.ss_image)
             if media_info
             else None
         )
-        await clean_target(ss_image)
+        await clean_target(item.ss_image)
         if media_result:
-            self._buttons.button_link("Media Info", media_result)
+            buttons.button_link("Media Info", media_result)
         if config_dict["SAVE_MESSAGE"] and self._listener.isSuperChat:
-            self._buttons.button_data("Save Message", "save", "footer")
-        for mode, link in zip(["Stream", "Download"], await gen_link(self._send_msg)):
+            buttons.button_data("Save Message", "save", "footer")
+        # the main bot takes over the message, helper clients can't reach
+        # users in pm, only its sender can edit it though
+        item.msg = await bot.get_messages(item.msg.chat.id, item.msg.id)
+        for mode, link in zip(["Stream", "Download"], await gen_link(item.msg)):
             if link:
-                self._buttons.button_link(
+                buttons.button_link(
                     mode,
                     await sync_to_async(short_url, link, self._listener.user_id),
                     "header",
                 )
-        self._send_msg = await bot.get_messages(
-            self._send_msg.chat.id, self._send_msg.id
-        )
-        if (buttons := self._buttons.build_menu(2)) and (
-            cmsg := await self._send_msg.edit_reply_markup(buttons)
+        if (reply_markup := buttons.build_menu(2)) and (
+            await item.client.edit_message_reply_markup(
+                item.msg.chat.id, item.msg.id, reply_markup
+            )
         ):
-            self._send_msg = cmsg
+            item.msg.reply_markup = reply_markup
 
     def _get_input_media(self, subkey: str, key: str):
         imlist = []
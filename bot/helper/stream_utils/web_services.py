@@ -1,12 +1,34 @@
 from aiohttp import web
+from hmac import compare_digest
 
-from bot import config_dict, LOGGER
+from bot import config_dict, task_dict_lock, LOGGER
+from bot.helper.ext_utils.bot_utils import sync_to_async
+from bot.helper.ext_utils.metrics import metrics
 from bot.helper.stream_utils.stream_routes import routes
 
 
+async def metrics_handler(request):
+    # the stream port is public, so metrics stay off until a token is set
+    if not (token := config_dict["METRICS_TOKEN"]):
+        raise web.HTTPNotFound()
+    if not compare_digest(
+        request.headers.get("Authorization", "").encode(), f"Bearer {token}".encode()
+    ):
+        raise web.HTTPUnauthorized(headers={"WWW-Authenticate": "Bearer"})
+    async with task_dict_lock:
+        text = await sync_to_async(metrics.render)
+    return web.Response(
+        body=text.encode(),
+        headers={
+            "Content-Type": "application/openmetrics-text; version=1.0.0; charset=utf-8"
+        },
+    )
+
+
 def web_server():
     web_app = web.Application(client_max_size=30000000)
     web_app.add_routes(routes)
+    web_app.router.add_get("/metrics", metrics_handler)
     return web_app
 
 
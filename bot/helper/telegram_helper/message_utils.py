@@ -29,6 +29,8 @@ from bot.helper.ext_utils.bot_utils import setInterval, sync_to_async
 from bot.helper.ext_utils.db_handler import DbManager
 from bot.helper.ext_utils.exceptions import TgLinkException
 from bot.helper.ext_utils.files_utils import clean_target, downlod_content
+from bot.helper.ext_utils.flood_limiter import flood_limiter
+from bot.helper.ext_utils.metrics import metrics
 from bot.helper.ext_utils.status_utils import get_readable_message
 from bot.helper.telegram_helper.bot_commands import BotCommands
 
@@ -52,6 +54,7 @@ class Limits:
 
 
 limit = Limits()
+STATUS_EDITS_PER_TICK = 20
 
 
 def handle_message(func):
@@ -62,8 +65,12 @@ def handle_message(func):
             return await func(*args, **kwargs)
         except FloodWait as f:
             LOGGER.error("%s(): %s", func_name, f)
-            # if 'block' in kwargs and not kwargs['block'] and func_name in ['sendMessage', 'editMessage']:
-            #     return str(f)
+            metrics.flood_wait(func_name)
+            if not kwargs.get("block", True) and func_name in [
+                "sendMessage",
+                "editMessage",
+            ]:
+                return str(f)
             await sleep(f.value * 1.2)
             return await wrapper(*args, **kwargs)
         except (
@@ -313,46 +320,86 @@ async def get_tg_link_message(link: str, user_id: int):
     )
 
 
-async def update_status_message(sid, force=False):
+def _render_status(views: dict):
+    pages = {}
+    return {
+        sid: get_readable_message(
+            sid,
+            data["is_user"],
+            data["page_no"],
+            data["status"],
+            data["page_step"],
+            pages,
+        )
+        for sid, data in views.items()
+    }
+
+
+async def _refresh_status(sids, force=False):
     async with task_dict_lock:
-        if not status_dict.get(sid):
-            if obj := Intervals["status"].get(sid):
-                obj.cancel()
-                del Intervals["status"][sid]
-            return
-        if not force and time() - status_dict[sid]["time"] < 3:
-            return
-        status_dict[sid]["time"] = time()
-        page_no = status_dict[sid]["page_no"]
-        status = status_dict[sid]["status"]
-        is_user = status_dict[sid]["is_user"]
-        page_step = status_dict[sid]["page_step"]
-        text, buttons = await sync_to_async(
-            get_readable_message, sid, is_user, page_no, status, page_step
+        now = time()
+        # status edits may take the token uploads leave in every chat, they
+        # only skip a tick while even that one is spent or a FloodWait holds
+        views = {
+            sid: status_dict[sid]
+            for sid in sorted(
+                (sid for sid in sids if sid in status_dict),
+                key=lambda sid: status_dict[sid]["time"],
+            )
+            if (force or now - status_dict[sid]["time"] >= 3)
+            and not flood_limiter.delay(
+                bot, status_dict[sid]["message"].chat.id, priority=True
+            )
+        }
+        rendered = await sync_to_async(_render_status, views)
+        edits = []
+        for sid, (text, buttons) in rendered.items():
+            if text is None:
+                del status_dict[sid]
+                continue
+            if (text_hash := hash(text)) == status_dict[sid]["hash"]:
+                continue
+            if len(edits) < STATUS_EDITS_PER_TICK:
+                status_dict[sid]["time"] = now
+                edits.append(
+                    (sid, status_dict[sid]["message"], text, buttons, text_hash)
+                )
+        if not status_dict and (obj := Intervals["status"]):
+            obj.cancel()
+            Intervals["status"] = ""
+    if not edits:
+        return
+    with flood_limiter.priority():
+        results = await gather(
+            *[
+                editMessage(text, message, buttons, block=False)
+                for _, message, text, buttons, _ in edits
+            ]
         )
-        if text is None:
-            del status_dict[sid]
-            if obj := Intervals["status"].get(sid):
-                obj.cancel()
-                del Intervals["status"][sid]
-            return
-        if text != status_dict[sid]["message"].text:
-            message = await editMessage(text, status_dict[sid]["message"], buttons)
-            if isinstance(message, str):
-                if message.startswith("Telegram says: [400"):
+    async with task_dict_lock:
+        for (sid, message, text, _, text_hash), result in zip(edits, results):
+            if sid not in status_dict or status_dict[sid]["message"] is not message:
+                continue
+            if isinstance(result, str):
+                if result.startswith("Telegram says: [400"):
                     del status_dict[sid]
-                    if obj := Intervals["status"].get(sid):
-                        obj.cancel()
-                        del Intervals["status"][sid]
                 else:
                     LOGGER.error(
                         "Status with id: %s haven't been updated. Error: %s",
                         sid,
-                        message,
+                        result,
                     )
-                return
-            status_dict[sid]["message"].text = text
-            status_dict[sid]["time"] = time()
+                continue
+            message.text = text
+            status_dict[sid].update({"hash": text_hash, "time": time()})
+
+
+async def update_status_message(sid, force=False):
+    await _refresh_status([sid], force)
+
+
+async def update_all_status_messages():
+    await _refresh_status(list(status_dict))
 
 
 async def sendStatusMessage(msg, user_id=0):
@@ -368,9 +415,6 @@ async def sendStatusMessage(msg, user_id=0):
             )
             if text is None:
                 del status_dict[sid]
-                if obj := Intervals["status"].get(sid):
-                    obj.cancel()
-                    del Intervals["status"][sid]
                 return
             message = status_dict[sid]["message"]
             _, message = await gather(
@@ -382,7 +426,9 @@ async def sendStatusMessage(msg, user_id=0):
                 )
                 return
             message.text = text
-            status_dict[sid].update({"message": message, "time": time()})
+            status_dict[sid].update(
+                {"message": message, "time": time(), "hash": hash(text)}
+            )
         else:
             text, buttons = await sync_to_async(get_readable_message, sid, is_user)
             if text is None:
@@ -397,12 +443,13 @@ async def sendStatusMessage(msg, user_id=0):
             status_dict[sid] = {
                 "message": message,
                 "time": time(),
+                "hash": hash(text),
                 "page_no": 1,
                 "page_step": 1,
                 "status": "All",
                 "is_user": is_user,
             }
-    if not Intervals["status"].get(sid):
-        Intervals["status"][sid] = setInterval(
-            config_dict["STATUS_UPDATE_INTERVAL"], update_status_message, sid
-        )
+        if not Intervals["status"]:
+            Intervals["status"] = setInterval(
+                config_dict["STATUS_UPDATE_INTERVAL"], update_all_status_messages
+            )
@@ -2,7 +2,6 @@ from __future__ import annotations
 from aiofiles import open as aiopen
 from aiofiles.os import path as aiopath, makedirs, listdir
 from aioshutil import move
-from ast import literal_eval
 from asyncio import create_subprocess_exec, sleep, gather, Event
 from asyncio.subprocess import PIPE
 from natsort import natsorted
@@ -19,12 +18,13 @@ from bot import (
     VID_MODE,
     FFMPEG_NAME,
 )
-from bot.helper.ext_utils.bot_utils import sync_to_async, cmd_exec, new_task
+from bot.helper.ext_utils.bot_utils import sync_to_async, new_task
 from bot.helper.ext_utils.files_utils import get_path_size, clean_target
 from bot.helper.ext_utils.links_utils import get_url_name
 from bot.helper.ext_utils.media_utils import (
     get_document_type,
     get_media_info,
+    probe,
     FFProgress,
 )
 from bot.helper.ext_utils.task_manager import check_running_tasks
@@ -39,21 +39,7 @@ from bot.helper.video_utils.extra_selector import ExtraSelect
 
 
 async def get_metavideo(video_file):
-    stdout, stderr, rcode = await cmd_exec(
-        [
-            "ffprobe",
-            "-hide_banner",
-            "-print_format",
-            "json",
-            "-show_format",
-            "-show_streams",
-            video_file,
-        ]
-    )
-    if rcode != 0:
-        LOGGER.error(stderr)
-        return {}, {}
-    metadata = literal_eval(stdout)
+    metadata = await probe(video_file)
     return metadata.get("streams", {}), metadata.get("format", {})
 
 
@@ -85,7 +71,7 @@ class VidEcxecutor(FFProgress):
 
     async def _queue(self, update=False):
         if self._metadata:
-            add_to_queue, event = await check_running_tasks(self.listener.mid)
+            add_to_queue, event = await check_running_tasks(self.listener)
             if add_to_queue:
                 LOGGER.info("Added to Queue/Download: %s", self.name)
                 async with task_dict_lock:
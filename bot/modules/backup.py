@@ -153,7 +153,6 @@ async def backup_message(client: Client, message: Message):
         if same_id and msg.id == first_id:
             break
         if copyed := await _copy(int(des_id), msg):
-            await sleep(10)
             succ += 1
             if same_id and not first_id:
                 first_id = copyed.id
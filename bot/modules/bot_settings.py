@@ -43,11 +43,13 @@ from bot.helper.ext_utils.conf_loads import (
     default_values,
     load_config,
     intialize_userbot,
+    intialize_helperbots,
     intialize_savebot,
 )
 from bot.helper.ext_utils.db_handler import DbManager
 from bot.helper.ext_utils.files_utils import clean_target
 from bot.helper.ext_utils.jdownloader_booter import jdownloader
+from bot.helper.ext_utils.stage_pools import STAGE_POOL_KEYS, wake_stage_pools
 from bot.helper.ext_utils.task_manager import start_from_queued
 from bot.helper.mirror_utils.rclone_utils.serve import rclone_serve_booter
 from bot.helper.stream_utils.web_services import server, start_server
@@ -61,7 +63,7 @@ from bot.helper.telegram_helper.message_utils import (
     editMessage,
     editPhoto,
     deleteMessage,
-    update_status_message,
+    update_all_status_messages,
 )
 from bot.modules.rss import addJob
 from bot.modules.torrent_search import initiate_search_tools
@@ -74,6 +76,7 @@ unauth_config = [
     "TELEGRAM_HASH",
     "TELEGRAM_API",
     "ARGO_TOKEN",
+    "METRICS_TOKEN",
     "ENABLE_FASTDL",
     "CLOUD_LINK_FILTERS",
     "OWNER_ID",
@@ -235,11 +238,8 @@ async def edit_variable(_, message: Message, omsg: Message, key: str):
     elif key == "STATUS_UPDATE_INTERVAL":
         value = int(value)
         if len(task_dict) != 0 and (st := Intervals["status"]):
-            for skey, intvl in list(st.items()):
-                intvl.cancel()
-                Intervals["status"][skey] = setInterval(
-                    value, update_status_message, skey
-                )
+            st.cancel()
+            Intervals["status"] = setInterval(value, update_all_status_messages)
     elif key == "TORRENT_TIMEOUT":
         value = int(value)
         downloads = await sync_to_async(aria2.get_downloads)
@@ -294,6 +294,8 @@ async def edit_variable(_, message: Message, omsg: Message, key: str):
         await intialize_savebot(value)
     elif key == "USER_SESSION_STRING":
         await intialize_userbot()
+    elif key == "HELPER_BOT_TOKENS":
+        await intialize_helperbots()
     LOGGER.info("Change var %s = %s: %s", key, value.__class__.__name__.upper(), value)
     await gather(update_buttons(omsg, "var"), deleteMessage(message))
     if DATABASE_URL:
@@ -318,8 +320,15 @@ async def edit_variable(_, message: Message, omsg: Message, key: str):
             config_dict["STREAM_PORT"] = environ.get("PORT")
         await sleep(2)
         await start_server()
-    elif key in ["QUEUE_ALL", "QUEUE_DOWNLOAD", "QUEUE_UPLOAD"]:
+    elif key in [
+        "QUEUE_ALL",
+        "QUEUE_DOWNLOAD",
+        "QUEUE_UPLOAD",
+        "QUEUE_ADAPTIVE",
+    ]:
         await start_from_queued()
+    elif key in STAGE_POOL_KEYS:
+        await wake_stage_pools()
     elif key in [
         "RCLONE_SERVE_URL",
         "RCLONE_SERVE_PORT",
@@ -573,11 +582,8 @@ async def edit_bot_settings(client: Client, query: CallbackQuery):
                 and len(task_dict) != 0
                 and (st := Intervals["status"])
             ):
-                for key, intvl in list(st.items()):
-                    intvl.cancel()
-                    Intervals["status"][key] = setInterval(
-                        value, update_status_message, key
-                    )
+                st.cancel()
+                Intervals["status"] = setInterval(value, update_all_status_messages)
         elif data[2] == "ARGO_TOKEN":
             await kill_route()
         elif data[2] == "EXTENSION_FILTER":
@@ -633,13 +639,22 @@ async def edit_bot_settings(client: Client, query: CallbackQuery):
         )
         if data[2] == "USER_SESSION_STRING":
             await intialize_userbot()
+        elif data[2] == "HELPER_BOT_TOKENS":
+            await intialize_helperbots()
         await update_buttons(message, "var")
         if DATABASE_URL:
             await DbManager().update_config({data[2]: value})
         if data[2] in ("SEARCH_PLUGINS", "SEARCH_API_LINK"):
             await initiate_search_tools()
-        elif data[2] in ["QUEUE_ALL", "QUEUE_DOWNLOAD", "QUEUE_UPLOAD"]:
+        elif data[2] in [
+            "QUEUE_ALL",
+            "QUEUE_DOWNLOAD",
+            "QUEUE_UPLOAD",
+            "QUEUE_ADAPTIVE",
+        ]:
             await start_from_queued()
+        elif data[2] in STAGE_POOL_KEYS:
+            await wake_stage_pools()
         elif data[2] in [
             "RCLONE_SERVE_URL",
             "RCLONE_SERVE_PORT",
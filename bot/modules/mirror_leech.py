@@ -119,6 +119,7 @@ class Mirror(TaskListener):
             "-h": "",
             "-m": "",
             "-n": "",
+            "-pr": 0,
             "-rcf": "",
             "-t": "",
             "-up": "",
@@ -156,6 +157,11 @@ class Mirror(TaskListener):
         except:
             self.multi = 0
 
+        try:
+            self.priority = int(args["-pr"])
+        except:
+            self.priority = 0
+
         if not isinstance(self.seed, bool):
             dargs = self.seed.split(":")
             ratio = dargs[0] or None
@@ -305,6 +311,10 @@ class Mirror(TaskListener):
             self.removeFromSameDir()
             return
 
+        if await self.resumeCheckpoint():
+            await deleteMessage(self.editable)
+            return
+
         if is_mega_link(self.link):
             self.isJd = False
 
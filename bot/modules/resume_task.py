@@ -5,8 +5,10 @@ from pyrogram.handlers import CallbackQueryHandler
 from pyrogram.types import CallbackQuery, Message
 
 from bot import bot, config_dict, LOGGER
-from bot.helper.ext_utils.bot_utils import new_task
+from bot.helper.ext_utils.bot_utils import new_task, sync_to_async
+from bot.helper.ext_utils.files_utils import clean_target
 from bot.helper.ext_utils.status_utils import action
+from bot.helper.ext_utils.task_journal import task_journal
 from bot.helper.telegram_helper.bot_commands import BotCommands
 from bot.helper.telegram_helper.message_utils import sendMessage
 from bot.modules.clone import Clone
@@ -38,6 +40,11 @@ async def set_incomplte_task(cid, link):
             LOGGER.error(e)
 
 
+async def discard_checkpoint(link):
+    if entry := await sync_to_async(task_journal.remove, link):
+        await gather(clean_target(entry["dir"]), clean_target(f"{entry['dir']}10000"))
+
+
 async def start_resume_task(client: Client, tasks: list):
     user_id = ""
     for msg in tasks:
@@ -74,13 +81,15 @@ async def start_resume_task(client: Client, tasks: list):
         if not user_id:
             user_id = message.from_user.id
         if isYt:
-            YtDlp(client, message, isLeech=isLeech).newEvent()
+            task = YtDlp(client, message, isLeech=isLeech)
         elif isClone:
-            Clone(client, message).newEvent()
+            task = Clone(client, message)
         elif isVt:
-            VidTools(client, message, isLeech=isLeech).newEvent()
+            task = VidTools(client, message, isLeech=isLeech)
         else:
-            Mirror(client, message, isQbit, isJd, isLeech).newEvent()
+            task = Mirror(client, message, isQbit, isJd, isLeech)
+        task.resumeFrom = msg.link
+        task.newEvent()
         await sleep(config_dict["MULTI_TIMEGAP"])
     incompte_dict.pop(user_id, None)
 
@@ -101,6 +110,8 @@ async def resume_task(client: Client, query: CallbackQuery):
         else:
             await query.answer("Incomplete task(s) has been cleared!", True)
             del incompte_dict[user_id]
+            for msg in tasks["msgs"]:
+                await discard_checkpoint(msg.link)
     else:
         await query.answer("You didn't have incomplete task(s) to resume!", True)
 
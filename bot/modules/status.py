@@ -1,5 +1,4 @@
 from asyncio import gather
-from psutil import cpu_percent, virtual_memory, disk_usage, net_io_counters
 from pyrogram.filters import command, regex
 from pyrogram.handlers import MessageHandler, CallbackQueryHandler
 from pyrogram.types import Message, CallbackQuery
@@ -11,15 +10,16 @@ from bot import (
     task_dict_lock,
     status_dict,
     botStartTime,
-    Intervals,
     config_dict,
 )
-from bot.helper.ext_utils.bot_utils import new_task
+from bot.helper.ext_utils.bot_utils import new_task, sync_to_async
+from bot.helper.ext_utils.engine_snapshot import engine_snapshot
 from bot.helper.ext_utils.status_utils import (
     get_readable_file_size,
     get_readable_time,
     MirrorStatus,
 )
+from bot.helper.ext_utils.sys_stats import sys_stats
 from bot.helper.telegram_helper.bot_commands import BotCommands
 from bot.helper.telegram_helper.filters import CustomFilters
 from bot.helper.telegram_helper.message_utils import (
@@ -39,17 +39,10 @@ async def mirror_status(_, message: Message):
         text = message.text.split()
         if len(text) > 1:
             user_id = message.from_user.id if text[1] == "me" else int(text[1])
-            if status_dict[user_id]:
-                del status_dict[user_id]
-            if obj := Intervals["status"].get(user_id):
-                obj.cancel()
-                del Intervals["status"][user_id]
+            async with task_dict_lock:
+                status_dict.pop(user_id, None)
         else:
             user_id = 0
-            sid = message.chat.id
-            if obj := Intervals["status"].get(sid):
-                obj.cancel()
-                del Intervals["status"][sid]
         await gather(sendStatusMessage(message, user_id), deleteMessage(message))
     else:
         msg = (
@@ -57,8 +50,8 @@ async def mirror_status(_, message: Message):
             f"⁍ My status: <code>/{BotCommands.StatusCommand} me</code>\n"
             f"⁍ User status: <code>/{BotCommands.StatusCommand} user_id</code>\n"
             "▬▬▬▬▬▬▬▬▬▬▬▬▬▬▬▬▬▬▬\n"
-            f"<b>CPU:</b> {cpu_percent()}% | <b>RAM:</b> {virtual_memory().percent}% | <b>FREE:</b> {get_readable_file_size(disk_usage(config_dict['DOWNLOAD_DIR']).free)}\n"
-            f"<b>IN:</b> {get_readable_file_size(net_io_counters().bytes_recv)}<b> | OUT:</b> {get_readable_file_size(net_io_counters().bytes_sent)} | {get_readable_time(time() - botStartTime)}"
+            f"<b>CPU:</b> {sys_stats.cpu}% | <b>RAM:</b> {sys_stats.memory.percent}% | <b>FREE:</b> {get_readable_file_size(sys_stats.download_free)}\n"
+            f"<b>IN:</b> {get_readable_file_size(sys_stats.net.bytes_recv)}<b> | OUT:</b> {get_readable_file_size(sys_stats.net.bytes_sent)} | {get_readable_time(time() - botStartTime)}"
         )
         statusmsg = await sendingMessage(msg, message, config_dict["IMAGE_STATUS"])
         await auto_delete_message(message, statusmsg)
@@ -89,9 +82,8 @@ async def status_pages(_, query: CallbackQuery):
                         status_dict[key]["page_no"] -= status_dict[key]["page_step"]
             case "cls":
                 if query.from_user.id in (key, config_dict["OWNER_ID"]):
-                    if obj := Intervals["status"].get(key):
-                        obj.cancel()
-                        del Intervals["status"][key]
+                    async with task_dict_lock:
+                        status_dict.pop(key, None)
                     await gather(query.answer(), deleteMessage(query.message))
                     return
                 await query.answer("This in no yout task!", True)
@@ -109,6 +101,9 @@ async def status_pages(_, query: CallbackQuery):
                     archive
                 ) = extract = split = seed = samvid = 0
                 async with task_dict_lock:
+                    await sync_to_async(
+                        engine_snapshot.refresh, list(task_dict.values())
+                    )
                     for task in task_dict.values():
                         match task.status():
                             case MirrorStatus.STATUS_DOWNLOADING:
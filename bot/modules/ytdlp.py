@@ -317,6 +317,7 @@ class YtDlp(TaskListener):
             "-z": False,
             "-m": "",
             "-n": "",
+            "-pr": 0,
             "-opt": "",
             "-rcf": "",
             "-t": "",
@@ -351,6 +352,11 @@ class YtDlp(TaskListener):
         except:
             self.multi = 0
 
+        try:
+            self.priority = int(args["-pr"])
+        except:
+            self.priority = 0
+
         if not isinstance(isBulk, bool):
             dargs = isBulk.split(":")
             bulk_start = dargs[0] or None
@@ -427,6 +433,11 @@ class YtDlp(TaskListener):
             self.removeFromSameDir()
             return
 
+        if await self.resumeCheckpoint():
+            self.run_multi(input_list, folder_name, YtDlp)
+            await deleteMessage(self.editable)
+            return
+
         options = {"usenetrc": True, "cookiefile": "cookies.txt"}
 
         opt = (